@@ -17,13 +17,13 @@ def lint(session: nox.Session) -> None:
 @nox.session
 def type_check(session: nox.Session) -> None:
     """Run type checking."""
-    session.install("mypy", "msgspec", "httpx", "pytest")
+    session.install("mypy", "msgspec", "httpx", "numpy", "pytest")
     session.run("mypy", "src")
 
 
 @nox.session
 def tests(session: nox.Session) -> None:
     """Run tests."""
-    session.install("pytest", "pytest-asyncio", "pytest-cov", "httpx", "msgspec")
+    session.install("pytest", "pytest-asyncio", "pytest-cov", "httpx", "msgspec", "numpy")
     session.install("-e", ".")
     session.run("pytest", "--cov=src/xsmeteo", "--cov-report=term-missing", "tests")
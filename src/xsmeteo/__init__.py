@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-from xsmeteo.client import AsyncXSMeteo, XSMeteo
+from xsmeteo.client import AsyncXSMeteo, Refresh, Watchlist, XSMeteo
 from xsmeteo.core import (
     DEFAULT_RATE_LIMITS,
     ENDPOINTS,
     APIEndpoints,
+    Backend,
+    Cache,
+    EndpointPool,
+    MemoryCache,
     RateLimitConfig,
     RateLimiter,
+    SharedMemoryCache,
 )
 from xsmeteo.exceptions import (
     DecodeError,
@@ -21,6 +26,7 @@ from xsmeteo.models import (
     AirQualityResponse,
     BaseStruct,
     ClimateResponse,
+    CurrentResponse,
     ElevationResponse,
     EnsembleResponse,
     FloodResponse,
@@ -34,6 +40,7 @@ from xsmeteo.models import (
     TimeFormat,
     WindSpeedUnit,
 )
+from xsmeteo.store import ElevationStore
 
 __version__ = "0.1.1"
 
@@ -43,10 +50,15 @@ __all__ = [
     "APIEndpoints",
     "AirQualityResponse",
     "AsyncXSMeteo",
+    "Backend",
     "BaseStruct",
+    "Cache",
     "ClimateResponse",
+    "CurrentResponse",
     "DecodeError",
     "ElevationResponse",
+    "ElevationStore",
+    "EndpointPool",
     "EnsembleResponse",
     "FloodResponse",
     "ForecastResponse",
@@ -55,13 +67,17 @@ __all__ = [
     "HTTPError",
     "HistoricalResponse",
     "MarineResponse",
+    "MemoryCache",
     "PrecipitationUnit",
     "RateLimitConfig",
     "RateLimitError",
     "RateLimiter",
+    "Refresh",
     "RequestError",
+    "SharedMemoryCache",
     "TemperatureUnit",
     "TimeFormat",
+    "Watchlist",
     "WindSpeedUnit",
     "XSMeteo",
     "XSMeteoError",
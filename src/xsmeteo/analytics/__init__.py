@@ -0,0 +1,81 @@
+"""
+Vectorized analytics on decoded API responses.
+
+Requires the optional ``numpy`` dependency (``pip install xsmeteo[numpy]``).
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy  # noqa: F401
+except ImportError as e:  # pragma: no cover - exercised only without numpy
+    raise ImportError(
+        "xsmeteo.analytics requires numpy. Install it with: pip install 'xsmeteo[numpy]'"
+    ) from e
+
+from xsmeteo.analytics.alerts import (
+    AlertMatches,
+    AlertRule,
+    evaluate_rule,
+    evaluate_rules,
+    stack_locations,
+)
+from xsmeteo.analytics.climate import (
+    ClimateModels,
+    ClimateReducer,
+    ClimateSummary,
+    ModelSeries,
+    fetch_models,
+    fetch_models_async,
+    iter_models,
+    split_model_columns,
+    stream_models,
+)
+from xsmeteo.analytics.diff import DiffEngine, ForecastDelta, diff_series
+from xsmeteo.analytics.ensemble import EnsembleMembers, group_member_columns
+from xsmeteo.analytics.flood import (
+    FloodExceedance,
+    exceedance_probability,
+    iter_exceedance,
+    stack_members,
+    stream_exceedance,
+)
+from xsmeteo.analytics.pipeline import DecodePool
+from xsmeteo.analytics.resample import (
+    default_aggregations,
+    resample_daily,
+    resample_response,
+)
+from xsmeteo.analytics.timeseries import TimeSeries
+
+__all__ = [
+    "AlertMatches",
+    "AlertRule",
+    "ClimateModels",
+    "ClimateReducer",
+    "ClimateSummary",
+    "DecodePool",
+    "DiffEngine",
+    "EnsembleMembers",
+    "FloodExceedance",
+    "ForecastDelta",
+    "ModelSeries",
+    "TimeSeries",
+    "default_aggregations",
+    "diff_series",
+    "evaluate_rule",
+    "evaluate_rules",
+    "exceedance_probability",
+    "fetch_models",
+    "fetch_models_async",
+    "group_member_columns",
+    "iter_exceedance",
+    "iter_models",
+    "resample_daily",
+    "resample_response",
+    "split_model_columns",
+    "stack_locations",
+    "stack_members",
+    "stream_exceedance",
+    "stream_models",
+]
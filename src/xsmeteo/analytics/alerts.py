@@ -0,0 +1,276 @@
+"""
+Vectorized threshold alerts across many locations.
+
+Rules such as "wind gusts above 80 km/h within 24 hours", "PM2.5 above 50 for
+3 hours" or "more than 30 mm of rain in 6 hours" are evaluated on stacked
+``(locations x time)`` arrays: rolling aggregates and durations become
+cumulative sums and sliding windows, so every location is tested in the same
+few array passes instead of a Python loop per location.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+import typing
+
+import numpy as np
+
+import xsmeteo.analytics.timeseries as timeseries
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import numpy.typing as npt
+
+    from xsmeteo.models.base import BaseStruct
+
+_OPERATORS: dict[str, typing.Any] = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+ROLLING_AGGREGATES = ("sum", "mean", "min", "max")
+
+
+@dataclasses.dataclass(frozen=True)
+class AlertRule:
+    """
+    A threshold condition on one variable.
+
+    Attributes
+    ----------
+    name : str
+        Rule name, used as key of the results.
+    variable : str
+        Column to test, e.g. "wind_gusts_10m".
+    operator : str
+        ">", ">=", "<" or "<=".
+    threshold : float
+        Value compared against.
+    duration : int
+        Consecutive steps the condition must hold. Default is 1.
+    window : int
+        Steps of the trailing rolling aggregate. Default is 1 (raw values).
+    aggregate : str
+        Rolling aggregate, out of "sum", "mean", "min" and "max". Missing
+        values are skipped. Default is "mean".
+    within : int | None
+        Number of steps from ``now`` in which the condition must first hold
+        (for windowed rules, in which the first matching window must end).
+        Unbounded if None.
+    """
+
+    name: str
+    variable: str
+    operator: str
+    threshold: float
+    duration: int = 1
+    window: int = 1
+    aggregate: str = "mean"
+    within: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.operator not in _OPERATORS:
+            raise ValueError(f"operator must be one of {list(_OPERATORS)}, got {self.operator!r}")
+        if self.aggregate not in ROLLING_AGGREGATES:
+            raise ValueError(
+                f"aggregate must be one of {ROLLING_AGGREGATES}, got {self.aggregate!r}"
+            )
+        if self.duration < 1 or self.window < 1:
+            raise ValueError("duration and window must be at least 1")
+
+
+@dataclasses.dataclass
+class AlertMatches:
+    """
+    Locations matching a rule.
+
+    Attributes
+    ----------
+    rule : str
+        Name of the rule.
+    index : NDArray[intp]
+        Positions of the matching locations in the stacked input.
+    onset : NDArray[int64]
+        UTC Unix seconds of the first step of the triggering period, per
+        match: the start of the first matching run, extended back to the
+        start of its trailing window for windowed rules.
+    value : NDArray[float64]
+        Tested (aggregated) value of the first step of the run, per match;
+        for windowed rules the aggregate over the window starting at
+        ``onset``.
+    """
+
+    rule: str
+    index: npt.NDArray[np.intp]
+    onset: npt.NDArray[np.int64]
+    value: npt.NDArray[np.float64]
+
+
+def stack_locations(
+    responses: Sequence[BaseStruct],
+    variables: Sequence[str],
+    *,
+    section: str = "hourly",
+) -> tuple[npt.NDArray[np.int64], dict[str, npt.NDArray[np.float64]]]:
+    """
+    Stack one section of many responses into ``(locations x time)`` arrays.
+
+    Parameters
+    ----------
+    responses : Sequence[BaseStruct]
+        Responses sharing one time axis, e.g. from ``get_forecast_batch``.
+    variables : Sequence[str]
+        Columns to stack.
+    section : str, optional
+        Section to read. Default is "hourly".
+
+    Returns
+    -------
+    tuple[NDArray[int64], dict[str, NDArray[float64]]]
+        The shared UTC time axis and one array per variable; ``null`` values
+        become NaN.
+
+    Raises
+    ------
+    ValueError
+        If a response lacks a variable or the time axes differ.
+    """
+    if not responses:
+        return np.empty(0, dtype=np.int64), {
+            name: np.empty((0, 0), dtype=np.float64) for name in variables
+        }
+    axis = timeseries.decode_time(responses[0], section)
+    for response in responses[1:]:
+        if not np.array_equal(timeseries.decode_time(response, section), axis):
+            raise ValueError("responses do not share the same time axis")
+    sections: list[Mapping[str, typing.Any]] = [
+        getattr(response, section) for response in responses
+    ]
+    stacked: dict[str, npt.NDArray[np.float64]] = {}
+    for name in variables:
+        if any(name not in columns for columns in sections):
+            raise ValueError(f"response contains no {section} {name!r} data")
+        stacked[name] = np.array([columns[name] for columns in sections], dtype=np.float64)
+    return axis, stacked
+
+
+def _rolling(
+    values: npt.NDArray[np.float64], window: int, aggregate: str
+) -> npt.NDArray[np.float64]:
+    """Trailing rolling aggregate along the time axis; NaN until a window is full."""
+    if window == 1:
+        return values
+    locations, steps = values.shape
+    result = np.full((locations, steps), np.nan)
+    if steps < window:
+        return result
+    if aggregate in ("sum", "mean"):
+        valid = ~np.isnan(values)
+        totals = np.zeros((locations, steps + 1))
+        np.cumsum(np.where(valid, values, 0.0), axis=1, out=totals[:, 1:])
+        counts = np.zeros((locations, steps + 1), dtype=np.int64)
+        np.cumsum(valid, axis=1, out=counts[:, 1:])
+        total = totals[:, window:] - totals[:, :-window]
+        count = counts[:, window:] - counts[:, :-window]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            windowed = total if aggregate == "sum" else total / count
+        result[:, window - 1 :] = np.where(count > 0, windowed, np.nan)
+        return result
+    view = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+    reducer = np.fmax if aggregate == "max" else np.fmin
+    result[:, window - 1 :] = reducer.reduce(view, axis=-1)
+    return result
+
+
+def evaluate_rule(
+    rule: AlertRule,
+    time_axis: npt.NDArray[np.int64],
+    values: npt.NDArray[np.float64],
+    *,
+    now: int | None = None,
+) -> AlertMatches:
+    """
+    Evaluate one rule on a ``(locations x time)`` array.
+
+    Parameters
+    ----------
+    rule : AlertRule
+        The rule.
+    time_axis : NDArray[int64]
+        UTC Unix seconds of the columns.
+    values : NDArray[float64]
+        Values of ``rule.variable``, one row per location.
+    now : int, optional
+        UTC Unix seconds ``within`` counts from. Defaults to the current
+        time.
+
+    Returns
+    -------
+    AlertMatches
+        Matching locations with the start of the first triggering period.
+    """
+    tested = _rolling(values, rule.window, rule.aggregate)
+    with np.errstate(invalid="ignore"):
+        holds = _OPERATORS[rule.operator](tested, rule.threshold)
+    if rule.duration > 1:
+        # A run of ``duration`` steps starting at i holds iff the count of
+        # true steps in [i, i + duration) equals ``duration``
+        running = np.zeros((holds.shape[0], holds.shape[1] + 1), dtype=np.int64)
+        np.cumsum(holds, axis=1, out=running[:, 1:])
+        holds = running[:, rule.duration :] - running[:, : -rule.duration] == rule.duration
+
+    lo, hi = 0, holds.shape[1]
+    if rule.within is not None:
+        start = int(time.time()) if now is None else now
+        lo = min(int(np.searchsorted(time_axis, start)), hi)
+        hi = min(lo + rule.within, hi)
+    candidates = holds[:, lo:hi]
+    hit = candidates.any(axis=1) if candidates.size else np.zeros(holds.shape[0], dtype=np.bool_)
+    index = np.flatnonzero(hit)
+    first = np.argmax(candidates[index], axis=1) + lo if index.size else index
+    # A trailing window is NaN until full, so it starts at or after step 0
+    return AlertMatches(
+        rule=rule.name,
+        index=index,
+        onset=time_axis[first - (rule.window - 1)],
+        value=tested[index, first],
+    )
+
+
+def evaluate_rules(
+    rules: Sequence[AlertRule],
+    responses: Sequence[BaseStruct],
+    *,
+    section: str = "hourly",
+    now: int | None = None,
+) -> dict[str, AlertMatches]:
+    """
+    Evaluate rules across the responses of many locations.
+
+    Parameters
+    ----------
+    rules : Sequence[AlertRule]
+        Rules to evaluate.
+    responses : Sequence[BaseStruct]
+        Responses sharing one time axis, one per location.
+    section : str, optional
+        Section to evaluate. Default is "hourly".
+    now : int, optional
+        UTC Unix seconds ``within`` counts from. Defaults to the current
+        time.
+
+    Returns
+    -------
+    dict[str, AlertMatches]
+        Matches per rule name. ``index`` refers to positions in
+        ``responses``.
+    """
+    variables = list(dict.fromkeys(rule.variable for rule in rules))
+    time_axis, stacked = stack_locations(responses, variables, section=section)
+    return {
+        rule.name: evaluate_rule(rule, time_axis, stacked[rule.variable], now=now) for rule in rules
+    }
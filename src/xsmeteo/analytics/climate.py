@@ -0,0 +1,513 @@
+"""
+Multi-model climate projections.
+
+Requesting several CMIP6 models at once returns one very large ``daily``
+section with model-suffixed columns (``temperature_2m_max_EC_Earth3P_HR``).
+This module fans the model list out over concurrent requests, decodes every
+model into its own float arrays and offers a streaming reducer that
+aggregates models one at a time, so the full ``(models x days)`` matrix never
+has to exist in memory.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+import numpy as np
+
+import xsmeteo.services.climate as climate_service
+
+if typing.TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+
+    import numpy.typing as npt
+
+    import xsmeteo.models.climate as climate_models
+    from xsmeteo.client.async_client import AsyncXSMeteo
+    from xsmeteo.client.sync_client import XSMeteo
+    from xsmeteo.services.common import RequestDef
+
+
+@dataclasses.dataclass
+class ModelSeries:
+    """
+    Daily series of a single climate model.
+
+    Attributes
+    ----------
+    model : str
+        CMIP6 model name.
+    time : list[str]
+        Dates (``YYYY-MM-DD``).
+    columns : dict[str, NDArray[float64]]
+        Values per variable; missing values are NaN.
+    """
+
+    model: str
+    time: list[str]
+    columns: dict[str, npt.NDArray[np.float64]]
+
+
+def split_model_columns(
+    response: climate_models.ClimateResponse,
+    models: Sequence[str],
+) -> list[ModelSeries]:
+    """
+    Split a climate response into one series per model.
+
+    Parameters
+    ----------
+    response : ClimateResponse
+        Response of a request for ``models``.
+    models : Sequence[str]
+        The models that were requested. With a single model the API omits
+        the column suffix.
+
+    Returns
+    -------
+    list[ModelSeries]
+        One series per model, in ``models`` order.
+
+    Raises
+    ------
+    ValueError
+        If the response contains no daily data.
+    """
+    if not response.daily:
+        raise ValueError("response contains no daily data")
+    daily = response.daily
+    time = [str(value) for value in daily["time"]]
+    series = []
+    for model in models:
+        suffix = f"_{model}"
+        columns: dict[str, npt.NDArray[np.float64]] = {}
+        for key, values in daily.items():
+            if key.endswith(suffix):
+                columns[key.removesuffix(suffix)] = np.asarray(values, dtype=np.float64)
+            elif len(models) == 1 and key != "time":
+                columns[key] = np.asarray(values, dtype=np.float64)
+        series.append(ModelSeries(model=model, time=time, columns=columns))
+    return series
+
+
+class ClimateModels:
+    """
+    Per-variable ``(models x days)`` matrices of a multi-model projection.
+
+    Examples
+    --------
+    >>> stack = fetch_models(
+    ...     client,
+    ...     latitude=52.52,
+    ...     longitude=13.41,
+    ...     start_date="1950-01-01",
+    ...     end_date="2050-12-31",
+    ...     models=["EC_Earth3P_HR", "MRI_AGCM3_2_S"],
+    ...     daily=["temperature_2m_max"],
+    ... )
+    >>> stack["temperature_2m_max"].mean(axis=0)
+    """
+
+    def __init__(self, series: Sequence[ModelSeries]) -> None:
+        """
+        Stack per-model series.
+
+        Parameters
+        ----------
+        series : Sequence[ModelSeries]
+            Series sharing the same time axis.
+
+        Raises
+        ------
+        ValueError
+            If the series do not share the same time axis.
+        """
+        self.models = [item.model for item in series]
+        self.time = series[0].time if series else []
+        # Equal lengths are not enough: models may cover shifted windows
+        if any(item.time != self.time for item in series):
+            raise ValueError("series do not share the same time axis")
+        variables = dict.fromkeys(key for item in series for key in item.columns)
+        self._arrays: dict[str, npt.NDArray[np.float64]] = {}
+        for variable in variables:
+            matrix = np.full((len(series), len(self.time)), np.nan, dtype=np.float64)
+            for row, item in enumerate(series):
+                if variable in item.columns:
+                    matrix[row] = item.columns[variable]
+            self._arrays[variable] = matrix
+
+    @property
+    def variables(self) -> list[str]:
+        """Decoded variable names."""
+        return list(self._arrays)
+
+    def __getitem__(self, variable: str) -> npt.NDArray[np.float64]:
+        """Return the contiguous ``(models x days)`` matrix of ``variable``."""
+        return self._arrays[variable]
+
+
+@dataclasses.dataclass
+class ClimateSummary:
+    """
+    Streaming aggregates of one variable across models.
+
+    Attributes
+    ----------
+    models : list[str]
+        Model names in row order.
+    decades : list[int]
+        First year of every decade covered (e.g. 1950).
+    decade_means : NDArray[float64]
+        Mean per model and decade, shape ``(models, decades)``.
+    trend_per_decade : NDArray[float64]
+        Least-squares linear trend per model in units per decade.
+    quantiles : NDArray[float64]
+        Estimated quantiles per model, shape ``(models, len(q))``.
+    """
+
+    models: list[str]
+    decades: list[int]
+    decade_means: npt.NDArray[np.float64]
+    trend_per_decade: npt.NDArray[np.float64]
+    quantiles: npt.NDArray[np.float64]
+
+
+@dataclasses.dataclass
+class _Accumulator:
+    decade_sum: dict[int, float] = dataclasses.field(default_factory=dict)
+    decade_count: dict[int, int] = dataclasses.field(default_factory=dict)
+    moments: npt.NDArray[np.float64] = dataclasses.field(
+        default_factory=lambda: np.zeros(5, dtype=np.float64)
+    )
+    histogram: npt.NDArray[np.int64] | None = None
+
+
+class ClimateReducer:
+    """
+    Out-of-core reducer for decade means, trends and quantiles.
+
+    Feed it one ``ModelSeries`` (or one date chunk of a model) at a time; it
+    only keeps running sums and a fixed-size histogram per model.
+
+    Examples
+    --------
+    >>> reducer = ClimateReducer(bins=(-40.0, 50.0, 900))
+    >>> async for series in stream_models(client, ...):
+    ...     reducer.update(series)
+    >>> summary = reducer.summary("temperature_2m_max")
+    """
+
+    def __init__(
+        self,
+        *,
+        q: Sequence[float] = (0.1, 0.5, 0.9),
+        bins: tuple[float, float, int] = (-100.0, 100.0, 2000),
+    ) -> None:
+        """
+        Initialize the reducer.
+
+        Parameters
+        ----------
+        q : Sequence[float], optional
+            Quantiles to estimate. Default is ``(0.1, 0.5, 0.9)``.
+        bins : tuple[float, float, int], optional
+            ``(low, high, count)`` of the histogram used for quantiles. The
+            estimate is accurate to one bin width; values outside the range
+            are clipped into the edge bins.
+        """
+        self._q = list(q)
+        self._edges = np.linspace(bins[0], bins[1], bins[2] + 1)
+        self._state: dict[str, dict[str, _Accumulator]] = {}
+
+    def update(self, series: ModelSeries) -> None:
+        """
+        Fold a series into the running aggregates.
+
+        Parameters
+        ----------
+        series : ModelSeries
+            Daily values of one model; consecutive calls for the same model
+            may carry consecutive date chunks.
+        """
+        if not series.time:
+            return
+        days = np.asarray([value[:10] for value in series.time], dtype="datetime64[D]")
+        decades = (days.astype("datetime64[Y]").astype(np.int64) + 1970) // 10 * 10
+        years = days.astype(np.int64) / 365.25
+        for variable, values in series.columns.items():
+            accumulator = self._state.setdefault(variable, {}).setdefault(
+                series.model, _Accumulator()
+            )
+            valid = ~np.isnan(values)
+            x, y, decade = years[valid], values[valid], decades[valid]
+
+            unique, inverse = np.unique(decade, return_inverse=True)
+            sums = np.bincount(inverse, weights=y, minlength=len(unique))
+            counts = np.bincount(inverse, minlength=len(unique))
+            for start, total, count in zip(
+                unique.tolist(), sums.tolist(), counts.tolist(), strict=True
+            ):
+                accumulator.decade_sum[start] = accumulator.decade_sum.get(start, 0.0) + total
+                accumulator.decade_count[start] = accumulator.decade_count.get(start, 0) + count
+
+            accumulator.moments += (len(y), x.sum(), y.sum(), (x * x).sum(), (x * y).sum())
+
+            clipped = np.clip(y, self._edges[0], self._edges[-1])
+            histogram, _ = np.histogram(clipped, bins=self._edges)
+            if accumulator.histogram is None:
+                accumulator.histogram = histogram
+            else:
+                accumulator.histogram += histogram
+
+    def summary(self, variable: str) -> ClimateSummary:
+        """
+        Return the aggregates of a variable.
+
+        Parameters
+        ----------
+        variable : str
+            Variable name.
+
+        Returns
+        -------
+        ClimateSummary
+            Per-model decade means, trends and quantiles.
+        """
+        state = self._state.get(variable, {})
+        models = list(state)
+        decades = sorted({start for acc in state.values() for start in acc.decade_sum})
+        decade_means = np.full((len(models), len(decades)), np.nan, dtype=np.float64)
+        trend = np.full(len(models), np.nan, dtype=np.float64)
+        quantiles = np.full((len(models), len(self._q)), np.nan, dtype=np.float64)
+        for row, acc in enumerate(state.values()):
+            for column, start in enumerate(decades):
+                if acc.decade_count.get(start):
+                    decade_means[row, column] = acc.decade_sum[start] / acc.decade_count[start]
+            n, sx, sy, sxx, sxy = acc.moments
+            denominator = n * sxx - sx * sx
+            if denominator > 0:
+                trend[row] = 10 * (n * sxy - sx * sy) / denominator
+            if acc.histogram is not None and acc.histogram.sum():
+                quantiles[row] = self._histogram_quantiles(acc.histogram)
+        return ClimateSummary(
+            models=models,
+            decades=decades,
+            decade_means=decade_means,
+            trend_per_decade=trend,
+            quantiles=quantiles,
+        )
+
+    def _histogram_quantiles(self, histogram: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+        cumulative = np.concatenate(([0.0], np.cumsum(histogram, dtype=np.float64)))
+        targets = np.asarray(self._q, dtype=np.float64) * cumulative[-1]
+        quantiles: npt.NDArray[np.float64] = np.interp(targets, cumulative, self._edges)
+        return quantiles
+
+
+def _chunks(
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    models: Sequence[str],
+    daily: list[str],
+    models_per_request: int,
+) -> list[tuple[list[str], RequestDef[climate_models.ClimateResponse]]]:
+    groups = [
+        list(models[start : start + models_per_request])
+        for start in range(0, len(models), models_per_request)
+    ]
+    return [
+        (
+            group,
+            climate_service.get_climate(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=start_date,
+                end_date=end_date,
+                models_=group,
+                daily=daily,
+            ),
+        )
+        for group in groups
+    ]
+
+
+def iter_models(
+    client: XSMeteo,
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    models: Sequence[str],
+    daily: list[str],
+    models_per_request: int = 1,
+    concurrency: int = 4,
+) -> Iterator[ModelSeries]:
+    """
+    Fetch a multi-model projection, yielding one model at a time.
+
+    At most ``concurrency`` requests are in flight and only their responses
+    are held in memory.
+
+    Parameters
+    ----------
+    client : XSMeteo
+        The client used to fetch the projections.
+    latitude : float
+        WGS84 Latitude.
+    longitude : float
+        WGS84 Longitude.
+    start_date : str
+        Start date (e.g. "1950-01-01").
+    end_date : str
+        End date (e.g. "2050-12-31").
+    models : Sequence[str]
+        CMIP6 models to fetch.
+    daily : list[str]
+        Daily climate variables.
+    models_per_request : int, optional
+        Models combined into a single request. Default is 1.
+    concurrency : int, optional
+        Maximum number of requests in flight. Default is 4.
+
+    Yields
+    ------
+    ModelSeries
+        The decoded series of every model, in ``models`` order.
+    """
+    chunks = _chunks(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=start_date,
+        end_date=end_date,
+        models=models,
+        daily=daily,
+        models_per_request=models_per_request,
+    )
+    for start in range(0, len(chunks), concurrency):
+        window = chunks[start : start + concurrency]
+        responses = client.request_many([req for _, req in window], concurrency=concurrency)
+        for (group, _), response in zip(window, responses, strict=True):
+            yield from split_model_columns(response, group)
+
+
+async def stream_models(
+    client: AsyncXSMeteo,
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    models: Sequence[str],
+    daily: list[str],
+    models_per_request: int = 1,
+    concurrency: int = 4,
+) -> AsyncIterator[ModelSeries]:
+    """
+    Fetch a multi-model projection, yielding one model at a time.
+
+    Asynchronous counterpart of ``iter_models`` with the same parameters.
+
+    Yields
+    ------
+    ModelSeries
+        The decoded series of every model, in ``models`` order.
+    """
+    chunks = _chunks(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=start_date,
+        end_date=end_date,
+        models=models,
+        daily=daily,
+        models_per_request=models_per_request,
+    )
+    for start in range(0, len(chunks), concurrency):
+        window = chunks[start : start + concurrency]
+        responses = await client.request_many([req for _, req in window], concurrency=concurrency)
+        for (group, _), response in zip(window, responses, strict=True):
+            for series in split_model_columns(response, group):
+                yield series
+
+
+def fetch_models(
+    client: XSMeteo,
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    models: Sequence[str],
+    daily: list[str],
+    models_per_request: int = 1,
+    concurrency: int = 4,
+) -> ClimateModels:
+    """
+    Fetch a multi-model projection into stacked ``(models x days)`` arrays.
+
+    Takes the same parameters as ``iter_models``.
+
+    Returns
+    -------
+    ClimateModels
+        The stacked projection.
+    """
+    return ClimateModels(
+        list(
+            iter_models(
+                client,
+                latitude=latitude,
+                longitude=longitude,
+                start_date=start_date,
+                end_date=end_date,
+                models=models,
+                daily=daily,
+                models_per_request=models_per_request,
+                concurrency=concurrency,
+            )
+        )
+    )
+
+
+async def fetch_models_async(
+    client: AsyncXSMeteo,
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    models: Sequence[str],
+    daily: list[str],
+    models_per_request: int = 1,
+    concurrency: int = 4,
+) -> ClimateModels:
+    """
+    Fetch a multi-model projection into stacked ``(models x days)`` arrays.
+
+    Asynchronous counterpart of ``fetch_models``.
+
+    Returns
+    -------
+    ClimateModels
+        The stacked projection.
+    """
+    return ClimateModels(
+        [
+            series
+            async for series in stream_models(
+                client,
+                latitude=latitude,
+                longitude=longitude,
+                start_date=start_date,
+                end_date=end_date,
+                models=models,
+                daily=daily,
+                models_per_request=models_per_request,
+                concurrency=concurrency,
+            )
+        ]
+    )
@@ -0,0 +1,258 @@
+"""
+Change detection between forecast runs.
+
+Consecutive polls of the same location mostly repeat the previous answer.
+``DiffEngine`` keeps the last reported series per location and reduces each
+new response to a ``ForecastDelta``: only the time steps and variables that
+moved by more than a per-variable tolerance, compared on the columnar arrays.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+import typing
+
+import numpy as np
+
+import xsmeteo.analytics.timeseries as timeseries
+
+if typing.TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Mapping, Sequence
+
+    import numpy.typing as npt
+
+    from xsmeteo.client.watchlist import Refresh
+    from xsmeteo.models.base import BaseStruct
+
+
+@dataclasses.dataclass
+class ForecastDelta:
+    """
+    Changed values of one section of a location's forecast.
+
+    Attributes
+    ----------
+    latitude : float
+        WGS84 Latitude.
+    longitude : float
+        WGS84 Longitude.
+    section : str
+        Response section, e.g. "hourly".
+    time : list[int]
+        UTC Unix seconds of the changed time steps.
+    values : dict[str, list[float | None]]
+        New values at those steps, for the variables that changed; ``None``
+        where the value is missing.
+    """
+
+    latitude: float
+    longitude: float
+    section: str
+    time: list[int]
+    values: dict[str, list[float | None]]
+
+
+def diff_series(
+    previous: timeseries.TimeSeries | None,
+    current: timeseries.TimeSeries,
+    *,
+    tolerances: Mapping[str, float] | None = None,
+    default_tolerance: float = 0.0,
+) -> tuple[npt.NDArray[np.int64], dict[str, npt.NDArray[np.float64]]]:
+    """
+    Find the time steps and variables of ``current`` that differ from ``previous``.
+
+    A value changes when it moves by more than its tolerance or becomes
+    (un)available. Steps missing from ``previous`` and variables it lacks
+    always count as changed; steps only in ``previous`` are ignored.
+
+    Parameters
+    ----------
+    previous : TimeSeries | None
+        Series of the last run, or None if there is none.
+    current : TimeSeries
+        Series of the new run.
+    tolerances : Mapping[str, float], optional
+        Largest absolute change per variable that is not reported.
+    default_tolerance : float, optional
+        Tolerance for variables not in ``tolerances``. Default is 0.0, so any
+        change is reported.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, dict[str, numpy.ndarray]]
+        The changed timestamps and, for every changed variable, its new
+        values at those timestamps.
+    """
+    tolerances = tolerances or {}
+    if previous is None or len(previous) == 0:
+        return current.time, {name: current[name] for name in current.variables}
+
+    index = np.minimum(np.searchsorted(previous.time, current.time), len(previous) - 1)
+    matched = previous.time[index] == current.time
+    masks: dict[str, npt.NDArray[np.bool_]] = {}
+    for name in current.variables:
+        new = current[name]
+        if name not in previous.variables:
+            changed = np.ones(new.shape, dtype=np.bool_)
+        else:
+            old = previous[name][index]
+            tolerance = tolerances.get(name, default_tolerance)
+            with np.errstate(invalid="ignore"):
+                moved = np.abs(new - old) > tolerance
+            changed = ~matched | moved | (np.isnan(new) != np.isnan(old))
+        if changed.any():
+            masks[name] = changed
+
+    if not masks:
+        return current.time[:0], {}
+    steps = np.logical_or.reduce(list(masks.values()))
+    return current.time[steps], {name: current[name][steps] for name in masks}
+
+
+def _reported(
+    previous: timeseries.TimeSeries | None,
+    current: timeseries.TimeSeries,
+    time: npt.NDArray[np.int64],
+    values: Mapping[str, npt.NDArray[np.float64]],
+) -> timeseries.TimeSeries:
+    """Return ``previous`` on the time axis of ``current`` with a delta applied."""
+    if previous is None or len(previous) == 0:
+        return current
+    steps = np.isin(current.time, time)
+    index = np.minimum(np.searchsorted(previous.time, current.time), len(previous) - 1)
+    # Steps and variables new in ``current`` are always part of the delta, so
+    # everything else is found in ``previous``
+    columns = {
+        name: np.where(steps, current[name], previous[name][index])
+        if name in previous.variables
+        else current[name]
+        for name in values
+    }
+    for name in current.variables:
+        if name not in values:
+            columns[name] = previous[name][index]
+    return timeseries.TimeSeries(
+        current.time,
+        columns,
+        utc_offset_seconds=current.utc_offset_seconds,
+        timezone=current.timezone,
+        timezone_abbreviation=current.timezone_abbreviation,
+    )
+
+
+class DiffEngine:
+    """
+    Reduce successive responses per location to compact deltas.
+
+    Examples
+    --------
+    >>> engine = DiffEngine(tolerances={"temperature_2m": 0.2, "precipitation": 0.1})
+    >>> async for delta in engine.deltas(watchlist.updates()):
+    ...     producer.send("forecast-deltas", msgspec.json.encode(delta))
+    """
+
+    def __init__(
+        self,
+        *,
+        sections: Sequence[str] = ("hourly",),
+        tolerances: Mapping[str, float] | None = None,
+        default_tolerance: float = 0.0,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Parameters
+        ----------
+        sections : Sequence[str], optional
+            Sections to compare, out of "hourly", "daily" and "minutely_15".
+            Default is ("hourly",).
+        tolerances : Mapping[str, float], optional
+            Largest absolute change per variable that is not reported.
+        default_tolerance : float, optional
+            Tolerance for other variables. Default is 0.0.
+        """
+        self._sections = tuple(sections)
+        self._tolerances = dict(tolerances or {})
+        self._default_tolerance = default_tolerance
+        self._previous: dict[tuple[float, float, str], timeseries.TimeSeries] = {}
+
+    def update(
+        self, latitude: float, longitude: float, response: BaseStruct
+    ) -> list[ForecastDelta]:
+        """
+        Compare a new response with what was reported for the same location.
+
+        The first response of a location is reported in full. Values within
+        tolerance are not reported and not remembered either, so a slow drift
+        is reported once it adds up to more than the tolerance.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude of the watched location.
+        longitude : float
+            WGS84 Longitude of the watched location.
+        response : BaseStruct
+            The new response, e.g. ``ForecastResponse``.
+
+        Returns
+        -------
+        list[ForecastDelta]
+            One delta per section with changes; empty if nothing changed.
+        """
+        deltas: list[ForecastDelta] = []
+        for section in self._sections:
+            columns = getattr(response, section, None)
+            if not columns or "time" not in columns:
+                continue
+            current = timeseries.TimeSeries.from_response(response, section)
+            key = (latitude, longitude, section)
+            previous = self._previous.get(key)
+            time, values = diff_series(
+                previous,
+                current,
+                tolerances=self._tolerances,
+                default_tolerance=self._default_tolerance,
+            )
+            self._previous[key] = _reported(previous, current, time, values)
+            if time.size == 0:
+                continue
+            deltas.append(
+                ForecastDelta(
+                    latitude,
+                    longitude,
+                    section,
+                    time.tolist(),
+                    {
+                        name: [None if math.isnan(value) else value for value in column.tolist()]
+                        for name, column in values.items()
+                    },
+                )
+            )
+        return deltas
+
+    def forget(self, latitude: float, longitude: float) -> None:
+        """Drop the stored series of a location; its next response is reported in full."""
+        for section in self._sections:
+            self._previous.pop((latitude, longitude, section), None)
+
+    async def deltas(self, refreshes: AsyncIterable[Refresh]) -> AsyncIterator[ForecastDelta]:
+        """
+        Turn a stream of refreshes into a stream of deltas.
+
+        Parameters
+        ----------
+        refreshes : AsyncIterable[Refresh]
+            New responses per location, e.g. ``Watchlist.updates()``.
+
+        Yields
+        ------
+        ForecastDelta
+            Changes in the order the refreshes arrive; unchanged refreshes
+            yield nothing.
+        """
+        async for refresh in refreshes:
+            for delta in self.update(refresh.latitude, refresh.longitude, refresh.response):
+                yield delta
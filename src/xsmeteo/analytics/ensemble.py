@@ -0,0 +1,200 @@
+"""
+Ensemble member matrices.
+
+Ensemble endpoints return every member as its own column
+(``temperature_2m``, ``temperature_2m_member01`` ... ``temperature_2m_member50``).
+This module regroups those columns into one contiguous ``(members x time)``
+array per variable and computes statistics across members in a single pass.
+"""
+
+from __future__ import annotations
+
+import re
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import numpy.typing as npt
+
+    import xsmeteo.models.ensemble as ensemble_models
+
+_MEMBER_PATTERN = re.compile(r"(?P<head>.+?)_member(?P<member>\d+)(?P<tail>.*)")
+
+
+def group_member_columns(columns: Mapping[str, object]) -> dict[str, list[tuple[int, str]]]:
+    """
+    Group member columns by variable.
+
+    The control run carries no ``_memberNN`` suffix and is reported as
+    member 0. Model suffixes following the member number are kept as part of
+    the variable name.
+
+    Parameters
+    ----------
+    columns : Mapping[str, object]
+        Column names of an ``hourly``/``daily`` section. ``time`` is skipped.
+
+    Returns
+    -------
+    dict[str, list[tuple[int, str]]]
+        ``(member, column)`` pairs per variable, sorted by member.
+    """
+    groups: dict[str, list[tuple[int, str]]] = {}
+    for key in columns:
+        if key == "time":
+            continue
+        match = _MEMBER_PATTERN.fullmatch(key)
+        if match is None:
+            groups.setdefault(key, []).append((0, key))
+        else:
+            variable = match["head"] + match["tail"]
+            groups.setdefault(variable, []).append((int(match["member"]), key))
+    for members in groups.values():
+        members.sort()
+    return groups
+
+
+class EnsembleMembers:
+    """
+    Per-variable ``(members x time)`` matrices of an ensemble section.
+
+    Missing values (``null`` in the payload) are stored as NaN and ignored by
+    every statistic.
+
+    Examples
+    --------
+    >>> response = client.get_ensemble(
+    ...     latitude=52.52, longitude=13.41, models=["icon_seamless"], hourly=["temperature_2m"]
+    ... )
+    >>> members = EnsembleMembers.from_response(response)
+    >>> members.quantiles("temperature_2m", [0.1, 0.5, 0.9])
+    """
+
+    def __init__(
+        self,
+        time: Sequence[float | int | str | None],
+        columns: Mapping[str, Sequence[float | int | str | None]],
+    ) -> None:
+        """
+        Decode member columns into matrices.
+
+        Parameters
+        ----------
+        time : Sequence
+            The shared time axis.
+        columns : Mapping[str, Sequence]
+            Raw columns keyed by name, e.g. the ``hourly`` dict of a response.
+        """
+        self.time = list(time)
+        self._members: dict[str, list[int]] = {}
+        self._arrays: dict[str, npt.NDArray[np.float64]] = {}
+        for variable, members in group_member_columns(columns).items():
+            matrix = np.empty((len(members), len(self.time)), dtype=np.float64)
+            for row, (_, key) in enumerate(members):
+                matrix[row] = np.asarray(columns[key], dtype=np.float64)
+            self._members[variable] = [member for member, _ in members]
+            self._arrays[variable] = matrix
+
+    @classmethod
+    def from_response(
+        cls,
+        response: ensemble_models.EnsembleResponse,
+    ) -> EnsembleMembers:
+        """
+        Decode the ``hourly`` section of an ensemble response.
+
+        Parameters
+        ----------
+        response : EnsembleResponse
+            The response returned by ``get_ensemble``.
+
+        Returns
+        -------
+        EnsembleMembers
+            The decoded member matrices.
+
+        Raises
+        ------
+        ValueError
+            If the response contains no hourly data.
+        """
+        if not response.hourly:
+            raise ValueError("response contains no hourly data")
+        return cls(response.hourly["time"], response.hourly)
+
+    @property
+    def variables(self) -> list[str]:
+        """Decoded variable names."""
+        return list(self._arrays)
+
+    def members(self, variable: str) -> list[int]:
+        """Member numbers of ``variable`` in row order (0 is the control run)."""
+        return self._members[variable]
+
+    def __getitem__(self, variable: str) -> npt.NDArray[np.float64]:
+        """Return the contiguous ``(members x time)`` matrix of ``variable``."""
+        return self._arrays[variable]
+
+    def mean(self, variable: str) -> npt.NDArray[np.float64]:
+        """Ensemble mean per time step."""
+        return np.nanmean(self._arrays[variable], axis=0)
+
+    def spread(self, variable: str) -> npt.NDArray[np.float64]:
+        """Ensemble spread (population standard deviation) per time step."""
+        return np.nanstd(self._arrays[variable], axis=0)
+
+    def quantiles(
+        self,
+        variable: str,
+        q: float | Sequence[float],
+    ) -> npt.NDArray[np.float64]:
+        """
+        Member quantiles per time step.
+
+        Parameters
+        ----------
+        variable : str
+            Variable name.
+        q : float | Sequence[float]
+            Quantile(s) between 0 and 1.
+
+        Returns
+        -------
+        NDArray[float64]
+            Shape ``(time,)`` for a scalar ``q``, otherwise ``(len(q), time)``.
+        """
+        return np.nanquantile(self._arrays[variable], q, axis=0)
+
+    def exceedance_probability(
+        self,
+        variable: str,
+        threshold: float,
+        *,
+        below: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        """
+        Fraction of members exceeding a threshold per time step.
+
+        Parameters
+        ----------
+        variable : str
+            Variable name.
+        threshold : float
+            Threshold in the variable's unit.
+        below : bool, optional
+            Count members strictly below the threshold instead of above.
+
+        Returns
+        -------
+        NDArray[float64]
+            Probabilities between 0 and 1; NaN where no member has data.
+        """
+        matrix = self._arrays[variable]
+        valid = ~np.isnan(matrix)
+        hits = (matrix < threshold) if below else (matrix > threshold)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            probability: npt.NDArray[np.float64] = hits.sum(axis=0) / valid.sum(axis=0)
+        return probability
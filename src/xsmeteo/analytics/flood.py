@@ -0,0 +1,233 @@
+"""
+Flood ensemble exceedance.
+
+With ``ensemble=True`` the Flood API returns the 51 GloFAS members of a
+variable as separate columns. This module stacks them for many river points
+into ``(points x members x days)`` arrays and computes per-point threshold
+exceedance probabilities in one vectorized pass, one batch of points at a time.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+import numpy as np
+
+import xsmeteo.analytics.ensemble as ensemble
+import xsmeteo.analytics.timeseries as timeseries
+import xsmeteo.services.flood as flood_service
+
+if typing.TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+
+    import numpy.typing as npt
+
+    import xsmeteo.models.flood as flood_models
+    from xsmeteo.client.async_client import AsyncXSMeteo
+    from xsmeteo.client.sync_client import XSMeteo
+    from xsmeteo.services.common import RequestDef
+
+
+@dataclasses.dataclass
+class FloodExceedance:
+    """
+    Exceedance results for one batch of river points.
+
+    Attributes
+    ----------
+    offset : int
+        Index of the first point of the batch within the full input.
+    time : list[str]
+        Forecast days shared by all points.
+    discharge : NDArray[float64]
+        Member values, shape ``(points, members, days)``.
+    probability : NDArray[float64]
+        Exceedance probability, shape ``(points, days)``.
+    """
+
+    offset: int
+    time: list[str]
+    discharge: npt.NDArray[np.float64]
+    probability: npt.NDArray[np.float64]
+
+
+def stack_members(
+    responses: Sequence[flood_models.FloodResponse],
+    *,
+    variable: str = "river_discharge",
+) -> tuple[list[str], npt.NDArray[np.float64]]:
+    """
+    Stack the ensemble members of many flood responses.
+
+    Parameters
+    ----------
+    responses : Sequence[FloodResponse]
+        Responses fetched with ``ensemble=True``, one per point.
+    variable : str, optional
+        Daily variable to stack. Default is ``"river_discharge"``.
+
+    Returns
+    -------
+    tuple[list[str], NDArray[float64]]
+        The shared time axis and the ``(points, members, days)`` array.
+        Members missing for a point are filled with NaN.
+
+    Raises
+    ------
+    ValueError
+        If a response lacks the variable or the time axes differ.
+    """
+    if not responses:
+        return [], np.empty((0, 0, 0), dtype=np.float64)
+    dailies = []
+    for response in responses:
+        if not response.daily or variable not in response.daily:
+            raise ValueError(f"response contains no daily {variable!r} data")
+        dailies.append(response.daily)
+
+    axis = timeseries.decode_time(responses[0], "daily")
+    for response in responses[1:]:
+        if not np.array_equal(timeseries.decode_time(response, "daily"), axis):
+            raise ValueError("responses do not share the same time axis")
+
+    groups = [ensemble.group_member_columns(daily)[variable] for daily in dailies]
+    time = [str(value) for value in dailies[0]["time"]]
+    members = max(member for group in groups for member, _ in group) + 1
+    stack = np.full((len(dailies), members, len(time)), np.nan, dtype=np.float64)
+    for point, (daily, group) in enumerate(zip(dailies, groups, strict=True)):
+        for member, key in group:
+            stack[point, member] = np.asarray(daily[key], dtype=np.float64)
+    return time, stack
+
+
+def exceedance_probability(
+    stack: npt.NDArray[np.float64],
+    thresholds: float | Sequence[float] | npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """
+    Fraction of members above a per-point threshold.
+
+    Parameters
+    ----------
+    stack : NDArray[float64]
+        Member values, shape ``(points, members, days)``.
+    thresholds : float | Sequence[float] | NDArray[float64]
+        A single threshold or one per point.
+
+    Returns
+    -------
+    NDArray[float64]
+        Probabilities, shape ``(points, days)``; NaN where no member has data.
+    """
+    limits = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), stack.shape[:1])
+    valid = ~np.isnan(stack)
+    hits = stack > limits[:, np.newaxis, np.newaxis]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        probability: npt.NDArray[np.float64] = hits.sum(axis=1) / valid.sum(axis=1)
+    return probability
+
+
+def _batches(
+    latitude: Sequence[float],
+    longitude: Sequence[float],
+    thresholds: float | Sequence[float] | npt.NDArray[np.float64],
+    variable: str,
+    batch_size: int,
+) -> Iterator[tuple[int, list[RequestDef[flood_models.FloodResponse]], npt.NDArray[np.float64]]]:
+    if len(latitude) != len(longitude):
+        raise ValueError("latitude and longitude must have the same length")
+    limits = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), (len(latitude),))
+    for start in range(0, len(latitude), batch_size):
+        stop = start + batch_size
+        request_defs = [
+            flood_service.get_flood(latitude=lat, longitude=lon, daily=[variable], ensemble=True)
+            for lat, lon in zip(latitude[start:stop], longitude[start:stop], strict=True)
+        ]
+        yield start, request_defs, limits[start:stop]
+
+
+def _evaluate(
+    offset: int,
+    responses: Sequence[flood_models.FloodResponse],
+    limits: npt.NDArray[np.float64],
+    variable: str,
+) -> FloodExceedance:
+    time, stack = stack_members(responses, variable=variable)
+    return FloodExceedance(
+        offset=offset,
+        time=time,
+        discharge=stack,
+        probability=exceedance_probability(stack, limits),
+    )
+
+
+def iter_exceedance(
+    client: XSMeteo,
+    *,
+    latitude: Sequence[float],
+    longitude: Sequence[float],
+    thresholds: float | Sequence[float] | npt.NDArray[np.float64],
+    variable: str = "river_discharge",
+    batch_size: int = 256,
+    concurrency: int = 8,
+) -> Iterator[FloodExceedance]:
+    """
+    Compute exceedance probabilities for many river points, batch by batch.
+
+    Only one batch of responses is held in memory at a time.
+
+    Parameters
+    ----------
+    client : XSMeteo
+        The client used to fetch the flood ensembles.
+    latitude : Sequence[float]
+        Latitudes of the river points.
+    longitude : Sequence[float]
+        Longitudes of the river points, aligned to ``latitude``.
+    thresholds : float | Sequence[float] | NDArray[float64]
+        Discharge threshold (e.g. a return-period level), single or per point.
+    variable : str, optional
+        Daily variable to evaluate. Default is ``"river_discharge"``.
+    batch_size : int, optional
+        Points fetched and evaluated together. Default is 256.
+    concurrency : int, optional
+        Maximum number of requests in flight. Default is 8.
+
+    Yields
+    ------
+    FloodExceedance
+        Results for consecutive batches of points, in input order.
+    """
+    for offset, request_defs, limits in _batches(
+        latitude, longitude, thresholds, variable, batch_size
+    ):
+        responses = client.request_many(request_defs, concurrency=concurrency)
+        yield _evaluate(offset, responses, limits, variable)
+
+
+async def stream_exceedance(
+    client: AsyncXSMeteo,
+    *,
+    latitude: Sequence[float],
+    longitude: Sequence[float],
+    thresholds: float | Sequence[float] | npt.NDArray[np.float64],
+    variable: str = "river_discharge",
+    batch_size: int = 256,
+    concurrency: int = 8,
+) -> AsyncIterator[FloodExceedance]:
+    """
+    Compute exceedance probabilities for many river points, batch by batch.
+
+    Asynchronous counterpart of ``iter_exceedance`` with the same parameters.
+
+    Yields
+    ------
+    FloodExceedance
+        Results for consecutive batches of points, in input order.
+    """
+    for offset, request_defs, limits in _batches(
+        latitude, longitude, thresholds, variable, batch_size
+    ):
+        responses = await client.request_many(request_defs, concurrency=concurrency)
+        yield _evaluate(offset, responses, limits, variable)
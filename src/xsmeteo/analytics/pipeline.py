@@ -0,0 +1,260 @@
+"""
+Process-pool decoding for CPU-bound bulk jobs.
+
+Decoding JSON and building columns holds the GIL, so a single process stalls
+on CPU long before the network is saturated. ``DecodePool`` lets the async
+client only download raw bodies while worker processes decode them into
+``TimeSeries`` columns and run an optional transform. Columns come back
+through shared memory as one contiguous block per response instead of as
+pickled lists.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import multiprocessing
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import msgspec
+import numpy as np
+
+import xsmeteo.analytics.timeseries as timeseries
+import xsmeteo.client.async_client as async_client
+import xsmeteo.exceptions as exceptions
+
+if typing.TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sequence
+
+    from xsmeteo.services.common import RequestDef
+
+type Transform = Callable[[timeseries.TimeSeries], timeseries.TimeSeries]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Packed:
+    """Layout of a series written to a shared memory block."""
+
+    name: str
+    length: int
+    variables: tuple[str, ...]
+    utc_offset_seconds: int
+    timezone: str | None
+    timezone_abbreviation: str | None
+
+
+def _decode(
+    content: bytes,
+    model: type[typing.Any],
+    section: str,
+    transform: Transform | None,
+) -> _Packed:
+    """Worker: decode a body, transform it and write the columns to shared memory."""
+    try:
+        response = msgspec.json.decode(content, type=model)
+    except msgspec.DecodeError as e:
+        raise exceptions.DecodeError(str(e)) from e
+    series = timeseries.TimeSeries.from_response(response, section)
+    if transform is not None:
+        series = transform(series)
+    variables = tuple(series.variables)
+    length = len(series)
+    block = shared_memory.SharedMemory(create=True, size=max(8 * length * (1 + len(variables)), 1))
+    try:
+        time = np.ndarray((length,), dtype=np.int64, buffer=block.buf)
+        time[:] = series.time
+        values = np.ndarray(
+            (len(variables), length), dtype=np.float64, buffer=block.buf, offset=8 * length
+        )
+        for row, name in enumerate(variables):
+            values[row] = series[name]
+        del time, values
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return _Packed(
+        block.name,
+        length,
+        variables,
+        series.utc_offset_seconds,
+        series.timezone,
+        series.timezone_abbreviation,
+    )
+
+
+def _unpack(packed: _Packed) -> timeseries.TimeSeries:
+    """Copy a series out of its shared memory block and release the block."""
+    block = shared_memory.SharedMemory(name=packed.name)
+    try:
+        length = packed.length
+        time = np.ndarray((length,), dtype=np.int64, buffer=block.buf).copy()
+        values = np.ndarray(
+            (len(packed.variables), length), dtype=np.float64, buffer=block.buf, offset=8 * length
+        ).copy()
+    finally:
+        block.close()
+        block.unlink()
+    return timeseries.TimeSeries(
+        time,
+        dict(zip(packed.variables, values, strict=True)),
+        utc_offset_seconds=packed.utc_offset_seconds,
+        timezone=packed.timezone,
+        timezone_abbreviation=packed.timezone_abbreviation,
+    )
+
+
+def _discard(decoded: asyncio.Future[_Packed]) -> None:
+    """Release the block of a decode whose caller was cancelled."""
+    if decoded.cancelled() or decoded.exception() is not None:
+        return
+    block = shared_memory.SharedMemory(name=decoded.result().name)
+    block.close()
+    block.unlink()
+
+
+class DecodePool:
+    """
+    Download with an async client, decode in worker processes.
+
+    Examples
+    --------
+    >>> async with AsyncXSMeteo() as client, DecodePool(client, transform=to_kelvin) as pool:
+    ...     async for key, series in pool.stream(enumerate(request_defs)):
+    ...         store(key, series)
+    """
+
+    def __init__(
+        self,
+        client: async_client.AsyncXSMeteo,
+        *,
+        section: str = "hourly",
+        transform: Transform | None = None,
+        processes: int | None = None,
+        concurrency: int = 16,
+        retries: int = 0,
+    ) -> None:
+        """
+        Start the worker processes.
+
+        Parameters
+        ----------
+        client : AsyncXSMeteo
+            Client used for downloading.
+        section : str, optional
+            Section decoded into the series. Default is "hourly".
+        transform : Callable[[TimeSeries], TimeSeries], optional
+            Applied to every series in the worker. Must be picklable, i.e. a
+            module-level function.
+        processes : int, optional
+            Number of worker processes. Defaults to the number of CPUs.
+        concurrency : int, optional
+            Maximum number of responses being downloaded or decoded at once.
+            Default is 16.
+        retries : int, optional
+            Times a download failing with a transient error is sent again.
+            Default is 0.
+
+        Raises
+        ------
+        ValueError
+            If ``concurrency`` is not positive.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        self._client = client
+        self._section = section
+        self._transform = transform
+        self._concurrency = concurrency
+        self._retries = retries
+        # Workers must not inherit the event loop or client threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def __aenter__(self) -> DecodePool:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        self._executor.shutdown(cancel_futures=True)
+
+    def stream[K](
+        self,
+        requests: Iterable[tuple[K, RequestDef[typing.Any]]]
+        | AsyncIterable[tuple[K, RequestDef[typing.Any]]],
+    ) -> AsyncIterator[tuple[K, timeseries.TimeSeries | Exception]]:
+        """
+        Download and decode requests, yielding each series as it is ready.
+
+        Like ``AsyncXSMeteo.stream``, the input is read lazily and at most
+        ``concurrency`` responses are in flight.
+
+        Parameters
+        ----------
+        requests : Iterable | AsyncIterable of tuple[K, RequestDef]
+            ``(key, request)`` pairs, e.g. ``enumerate(request_defs)``.
+
+        Returns
+        -------
+        AsyncIterator[tuple[K, TimeSeries | Exception]]
+            The key and the decoded (and transformed) series, or the error,
+            in completion order.
+        """
+        return async_client.stream_calls(
+            requests, self._process, concurrency=self._concurrency, retries=self._retries
+        )
+
+    async def run(
+        self, request_defs: Sequence[RequestDef[typing.Any]]
+    ) -> list[timeseries.TimeSeries]:
+        """
+        Download and decode requests, returning all series in input order.
+
+        Parameters
+        ----------
+        request_defs : Sequence[RequestDef]
+            The request definitions.
+
+        Returns
+        -------
+        list[TimeSeries]
+            One series per request.
+
+        Raises
+        ------
+        XSMeteoError
+            The first error any request failed with.
+        """
+        results: list[timeseries.TimeSeries | None] = [None] * len(request_defs)
+        async for index, result in self.stream(enumerate(request_defs)):
+            if isinstance(result, Exception):
+                raise result
+            results[index] = result
+        return typing.cast("list[timeseries.TimeSeries]", results)
+
+    async def _process(self, request_def: RequestDef[typing.Any]) -> timeseries.TimeSeries:
+        content = await self._client.fetch_raw(request_def)
+        loop = asyncio.get_running_loop()
+        decoded = loop.run_in_executor(
+            self._executor,
+            _decode,
+            content,
+            request_def.model,
+            self._section,
+            self._transform,
+        )
+        try:
+            # Shielded so a cancelled caller does not lose the block the
+            # worker may already have created
+            packed = await asyncio.shield(decoded)
+        except asyncio.CancelledError:
+            decoded.add_done_callback(_discard)
+            raise
+        return _unpack(packed)
@@ -0,0 +1,354 @@
+"""
+Local resampling of hourly series into daily aggregates.
+
+Requesting ``daily`` next to ``hourly`` roughly doubles payload size and
+request weight. When hourly data is at hand anyway, the daily aggregates the
+API offers can be derived locally instead: days are cut at local midnight
+(``utc_offset_seconds``) and every aggregate is a single ``reduceat`` pass.
+"""
+
+from __future__ import annotations
+
+import math
+import typing
+
+import msgspec
+import numpy as np
+
+import xsmeteo.analytics.timeseries as timeseries
+import xsmeteo.services.timezones as timezones_service
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import numpy.typing as npt
+
+    from xsmeteo.models.base import BaseStruct
+
+AGGREGATIONS = ("min", "max", "mean", "sum", "mode", "dominant")
+
+# Unit of daily radiation sums; hourly values are W/m² averaged over the step
+_ENERGY_UNIT = "MJ/m²"
+
+# Daily aggregate the API reports per hourly variable: the aggregation, the
+# name of the API's daily variable and its unit (None keeps the hourly unit).
+# Variables not listed get min, max and mean
+_DAILY: dict[str, tuple[str, str, str | None]] = {
+    "weather_code": ("mode", "weather_code", None),
+    "precipitation": ("sum", "precipitation_sum", None),
+    "rain": ("sum", "rain_sum", None),
+    "showers": ("sum", "showers_sum", None),
+    "snowfall": ("sum", "snowfall_sum", None),
+    "sunshine_duration": ("sum", "sunshine_duration", None),
+    "evapotranspiration": ("sum", "evapotranspiration_sum", None),
+    "et0_fao_evapotranspiration": ("sum", "et0_fao_evapotranspiration", None),
+    "shortwave_radiation": ("sum", "shortwave_radiation_sum", _ENERGY_UNIT),
+    "direct_radiation": ("sum", "direct_radiation_sum", _ENERGY_UNIT),
+    "diffuse_radiation": ("sum", "diffuse_radiation_sum", _ENERGY_UNIT),
+    "direct_normal_irradiance": ("sum", "direct_normal_irradiance_sum", _ENERGY_UNIT),
+    "global_tilted_irradiance": ("sum", "global_tilted_irradiance_sum", _ENERGY_UNIT),
+    "terrestrial_radiation": ("sum", "terrestrial_radiation_sum", _ENERGY_UNIT),
+    "wind_direction_10m": ("dominant", "wind_direction_10m_dominant", None),
+    "wind_direction_80m": ("dominant", "wind_direction_80m_dominant", None),
+    "wind_direction_100m": ("dominant", "wind_direction_100m_dominant", None),
+    "wind_direction_120m": ("dominant", "wind_direction_120m_dominant", None),
+    "wind_direction_180m": ("dominant", "wind_direction_180m_dominant", None),
+    "wave_direction": ("dominant", "wave_direction_dominant", None),
+    "wind_wave_direction": ("dominant", "wind_wave_direction_dominant", None),
+    "swell_wave_direction": ("dominant", "swell_wave_direction_dominant", None),
+}
+
+# WMO weather codes range from 0 to 99
+_MODE_CODES = 100
+
+_SECONDS_PER_DAY = 86400
+
+
+def default_aggregations(variable: str) -> tuple[str, ...]:
+    """
+    Return the aggregates the API reports for a variable.
+
+    ``weather_code`` gets its mode, quantities accumulated over the hour
+    (precipitation, sunshine duration, radiation, ...) their sum, directions
+    their dominant direction and every other variable, including
+    instantaneous radiation and probabilities, min, max and mean.
+
+    Parameters
+    ----------
+    variable : str
+        Hourly variable name.
+
+    Returns
+    -------
+    tuple[str, ...]
+        Aggregations to compute.
+    """
+    if variable in _DAILY:
+        return (_DAILY[variable][0],)
+    return ("min", "max", "mean")
+
+
+def daily_unit(variable: str, aggregation: str, hourly_unit: str) -> str:
+    """
+    Return the unit of a daily aggregate.
+
+    Sums of radiation are energies in MJ/m², like the API's daily
+    ``shortwave_radiation_sum``; every other aggregate keeps the hourly unit.
+
+    Parameters
+    ----------
+    variable : str
+        Hourly variable name.
+    aggregation : str
+        One of ``AGGREGATIONS``.
+    hourly_unit : str
+        Unit of the hourly variable.
+
+    Returns
+    -------
+    str
+        Unit of the aggregate.
+    """
+    return _ENERGY_UNIT if _is_energy_sum(variable, aggregation) else hourly_unit
+
+
+def daily_name(variable: str, aggregation: str) -> str:
+    """
+    Return the daily column name of an aggregate.
+
+    The API's own daily names are used where they exist (``weather_code``,
+    ``sunshine_duration``, ``wind_direction_10m_dominant``); other names
+    append the aggregation (``temperature_2m_max``).
+    """
+    entry = _DAILY.get(variable)
+    if entry is not None and entry[0] == aggregation:
+        return entry[1]
+    return variable if aggregation == "mode" else f"{variable}_{aggregation}"
+
+
+def resample_daily(
+    series: timeseries.TimeSeries,
+    aggregations: Mapping[str, Sequence[str]] | None = None,
+    *,
+    min_count: int = 1,
+    timezone: str | None = None,
+) -> timeseries.TimeSeries:
+    """
+    Aggregate a series into local calendar days.
+
+    Parameters
+    ----------
+    series : TimeSeries
+        Hourly (or sub-hourly) series.
+    aggregations : Mapping[str, Sequence[str]], optional
+        Aggregations per variable, out of "min", "max", "mean", "sum",
+        "mode" and "dominant" (the vector mean of a direction in degrees,
+        weighted by the matching ``wind_speed_*`` column if the series has
+        one). Defaults to ``default_aggregations`` for every variable.
+    min_count : int, optional
+        Minimum number of valid values a day needs; days with fewer yield
+        NaN. Default is 1.
+    timezone : str, optional
+        IANA timezone whose local midnights (DST-aware) delimit days.
+        Defaults to the fixed ``utc_offset_seconds`` of the series.
+
+    Returns
+    -------
+    TimeSeries
+        One row per local day, timestamped at local midnight, with columns
+        named by ``daily_name`` in the units of ``daily_unit``. Mode ties
+        resolve to the higher (more severe) code.
+
+    Raises
+    ------
+    ValueError
+        If an aggregation or the timezone is unknown.
+    """
+    if aggregations is None:
+        aggregations = {name: default_aggregations(name) for name in series.variables}
+    for requested in aggregations.values():
+        unknown = set(requested) - set(AGGREGATIONS)
+        if unknown:
+            raise ValueError(f"unknown aggregations {sorted(unknown)}; expected {AGGREGATIONS}")
+
+    if timezone is None:
+        offsets = np.full(series.time.shape, series.utc_offset_seconds, dtype=np.int64)
+    else:
+        offsets = np.asarray(
+            timezones_service.utc_offsets(series.time.tolist(), timezone), dtype=np.int64
+        )
+    day = (series.time + offsets) // _SECONDS_PER_DAY
+    if day.size == 0:
+        return timeseries.TimeSeries(
+            day,
+            {
+                daily_name(variable, aggregation): np.zeros(0)
+                for variable, requested in aggregations.items()
+                for aggregation in requested
+            },
+            utc_offset_seconds=series.utc_offset_seconds,
+            timezone=series.timezone,
+            timezone_abbreviation=series.timezone_abbreviation,
+        )
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(day)) + 1))
+    days = day[starts]
+    group = np.repeat(np.arange(starts.size), np.diff(np.append(starts, day.size)))
+    # Irradiance is averaged over the step preceding each timestamp
+    step = float(np.min(np.diff(series.time))) if series.time.size > 1 else 3600.0
+
+    columns: dict[str, npt.NDArray[np.float64]] = {}
+    for variable, requested in aggregations.items():
+        values = series[variable]
+        valid = ~np.isnan(values)
+        count = np.add.reduceat(valid, starts)
+        enough = count >= min_count
+        for aggregation in requested:
+            if aggregation == "mode":
+                result = _mode(values, valid, group, starts.size)
+            elif aggregation == "dominant":
+                result = _dominant(values, valid, _direction_weights(series, variable), starts)
+            else:
+                result = _reduce(
+                    aggregation, values, valid, count, starts, scale=_sum_scale(variable, step)
+                )
+            columns[daily_name(variable, aggregation)] = np.where(enough, result, np.nan)
+
+    return timeseries.TimeSeries(
+        days * _SECONDS_PER_DAY - offsets[starts],
+        columns,
+        utc_offset_seconds=series.utc_offset_seconds,
+        timezone=series.timezone,
+        timezone_abbreviation=series.timezone_abbreviation,
+    )
+
+
+def resample_response[T: BaseStruct](
+    response: T,
+    aggregations: Mapping[str, Sequence[str]] | None = None,
+    *,
+    min_count: int = 1,
+    timezone: str | None = None,
+) -> T:
+    """
+    Fill the ``daily`` section of a response from its ``hourly`` section.
+
+    Parameters
+    ----------
+    response : T
+        A forecast or historical response with an ``hourly`` section.
+    aggregations : Mapping[str, Sequence[str]], optional
+        See ``resample_daily``.
+    min_count : int, optional
+        See ``resample_daily``.
+    timezone : str, optional
+        See ``resample_daily``. Only needed for Unix time axes; ISO labels
+        are local wall-clock times and already split at local midnight.
+
+    Returns
+    -------
+    T
+        A copy of the response with ``daily`` and ``daily_units`` set. Dates
+        are ISO strings or Unix timestamps, following the hourly time axis.
+    """
+    hourly = timeseries.TimeSeries.from_response(response, "hourly")
+    daily = resample_daily(hourly, aggregations, min_count=min_count, timezone=timezone)
+
+    raw_time = getattr(response, "hourly", {})["time"]
+    time: list[typing.Any]
+    if raw_time and isinstance(raw_time[0], str):
+        offsets = (
+            timezones_service.utc_offsets(daily.time.tolist(), timezone)
+            if timezone is not None
+            else [daily.utc_offset_seconds] * len(daily)
+        )
+        time = [
+            str(np.datetime64(moment + offset, "s"))[:10]
+            for moment, offset in zip(daily.time.tolist(), offsets, strict=True)
+        ]
+    else:
+        time = daily.time.tolist()
+
+    section: dict[str, list[typing.Any]] = {"time": time}
+    for name in daily.variables:
+        section[name] = [None if math.isnan(value) else value for value in daily[name].tolist()]
+
+    hourly_units: dict[str, str] = getattr(response, "hourly_units", None) or {}
+    units = {"time": "iso8601" if time and isinstance(time[0], str) else "unixtime"}
+    variables = aggregations or {name: default_aggregations(name) for name in hourly.variables}
+    for variable, requested in variables.items():
+        for aggregation in requested:
+            if variable in hourly_units:
+                units[daily_name(variable, aggregation)] = daily_unit(
+                    variable, aggregation, hourly_units[variable]
+                )
+    return msgspec.structs.replace(response, daily=section, daily_units=units)
+
+
+def _is_energy_sum(variable: str, aggregation: str) -> bool:
+    return aggregation == "sum" and _DAILY.get(variable, ("", "", None))[2] == _ENERGY_UNIT
+
+
+def _reduce(
+    aggregation: str,
+    values: npt.NDArray[np.float64],
+    valid: npt.NDArray[np.bool_],
+    count: npt.NDArray[np.intp],
+    starts: npt.NDArray[np.intp],
+    *,
+    scale: float,
+) -> npt.NDArray[np.float64]:
+    if aggregation == "min":
+        result: npt.NDArray[np.float64] = np.fmin.reduceat(values, starts)
+        return result
+    if aggregation == "max":
+        result = np.fmax.reduceat(values, starts)
+        return result
+    total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    result = total * scale if aggregation == "sum" else total / np.maximum(count, 1)
+    return result
+
+
+def _direction_weights(series: timeseries.TimeSeries, variable: str) -> npt.NDArray[np.float64]:
+    # Calm hours hardly define the direction of a day
+    speed = variable.replace("wind_direction", "wind_speed", 1)
+    if speed == variable or speed not in series.variables:
+        return np.ones(len(series))
+    weights: npt.NDArray[np.float64] = np.nan_to_num(series[speed])
+    return weights
+
+
+def _dominant(
+    values: npt.NDArray[np.float64],
+    valid: npt.NDArray[np.bool_],
+    weights: npt.NDArray[np.float64],
+    starts: npt.NDArray[np.intp],
+) -> npt.NDArray[np.float64]:
+    # Angles wrap around, so average unit vectors: 350° and 10° give 0°, not 180°
+    radians = np.deg2rad(np.where(valid, values, 0.0))
+    weights = np.where(valid, weights, 0.0)
+    east = np.add.reduceat(weights * np.sin(radians), starts)
+    north = np.add.reduceat(weights * np.cos(radians), starts)
+    dominant: npt.NDArray[np.float64] = np.rad2deg(np.arctan2(east, north)) % 360.0
+    return dominant
+
+
+def _sum_scale(variable: str, step: float) -> float:
+    # W/m² averaged over ``step`` seconds, summed into MJ/m²
+    return step / 1e6 if _is_energy_sum(variable, "sum") else 1.0
+
+
+def _mode(
+    values: npt.NDArray[np.float64],
+    valid: npt.NDArray[np.bool_],
+    group: npt.NDArray[np.intp],
+    groups: int,
+) -> npt.NDArray[np.float64]:
+    codes = np.clip(np.where(valid, values, 0), 0, _MODE_CODES - 1).astype(np.intp)
+    counts = np.bincount(
+        group[valid] * _MODE_CODES + codes[valid], minlength=groups * _MODE_CODES
+    ).reshape(groups, _MODE_CODES)
+    # Scan from the highest code so ties resolve to the more severe weather
+    mode: npt.NDArray[np.float64] = (_MODE_CODES - 1 - np.argmax(counts[:, ::-1], axis=1)).astype(
+        np.float64
+    )
+    return mode
@@ -0,0 +1,371 @@
+"""
+Indexed time access for response sections.
+
+``TimeSeries`` decodes an ``hourly``/``daily``/``minutely_15`` section into an
+``int64`` UTC time axis plus one ``float64`` array per variable. Range slices
+and as-of lookups then run as binary searches over the time axis instead of
+linear scans over ISO strings.
+
+Naive datetimes, ``numpy.datetime64`` values and ISO strings are read in the
+series' local time (``utc_offset_seconds``), matching how the API labels its
+rows. Integers and timezone-aware datetimes are absolute instants.
+"""
+
+from __future__ import annotations
+
+import builtins
+import datetime
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import numpy.typing as npt
+
+    from xsmeteo.models.base import BaseStruct
+    from xsmeteo.store.columnar import Scan
+
+type Instant = datetime.datetime | np.datetime64 | int | str
+type Instants = npt.ArrayLike | Sequence[Instant]
+
+AS_OF_MODES = ("previous", "nearest", "linear")
+
+
+def _local_seconds(values: npt.NDArray[typing.Any]) -> npt.NDArray[np.int64]:
+    seconds: npt.NDArray[np.int64] = values.astype("datetime64[s]").astype(np.int64)
+    return seconds
+
+
+def decode_time(response: BaseStruct, section: str = "hourly") -> npt.NDArray[np.int64]:
+    """
+    Decode the time column of a response section to UTC Unix seconds.
+
+    Parameters
+    ----------
+    response : BaseStruct
+        A decoded response with a time section.
+    section : str, optional
+        Section to decode. Default is "hourly".
+
+    Returns
+    -------
+    numpy.ndarray
+        UTC Unix seconds (``int64``).
+
+    Raises
+    ------
+    ValueError
+        If the response has no such section.
+    """
+    columns = getattr(response, section, None)
+    if not columns or "time" not in columns:
+        raise ValueError(f"response has no {section!r} section")
+    raw_time = columns["time"]
+    if raw_time and isinstance(raw_time[0], str):
+        offset = int(getattr(response, "utc_offset_seconds", 0) or 0)
+        return _local_seconds(np.asarray(raw_time, dtype="datetime64[s]")) - offset
+    return np.asarray(raw_time, dtype=np.int64)
+
+
+class TimeSeries:
+    """
+    Columnar view of a time section with O(log n) time lookups.
+
+    Attributes
+    ----------
+    time : numpy.ndarray
+        Ascending UTC Unix seconds (``int64``).
+    utc_offset_seconds : int
+        Offset of the local time the API used to label rows.
+    timezone : str | None
+        Timezone name of the local time, if known.
+    timezone_abbreviation : str | None
+        Timezone abbreviation of the local time, if known.
+
+    Examples
+    --------
+    >>> series = TimeSeries.from_response(client.get_forecast(..., hourly=["temperature_2m"]))
+    >>> series.slice(datetime(2024, 6, 1, 6), datetime(2024, 6, 1, 18))["temperature_2m"]
+    >>> series.asof(delivery_times, mode="linear")["temperature_2m"]
+    """
+
+    def __init__(
+        self,
+        time: npt.ArrayLike,
+        columns: Mapping[str, npt.ArrayLike],
+        *,
+        utc_offset_seconds: int = 0,
+        timezone: str | None = None,
+        timezone_abbreviation: str | None = None,
+    ) -> None:
+        """
+        Wrap an existing time axis and columns.
+
+        Parameters
+        ----------
+        time : array_like
+            Ascending UTC Unix seconds.
+        columns : Mapping[str, array_like]
+            Values per variable, aligned to ``time``.
+        utc_offset_seconds : int, optional
+            Offset of the local time. Default is 0 (UTC).
+        timezone : str, optional
+            Timezone name of the local time.
+        timezone_abbreviation : str, optional
+            Timezone abbreviation of the local time.
+
+        Raises
+        ------
+        ValueError
+            If a column is not aligned to the time axis.
+        """
+        self.time: npt.NDArray[np.int64] = np.asarray(time, dtype=np.int64)
+        self._columns: dict[str, npt.NDArray[np.float64]] = {}
+        for name, values in columns.items():
+            column = np.asarray(values, dtype=np.float64)
+            if column.shape != self.time.shape:
+                raise ValueError(
+                    f"column {name!r} has {column.size} values for {self.time.size} timestamps"
+                )
+            self._columns[name] = column
+        self.utc_offset_seconds = utc_offset_seconds
+        self.timezone = timezone
+        self.timezone_abbreviation = timezone_abbreviation
+
+    @classmethod
+    def from_response(cls, response: BaseStruct, section: str = "hourly") -> TimeSeries:
+        """
+        Decode a time section of a response.
+
+        Columns holding strings (e.g. ``sunrise``) are skipped; ``null``
+        values become NaN.
+
+        Parameters
+        ----------
+        response : BaseStruct
+            A decoded response with a time section, e.g. ``ForecastResponse``.
+        section : str, optional
+            Section to decode. Default is "hourly".
+
+        Returns
+        -------
+        TimeSeries
+            The decoded series.
+
+        Raises
+        ------
+        ValueError
+            If the response has no such section.
+        """
+        time = decode_time(response, section)
+        columns = getattr(response, section)
+        return cls(
+            time,
+            {
+                name: np.asarray(values, dtype=np.float64)
+                for name, values in columns.items()
+                if name != "time" and not any(isinstance(value, str) for value in values)
+            },
+            utc_offset_seconds=int(getattr(response, "utc_offset_seconds", 0) or 0),
+            timezone=getattr(response, "timezone", None),
+            timezone_abbreviation=getattr(response, "timezone_abbreviation", None),
+        )
+
+    @classmethod
+    def from_scan(cls, scan: Scan) -> TimeSeries:
+        """
+        Wrap a ``ColumnarStore`` scan.
+
+        The time axis is shared with the mapped file; ``float32`` columns are
+        widened to ``float64``.
+
+        Parameters
+        ----------
+        scan : Scan
+            Result of ``ColumnarStore.scan``.
+
+        Returns
+        -------
+        TimeSeries
+            The series in UTC.
+        """
+        return cls(
+            np.frombuffer(scan.time, dtype=np.int64),
+            {name: np.frombuffer(view, dtype=view.format) for name, view in scan.columns.items()},
+        )
+
+    @property
+    def variables(self) -> list[str]:
+        """Names of the decoded variables."""
+        return list(self._columns)
+
+    @property
+    def local_time(self) -> npt.NDArray[np.datetime64]:
+        """Row labels in local time, as the API reports them."""
+        local: npt.NDArray[np.datetime64] = (self.time + self.utc_offset_seconds).astype(
+            "datetime64[s]"
+        )
+        return local
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    def __getitem__(self, variable: str) -> npt.NDArray[np.float64]:
+        return self._columns[variable]
+
+    def to_seconds(self, values: Instants) -> npt.NDArray[np.int64]:
+        """
+        Convert instants to UTC Unix seconds.
+
+        Parameters
+        ----------
+        values : array_like
+            Integers (UTC seconds), datetimes, ``numpy.datetime64`` values or
+            ISO strings. Naive values are read in the series' local time.
+
+        Returns
+        -------
+        numpy.ndarray
+            UTC Unix seconds.
+        """
+        array = np.asarray(values)
+        if array.dtype.kind in "iu":
+            return array.astype(np.int64)
+        if array.dtype.kind in "MU":
+            return _local_seconds(array) - self.utc_offset_seconds
+        flat = [self._instant_seconds(value) for value in array.ravel().tolist()]
+        return np.asarray(flat, dtype=np.int64).reshape(array.shape)
+
+    def slice(self, start: Instant | None = None, end: Instant | None = None) -> TimeSeries:
+        """
+        Select the half-open range ``[start, end)`` by binary search.
+
+        Parameters
+        ----------
+        start : datetime | datetime64 | int | str, optional
+            Inclusive lower bound. Unbounded if omitted.
+        end : datetime | datetime64 | int | str, optional
+            Exclusive upper bound. Unbounded if omitted.
+
+        Returns
+        -------
+        TimeSeries
+            A series whose arrays are views of this one.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.time, self._instant_seconds(start)))
+        hi = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(self.time, self._instant_seconds(end)))
+        )
+        hi = max(lo, hi)
+        return self._view(builtins.slice(lo, hi))
+
+    def between_hours(self, start_hour: int, end_hour: int) -> TimeSeries:
+        """
+        Keep rows whose local hour lies in ``[start_hour, end_hour)``.
+
+        Parameters
+        ----------
+        start_hour : int
+            First local hour kept (0-23).
+        end_hour : int
+            First local hour dropped (1-24). Ranges wrap past midnight when
+            ``end_hour <= start_hour``.
+
+        Returns
+        -------
+        TimeSeries
+            The selected rows (copied).
+        """
+        hour = (self.time + self.utc_offset_seconds) // 3600 % 24
+        if start_hour < end_hour:
+            mask = (hour >= start_hour) & (hour < end_hour)
+        else:
+            mask = (hour >= start_hour) | (hour < end_hour)
+        return self._view(mask)
+
+    def asof(
+        self,
+        timestamps: Instants,
+        variables: Sequence[str] | None = None,
+        *,
+        mode: str = "previous",
+        tolerance: int | None = None,
+    ) -> dict[str, npt.NDArray[np.float64]]:
+        """
+        Look up values at arbitrary instants.
+
+        Parameters
+        ----------
+        timestamps : array_like
+            Query instants, in any form accepted by ``to_seconds``. Need not
+            be sorted.
+        variables : Sequence[str], optional
+            Variables to look up. Defaults to all.
+        mode : str, optional
+            "previous" takes the last row at or before each instant,
+            "nearest" the closest row and "linear" interpolates between the
+            surrounding rows. Default is "previous".
+        tolerance : int, optional
+            Maximum distance in seconds to the matched row for "previous" and
+            "nearest"; farther matches yield NaN.
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            Values aligned to ``timestamps``; NaN where no row matches.
+
+        Raises
+        ------
+        ValueError
+            If ``mode`` is unknown.
+        """
+        if mode not in AS_OF_MODES:
+            raise ValueError(f"mode must be one of {AS_OF_MODES}, got {mode!r}")
+        names = self.variables if variables is None else list(variables)
+        query = self.to_seconds(timestamps)
+        if len(self) == 0:
+            return {name: np.full(query.shape, np.nan) for name in names}
+
+        if mode == "linear":
+            return {
+                name: np.interp(query, self.time, self._columns[name], left=np.nan, right=np.nan)
+                for name in names
+            }
+
+        right = np.searchsorted(self.time, query, side="right")
+        index = right - 1
+        if mode == "nearest":
+            following = np.minimum(right, len(self) - 1)
+            previous = np.maximum(index, 0)
+            closer = np.abs(self.time[following] - query) < np.abs(query - self.time[previous])
+            index = np.where((index < 0) | closer, following, previous)
+        valid = index >= 0
+        index = np.maximum(index, 0)
+        if tolerance is not None:
+            valid &= np.abs(query - self.time[index]) <= tolerance
+        return {name: np.where(valid, self._columns[name][index], np.nan) for name in names}
+
+    def _instant_seconds(self, value: Instant) -> int:
+        if isinstance(value, int | np.integer):
+            return int(value)
+        if isinstance(value, str):
+            value = np.datetime64(value)
+        if isinstance(value, np.datetime64):
+            return int(value.astype("datetime64[s]").astype(np.int64)) - self.utc_offset_seconds
+        if value.tzinfo is not None:
+            return int(value.timestamp())
+        naive = value.replace(tzinfo=datetime.UTC).timestamp()
+        return int(naive) - self.utc_offset_seconds
+
+    def _view(self, index: builtins.slice | npt.NDArray[np.bool_]) -> TimeSeries:
+        return TimeSeries(
+            self.time[index],
+            {name: column[index] for name, column in self._columns.items()},
+            utc_offset_seconds=self.utc_offset_seconds,
+            timezone=self.timezone,
+            timezone_abbreviation=self.timezone_abbreviation,
+        )
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from xsmeteo.client.async_client import AsyncXSMeteo
 from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.client.watchlist import Refresh, Watchlist
 
 __all__ = [
     "AsyncXSMeteo",
+    "Refresh",
+    "Watchlist",
     "XSMeteo",
 ]
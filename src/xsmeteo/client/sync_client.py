@@ -4,13 +4,24 @@ Synchronous client for Open-Meteo API.
 
 from __future__ import annotations
 
+import array
+import itertools
+import threading
+import time
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import httpx
 import msgspec
 
+import xsmeteo.client.async_client as async_client
+import xsmeteo.core.cache as cache
 import xsmeteo.core.config as config
+import xsmeteo.core.freshness as freshness
+import xsmeteo.core.loop_thread as loop_thread
 import xsmeteo.core.rate_limiter as rate_limiter
+import xsmeteo.core.retry as retry
+import xsmeteo.core.routing as routing
 import xsmeteo.exceptions as exceptions
 import xsmeteo.models.air_quality as air_quality_models
 import xsmeteo.models.climate as climate_models
@@ -30,10 +41,16 @@ import xsmeteo.services.forecast as forecast_service
 import xsmeteo.services.geocoding as geocoding_service
 import xsmeteo.services.historical as historical_service
 import xsmeteo.services.marine as marine_service
+import xsmeteo.services.ranges as ranges_service
+import xsmeteo.services.timeline as timeline_service
+import xsmeteo.services.timezones as timezones_service
+import xsmeteo.services.units as units_service
 
 if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
     from typing import TypeVar
 
+    from xsmeteo.models.base import BaseStruct
     from xsmeteo.services.common import RequestDef
 
     T = TypeVar("T")
@@ -59,6 +76,17 @@ class XSMeteo:
         *,
         rate_limits: list[rate_limiter.RateLimitConfig] | None = None,
         timeout: float = 30.0,
+        elevation_cache: cache.Cache[tuple[float, float], float] | None = None,
+        response_cache: cache.Cache[str, bytes] | None = None,
+        response_ttl: float | None = 900.0,
+        canonical_units: bool = False,
+        utc_fetch: bool = False,
+        model_aware_ttl: bool = False,
+        current_cache: cache.Cache[str, forecast_models.CurrentResponse] | None = None,
+        endpoints: config.APIEndpoints | None = None,
+        endpoint_pool: routing.EndpointPool | None = None,
+        limiter: rate_limiter.RateLimiter | None = None,
+        background_loop: bool = False,
     ) -> None:
         """
         Initialize the client.
@@ -69,10 +97,111 @@ class XSMeteo:
             Custom rate limits.
         timeout : float, optional
             Timeout for requests in seconds. Default is 30.0.
+        elevation_cache : Cache[tuple[float, float], float], optional
+            Store for elevations resolved by ``get_elevation_bulk``. Terrain
+            does not change, so entries never expire. Defaults to an
+            unbounded in-memory cache.
+        response_cache : Cache[str, bytes], optional
+            Store for raw response bodies, keyed by URL and sorted query
+            parameters. Responses are not cached by default.
+        response_ttl : float, optional
+            Seconds a cached response stays valid. Default is 900.0.
+        canonical_units : bool, optional
+            Always fetch SI units (°C, m/s, mm) and convert to the requested
+            units locally, so every unit variant of a request shares one
+            upstream fetch and cache entry. Default is False.
+        utc_fetch : bool, optional
+            Fetch forecasts in UTC with Unix timestamps and re-label the time
+            axis locally for the requested timezone (DST-aware), so every
+            timezone variant shares one upstream fetch and cache entry.
+            Applies to ``hourly``/``minutely_15`` requests windowed with
+            ``forecast_hours``/``forecast_minutely_15``; windows counted in
+            local days, ``timezone="auto"`` and ``daily`` variables are sent
+            unchanged (``services.timezones.to_utc_request``). Default is
+            False.
+        model_aware_ttl : bool, optional
+            Expire cached responses when a new run of the requested
+            ``models`` can be published (``core.freshness``) instead of after
+            ``response_ttl``, so a refetch happens only when it can change
+            the answer. Applies to endpoints with a ``models`` parameter.
+            Default is False.
+        current_cache : Cache[str, CurrentResponse], optional
+            Store for decoded ``get_current`` results, valid until the next
+            15-minute boundary. Defaults to an in-memory cache of 10,000
+            entries.
+        endpoints : APIEndpoints, optional
+            Base URLs to send requests to instead of the public Open-Meteo
+            APIs, e.g. a self-hosted instance or ``xsmeteo.proxy``; see
+            ``core.config.endpoints_at``.
+        endpoint_pool : EndpointPool, optional
+            Route requests across several backends with failover
+            (``core.routing``). The pool's per-backend limits then replace
+            ``rate_limits``. Cannot be combined with ``endpoints``.
+        limiter : RateLimiter, optional
+            Limiter to acquire instead of one built from ``rate_limits``, so
+            several clients, threads and event loops share one budget.
+        background_loop : bool, optional
+            Run an internal ``AsyncXSMeteo`` on a dedicated event-loop thread
+            and send batch work (``request_many`` and the methods built on
+            it, such as ``get_elevation_bulk`` and the range methods) through
+            it, so requests overlap on one connection pool instead of one
+            thread per request. Caches and the rate limiter are shared.
+            Default is False.
+
+        Raises
+        ------
+        ValueError
+            If both ``endpoints`` and ``endpoint_pool`` are given.
         """
-        self._rate_limiter = rate_limiter.RateLimiter(rate_limits or config.DEFAULT_RATE_LIMITS)
+        if endpoints is not None and endpoint_pool is not None:
+            raise ValueError("endpoints and endpoint_pool cannot be combined")
+        self._rate_limiter = (
+            limiter
+            if limiter is not None
+            else rate_limiter.RateLimiter(rate_limits or config.DEFAULT_RATE_LIMITS)
+        )
         self._client = httpx.Client(timeout=timeout)
         self._decoder = msgspec.json.Decoder()
+        self._elevation_cache: cache.Cache[tuple[float, float], float] = (
+            elevation_cache if elevation_cache is not None else cache.MemoryCache()
+        )
+        self._timeout = timeout
+        self._response_cache = response_cache
+        self._response_ttl = response_ttl
+        self._canonical_units = canonical_units
+        self._utc_fetch = utc_fetch
+        self._model_aware_ttl = model_aware_ttl
+        self._endpoints = config.endpoint_overrides(endpoints)
+        self._endpoint_pool = endpoint_pool
+        self._current_cache: cache.Cache[str, forecast_models.CurrentResponse] = (
+            current_cache if current_cache is not None else cache.MemoryCache(max_entries=10_000)
+        )
+        self._current_lock = threading.Lock()
+        self._current_inflight: dict[str, Future[forecast_models.CurrentResponse]] = {}
+        self._loop: loop_thread.LoopThread | None = None
+        self._async: async_client.AsyncXSMeteo | None = None
+        if background_loop:
+            self._loop = loop_thread.LoopThread()
+            self._async = async_client.AsyncXSMeteo(
+                rate_limits=rate_limits,
+                timeout=timeout,
+                elevation_cache=self._elevation_cache,
+                response_cache=response_cache,
+                response_ttl=response_ttl,
+                canonical_units=canonical_units,
+                utc_fetch=utc_fetch,
+                model_aware_ttl=model_aware_ttl,
+                current_cache=self._current_cache,
+                endpoints=endpoints,
+                endpoint_pool=endpoint_pool,
+                # One budget for both code paths
+                limiter=self._rate_limiter,
+            )
+
+    @property
+    def limiter(self) -> rate_limiter.RateLimiter:
+        """The rate limiter requests acquire; pass it as ``limiter`` to share the budget."""
+        return self._rate_limiter
 
     def __enter__(self) -> XSMeteo:
         return self
@@ -86,17 +215,28 @@ class XSMeteo:
         self.close()
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client and stop the background loop, if any."""
+        if self._loop is not None and self._async is not None:
+            if self._loop.is_running:
+                self._loop.run(self._async.close())
+            self._loop.close()
         self._client.close()
 
-    def request(self, request_def: RequestDef[T]) -> T:
+    def request(self, request_def: RequestDef[T], *, ttl: float | None = None) -> T:
         """
         Make an HTTP GET request with rate limiting.
 
+        Cached bodies are served from the response cache without touching
+        the network or the rate limiter.
+
         Parameters
         ----------
         request_def : RequestDef[T]
             The request definition containing URL, params, and response model.
+        ttl : float, optional
+            Seconds the response stays in the response cache. Defaults to
+            the model-run freshness with ``model_aware_ttl``, else
+            ``response_ttl``.
 
         Returns
         -------
@@ -110,20 +250,155 @@ class XSMeteo:
         DecodeError
             If response decoding fails.
         """
-        self._rate_limiter.acquire_sync()
+        units: dict[str, str] = {}
+        if self._canonical_units:
+            request_def, units = units_service.canonicalize(request_def)
+        zone: dict[str, str] = {}
+        if self._utc_fetch:
+            request_def, zone = timezones_service.to_utc_request(request_def)
+        url = self._endpoints.get(request_def.url, request_def.url)
+        params = self._serialize_params(request_def.params)
+
+        key = None
+        content = None
+        if self._response_cache is not None:
+            key = cache.request_key(url, params)
+            content = self._response_cache.get(key)
+
+        if content is None:
+            if self._endpoint_pool is not None:
+                content = self._fetch_pooled(self._endpoint_pool, url, params, request_def.weight)
+            else:
+                self._rate_limiter.acquire_sync(request_def.weight)
 
-        response = self._client.get(
-            request_def.url,
-            params=self._serialize_params(request_def.params),
-        )
+                response = self._client.get(url, params=params)
 
-        if response.status_code != 200:
-            self._handle_error(response)
+                if response.status_code != 200:
+                    self._handle_error(response)
+                content = response.content
+            if key is not None and self._response_cache is not None:
+                if ttl is None and self._model_aware_ttl and "models" in request_def.params:
+                    ttl = freshness.ttl(request_def.params["models"])
+                self._response_cache.set(
+                    key, content, ttl=self._response_ttl if ttl is None else ttl
+                )
 
         try:
-            return msgspec.json.decode(response.content, type=request_def.model)
+            result = msgspec.json.decode(content, type=request_def.model)
         except msgspec.DecodeError as e:
             raise exceptions.DecodeError(str(e)) from e
+        if not units and not zone:
+            return result
+        if isinstance(result, list):
+            return typing.cast("T", [self._adapt_response(item, zone, units) for item in result])
+        return typing.cast(
+            "T", self._adapt_response(typing.cast("BaseStruct", result), zone, units)
+        )
+
+    def _fetch_pooled(
+        self, pool: routing.EndpointPool, url: str, params: dict[str, str], tokens: int
+    ) -> bytes:
+        """
+        Send a request to the best backend of the pool, failing over to the next.
+
+        Backends without budget left are skipped; only the last one is waited
+        for, up to the request timeout. If every backend fails, the last error
+        is raised, a ``RateLimitError`` if that backend was out of budget.
+        """
+        error: Exception | None = None
+        routes = pool.routes(url, params)
+        for route in routes:
+            last = route is routes[-1]
+            # A later backend may have budget now, so only the last one is waited for
+            if route.limiter is not None and not last and not route.limiter.try_acquire(tokens):
+                error = exceptions.RateLimitError(
+                    f"Rate limit exceeded on backend {route.backend.label!r}"
+                )
+                continue
+            if route.limiter is not None and last:
+                try:
+                    route.limiter.acquire_sync(tokens, timeout=self._timeout)
+                except exceptions.RateLimitError as e:
+                    error = e
+                    continue
+            started = time.monotonic()
+            try:
+                response = self._client.get(route.url, params=route.params)
+            except httpx.TransportError as e:
+                pool.record_failure(route.backend)
+                error = e
+                continue
+            if response.status_code in retry.RETRYABLE_STATUS_CODES:
+                pool.record_failure(route.backend)
+                try:
+                    self._handle_error(response)
+                except exceptions.HTTPError as e:
+                    error = e
+                continue
+            pool.record_success(route.backend, time.monotonic() - started)
+            if response.status_code != 200:
+                self._handle_error(response)
+            return response.content
+        assert error is not None
+        raise error
+
+    @staticmethod
+    def _adapt_response(
+        response: BaseStruct, zone: dict[str, str], units: dict[str, str]
+    ) -> BaseStruct:
+        """Apply the timezone and unit rewrites undone by the canonical fetch."""
+        if zone:
+            response = timezones_service.rebase_response(response, **zone)
+        if units:
+            response = units_service.convert_response(response, **units)
+        return response
+
+    def request_many(
+        self,
+        request_defs: Sequence[RequestDef[T]],
+        *,
+        concurrency: int = 8,
+        retries: int = 0,
+    ) -> list[T]:
+        """
+        Run several requests concurrently under the shared rate limiter.
+
+        Parameters
+        ----------
+        request_defs : Sequence[RequestDef[T]]
+            The request definitions.
+        concurrency : int, optional
+            Maximum number of requests in flight. Default is 8.
+        retries : int, optional
+            Times a request failing with a transient error (transport error,
+            HTTP 429 or 5xx) is sent again with jittered exponential backoff.
+            Only the failing requests are retried. Default is 0.
+
+        Returns
+        -------
+        list[T]
+            The decoded responses, aligned to ``request_defs``.
+        """
+        if self._loop is not None and self._async is not None:
+            return self._loop.run(
+                self._async.request_many(request_defs, concurrency=concurrency, retries=retries)
+            )
+
+        def run(request_def: RequestDef[T]) -> T:
+            attempt = 0
+            while True:
+                try:
+                    return self.request(request_def)
+                except Exception as e:
+                    if attempt >= retries or not retry.is_retryable(e):
+                        raise
+                time.sleep(retry.backoff_delay(attempt))
+                attempt += 1
+
+        if len(request_defs) <= 1:
+            return [run(request_def) for request_def in request_defs]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run, request_defs))
 
     def _handle_error(self, response: httpx.Response) -> typing.NoReturn:
         """
@@ -144,7 +419,7 @@ class XSMeteo:
             reason = error_data.get("reason", "Unknown error")
         except msgspec.DecodeError:
             reason = response.text or "Unknown error"
-        raise exceptions.HTTPError(reason, response.status_code)
+        raise exceptions.HTTPError(reason, response.status_code, response.content)
 
     @staticmethod
     def _serialize_params(params: dict[str, typing.Any]) -> dict[str, str]:
@@ -183,6 +458,7 @@ class XSMeteo:
         hourly: list[str] | None = None,
         daily: list[str] | None = None,
         current: list[str] | None = None,
+        minutely_15: list[str] | None = None,
         temperature_unit: str | None = None,
         wind_speed_unit: str | None = None,
         precipitation_unit: str | None = None,
@@ -190,6 +466,16 @@ class XSMeteo:
         timezone: str | None = None,
         past_days: int | None = None,
         forecast_days: int | None = None,
+        past_hours: int | None = None,
+        forecast_hours: int | None = None,
+        past_minutely_15: int | None = None,
+        forecast_minutely_15: int | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        start_hour: str | None = None,
+        end_hour: str | None = None,
+        start_minutely_15: str | None = None,
+        end_minutely_15: str | None = None,
         models: list[str] | None = None,
     ) -> forecast_models.ForecastResponse:
         """
@@ -207,6 +493,8 @@ class XSMeteo:
             List of daily variables (e.g. ["temperature_2m_max"]).
         current : list[str], optional
             List of current weather variables.
+        minutely_15 : list[str], optional
+            List of 15-minutely variables.
         temperature_unit : str, optional
             "celsius" or "fahrenheit".
         wind_speed_unit : str, optional
@@ -221,6 +509,27 @@ class XSMeteo:
             Days of past data to include (0-92).
         forecast_days : int, optional
             Days of forecast to return (1-16).
+        past_hours : int, optional
+            Hours of past hourly data, counted back from the current hour.
+        forecast_hours : int, optional
+            Hours of hourly forecast, counted from the current hour.
+        past_minutely_15 : int, optional
+            Past 15-minutely steps, counted back from the current step.
+        forecast_minutely_15 : int, optional
+            15-minutely forecast steps, counted from the current step.
+        start_date : str, optional
+            First date (YYYY-MM-DD); requires ``end_date``.
+        end_date : str, optional
+            Last date (YYYY-MM-DD), inclusive.
+        start_hour : str, optional
+            First hour of hourly data (YYYY-MM-DDTHH:MM); see
+            ``services.forecast.forecast_window``.
+        end_hour : str, optional
+            Last hour of hourly data (YYYY-MM-DDTHH:MM), inclusive.
+        start_minutely_15 : str, optional
+            First step of 15-minutely data (YYYY-MM-DDTHH:MM).
+        end_minutely_15 : str, optional
+            Last step of 15-minutely data (YYYY-MM-DDTHH:MM), inclusive.
         models : list[str], optional
             Specific weather models.
 
@@ -235,6 +544,110 @@ class XSMeteo:
             hourly=hourly,
             daily=daily,
             current=current,
+            minutely_15=minutely_15,
+            temperature_unit=temperature_unit,
+            wind_speed_unit=wind_speed_unit,
+            precipitation_unit=precipitation_unit,
+            timeformat=timeformat,
+            timezone=timezone,
+            past_days=past_days,
+            forecast_days=forecast_days,
+            past_hours=past_hours,
+            forecast_hours=forecast_hours,
+            past_minutely_15=past_minutely_15,
+            forecast_minutely_15=forecast_minutely_15,
+            start_date=start_date,
+            end_date=end_date,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            start_minutely_15=start_minutely_15,
+            end_minutely_15=end_minutely_15,
+            models_=models,
+        )
+        return self.request(req_def)
+
+    def get_forecast_batch(
+        self,
+        *,
+        latitude: list[float],
+        longitude: list[float],
+        hourly: list[str] | None = None,
+        daily: list[str] | None = None,
+        current: list[str] | None = None,
+        minutely_15: list[str] | None = None,
+        temperature_unit: str | None = None,
+        wind_speed_unit: str | None = None,
+        precipitation_unit: str | None = None,
+        timeformat: str | None = None,
+        timezone: str | None = None,
+        past_days: int | None = None,
+        forecast_days: int | None = None,
+        models: list[str] | None = None,
+    ) -> list[forecast_models.ForecastResponse]:
+        """
+        Get forecasts for several locations in one request.
+
+        Parameters
+        ----------
+        latitude : list[float]
+            WGS84 Latitudes.
+        longitude : list[float]
+            WGS84 Longitudes, aligned to ``latitude``.
+        hourly : list[str], optional
+            Hourly weather variables.
+        daily : list[str], optional
+            Daily weather variables.
+        current : list[str], optional
+            Current weather variables.
+        minutely_15 : list[str], optional
+            15-minutely weather variables.
+        temperature_unit : str, optional
+            Temperature unit.
+        wind_speed_unit : str, optional
+            Wind speed unit.
+        precipitation_unit : str, optional
+            Precipitation unit.
+        timeformat : str, optional
+            Time format.
+        timezone : str, optional
+            Timezone.
+        past_days : int, optional
+            Number of past days.
+        forecast_days : int, optional
+            Number of forecast days.
+        models : list[str], optional
+            Specific weather models.
+
+        Returns
+        -------
+        list[ForecastResponse]
+            One forecast per location, in input order.
+        """
+        if len(latitude) == 1 and len(longitude) == 1:
+            single = forecast_service.get_forecast(
+                latitude=latitude[0],
+                longitude=longitude[0],
+                hourly=hourly,
+                daily=daily,
+                current=current,
+                minutely_15=minutely_15,
+                temperature_unit=temperature_unit,
+                wind_speed_unit=wind_speed_unit,
+                precipitation_unit=precipitation_unit,
+                timeformat=timeformat,
+                timezone=timezone,
+                past_days=past_days,
+                forecast_days=forecast_days,
+                models_=models,
+            )
+            return [self.request(single)]
+        req_def = forecast_service.get_forecast_batch(
+            latitude=latitude,
+            longitude=longitude,
+            hourly=hourly,
+            daily=daily,
+            current=current,
+            minutely_15=minutely_15,
             temperature_unit=temperature_unit,
             wind_speed_unit=wind_speed_unit,
             precipitation_unit=precipitation_unit,
@@ -246,6 +659,87 @@ class XSMeteo:
         )
         return self.request(req_def)
 
+    def get_current(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        current: list[str],
+        temperature_unit: str | None = None,
+        wind_speed_unit: str | None = None,
+        precipitation_unit: str | None = None,
+        timezone: str | None = None,
+        models: list[str] | None = None,
+    ) -> forecast_models.CurrentResponse:
+        """
+        Get current conditions, cached until the next 15-minute update.
+
+        Only the ``current`` section is requested and decoded. Concurrent
+        calls for the same location and variables share one upstream
+        request; later calls are served from memory until the next
+        quarter hour.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        current : list[str]
+            Current weather variables.
+        temperature_unit : str, optional
+            "celsius" or "fahrenheit".
+        wind_speed_unit : str, optional
+            "kmh", "ms", "mph", or "kn".
+        precipitation_unit : str, optional
+            "mm" or "inch".
+        timezone : str, optional
+            Timezone identifier or "auto".
+        models : list[str], optional
+            Specific weather models.
+
+        Returns
+        -------
+        CurrentResponse
+            The current conditions.
+        """
+        req_def = forecast_service.get_current(
+            latitude=latitude,
+            longitude=longitude,
+            current=current,
+            temperature_unit=temperature_unit,
+            wind_speed_unit=wind_speed_unit,
+            precipitation_unit=precipitation_unit,
+            timezone=timezone,
+            models_=models,
+        )
+        key = cache.request_key(req_def.url, self._serialize_params(req_def.params))
+        cached = self._current_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._current_lock:
+            pending = self._current_inflight.get(key)
+            if pending is None:
+                future: Future[forecast_models.CurrentResponse] = Future()
+                self._current_inflight[key] = future
+        if pending is not None:
+            return pending.result()
+
+        try:
+            ttl = cache.aligned_ttl(forecast_service.CURRENT_INTERVAL_SECONDS)
+            result = self.request(req_def, ttl=ttl)
+            self._current_cache.set(key, result, ttl=ttl)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._current_lock:
+                del self._current_inflight[key]
+
     # Historical API
 
     def get_historical(
@@ -299,6 +793,151 @@ class XSMeteo:
         )
         return self.request(req_def)
 
+    def get_historical_range(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str,
+        hourly: list[str] | None = None,
+        daily: list[str] | None = None,
+        models: str | None = None,
+        timezone: str | None = None,
+        chunk: str = "year",
+        concurrency: int = 4,
+        retries: int = 2,
+    ) -> historical_models.HistoricalResponse:
+        """
+        Get historical weather data for a long period in concurrent chunks.
+
+        The period is split into calendar years or months, the chunks are
+        fetched concurrently (retrying only those that fail) and stitched into
+        one response with a continuous, deduplicated time axis.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        start_date : str
+            Start date (YYYY-MM-DD).
+        end_date : str
+            End date (YYYY-MM-DD).
+        hourly : list[str], optional
+            Historical hourly variables.
+        daily : list[str], optional
+            Historical daily variables.
+        models : str, optional
+            Reanalysis model selector.
+        timezone : str, optional
+            Timezone for time alignment.
+        chunk : str, optional
+            "year" or "month". Default is "year".
+        concurrency : int, optional
+            Maximum number of chunks in flight. Default is 4.
+        retries : int, optional
+            Retries per failing chunk. Default is 2.
+
+        Returns
+        -------
+        HistoricalResponse
+            The stitched historical weather data.
+        """
+        req_defs = [
+            historical_service.get_historical(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=chunk_start,
+                end_date=chunk_end,
+                hourly=hourly,
+                daily=daily,
+                models_=models,
+                timezone=timezone,
+            )
+            for chunk_start, chunk_end in ranges_service.plan_date_ranges(
+                start_date, end_date, chunk=chunk
+            )
+        ]
+        responses = self.request_many(req_defs, concurrency=concurrency, retries=retries)
+        return ranges_service.stitch_responses(responses)
+
+    def get_timeline(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str,
+        hourly: list[str] | None = None,
+        daily: list[str] | None = None,
+        timezone: str | None = None,
+        priority: Sequence[str] = timeline_service.SOURCES,
+        concurrency: int = 4,
+        retries: int = 2,
+    ) -> forecast_models.ForecastResponse:
+        """
+        Get one contiguous series spanning archive and forecast data.
+
+        The window is split between the archive and forecast endpoints so no
+        day is requested twice, the requests are fetched concurrently and the
+        responses are merged, with overlaps resolved by ``priority``.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        start_date : str
+            First date (YYYY-MM-DD).
+        end_date : str
+            Last date (YYYY-MM-DD), at most 15 days ahead.
+        hourly : list[str], optional
+            Hourly variables.
+        daily : list[str], optional
+            Daily variables.
+        timezone : str, optional
+            Timezone for time alignment.
+        priority : Sequence[str], optional
+            Source order, "archive" and "forecast". Default prefers the
+            archive.
+        concurrency : int, optional
+            Maximum number of requests in flight. Default is 4.
+        retries : int, optional
+            Retries per failing request. Default is 2.
+
+        Returns
+        -------
+        ForecastResponse
+            The merged series.
+        """
+        segments = timeline_service.plan_timeline(
+            latitude=latitude,
+            longitude=longitude,
+            start_date=start_date,
+            end_date=end_date,
+            hourly=hourly,
+            daily=daily,
+            timezone=timezone,
+            priority=priority,
+        )
+        responses = self.request_many(
+            [segment.request_def for segment in segments],
+            concurrency=concurrency,
+            retries=retries,
+        )
+        return timeline_service.merge_sources(
+            [
+                (segment.source, response)
+                for segment, response in zip(segments, responses, strict=True)
+            ],
+            start_date=start_date,
+            end_date=end_date,
+            priority=priority,
+        )
+
     # Marine API
 
     def get_marine(
@@ -451,6 +1090,56 @@ class XSMeteo:
         )
         return self.request(req_def)
 
+    def get_elevation_bulk(
+        self,
+        *,
+        latitude: Sequence[float],
+        longitude: Sequence[float],
+        concurrency: int = 8,
+    ) -> array.array[float]:
+        """
+        Get elevations for an arbitrary number of coordinates.
+
+        Duplicate points are looked up once, cached elevations are reused and
+        the remaining points are fetched in API-sized chunks concurrently.
+
+        Parameters
+        ----------
+        latitude : Sequence[float]
+            Latitudes of the points.
+        longitude : Sequence[float]
+            Longitudes of the points, aligned to ``latitude``.
+        concurrency : int, optional
+            Maximum number of requests in flight. Default is 8.
+
+        Returns
+        -------
+        array.array[float]
+            Elevations in meters (typecode ``"d"``), aligned to the input.
+        """
+        coordinates, inverse = elevation_service.dedupe_coordinates(latitude, longitude)
+        cached = [self._elevation_cache.get(coordinate) for coordinate in coordinates]
+        missing = [
+            coordinate
+            for coordinate, elevation in zip(coordinates, cached, strict=True)
+            if elevation is None
+        ]
+        resolved: dict[tuple[float, float], float] = {}
+        if missing:
+            responses = self.request_many(
+                elevation_service.get_elevation_chunks(missing),
+                concurrency=concurrency,
+            )
+            fetched = itertools.chain.from_iterable(response.elevation for response in responses)
+            for coordinate, elevation in zip(missing, fetched, strict=True):
+                self._elevation_cache.set(coordinate, elevation)
+                resolved[coordinate] = elevation
+        elevations = [
+            resolved[coordinate] if elevation is None else elevation
+            for coordinate, elevation in zip(coordinates, cached, strict=True)
+        ]
+        return array.array("d", (elevations[index] for index in inverse))
+
     # Flood API
 
     def get_flood(
@@ -569,3 +1258,63 @@ class XSMeteo:
             daily=daily,
         )
         return self.request(req_def)
+
+    def get_climate_range(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str,
+        models: list[str] | None = None,
+        daily: list[str] | None = None,
+        chunk: str = "year",
+        concurrency: int = 4,
+        retries: int = 2,
+    ) -> climate_models.ClimateResponse:
+        """
+        Get climate projection data for a long period in concurrent chunks.
+
+        See ``get_historical_range`` for how chunks are fetched and stitched.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        start_date : str
+            Start date (e.g. "1950-01-01").
+        end_date : str
+            End date (e.g. "2050-12-31").
+        models : list[str], optional
+            CMIP6 models (e.g. ["EC_Earth3P_HR"]).
+        daily : list[str], optional
+            Daily climate variables.
+        chunk : str, optional
+            "year" or "month". Default is "year".
+        concurrency : int, optional
+            Maximum number of chunks in flight. Default is 4.
+        retries : int, optional
+            Retries per failing chunk. Default is 2.
+
+        Returns
+        -------
+        ClimateResponse
+            The stitched climate data.
+        """
+        req_defs = [
+            climate_service.get_climate(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=chunk_start,
+                end_date=chunk_end,
+                models_=models,
+                daily=daily,
+            )
+            for chunk_start, chunk_end in ranges_service.plan_date_ranges(
+                start_date, end_date, chunk=chunk
+            )
+        ]
+        responses = self.request_many(req_defs, concurrency=concurrency, retries=retries)
+        return ranges_service.stitch_responses(responses)
@@ -0,0 +1,262 @@
+"""
+Continuous forecast refresh for a watchlist of locations.
+
+Each location is refreshed when a new run of the requested models can be
+published, plus jitter so thousands of timers do not fire at once. Due
+locations are fetched hottest first in multi-location batches, paced to the
+slowest limit of the client so its budget is spread evenly over the period.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import heapq
+import inspect
+import itertools
+import random
+import time
+import typing
+
+import httpx
+
+import xsmeteo.core.freshness as freshness
+import xsmeteo.core.rate_limiter as rate_limiter
+import xsmeteo.core.retry as retry
+import xsmeteo.exceptions as exceptions
+
+if typing.TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from xsmeteo.client.async_client import AsyncXSMeteo
+    from xsmeteo.models.forecast import ForecastResponse
+
+
+@dataclasses.dataclass(frozen=True)
+class Refresh:
+    """A freshly fetched forecast for a watched location."""
+
+    latitude: float
+    longitude: float
+    response: ForecastResponse
+
+
+@dataclasses.dataclass(eq=False)
+class _Entry:
+    latitude: float
+    longitude: float
+    priority: int
+    due: float
+    failures: int = 0
+
+
+class Watchlist:
+    """
+    Keep the forecasts of many locations fresh with a steady request rate.
+
+    Examples
+    --------
+    >>> watchlist = Watchlist(client, hourly=["temperature_2m"], models=["icon_seamless"])
+    >>> watchlist.add(52.52, 13.41, priority=10)
+    >>> async for refresh in watchlist.updates():
+    ...     publish(refresh.latitude, refresh.longitude, refresh.response)
+    """
+
+    def __init__(
+        self,
+        client: AsyncXSMeteo,
+        *,
+        hourly: list[str] | None = None,
+        daily: list[str] | None = None,
+        current: list[str] | None = None,
+        timezone: str | None = None,
+        forecast_days: int | None = None,
+        models: list[str] | None = None,
+        batch_size: int = 50,
+        jitter: float = 600.0,
+    ) -> None:
+        """
+        Initialize the watchlist.
+
+        Parameters
+        ----------
+        client : AsyncXSMeteo
+            Client used for fetching. Requests are paced to the sustained
+            rate of its slowest limit (by default 10,000 calls a day, one
+            call per location) with at most one batch of burst.
+        hourly : list[str], optional
+            Hourly variables to keep fresh.
+        daily : list[str], optional
+            Daily variables to keep fresh.
+        current : list[str], optional
+            Current weather variables to keep fresh.
+        timezone : str, optional
+            Timezone for time alignment.
+        forecast_days : int, optional
+            Number of forecast days.
+        models : list[str], optional
+            Weather models; their run cycles (``core.freshness``) set the
+            refresh times.
+        batch_size : int, optional
+            Maximum locations per request. Default is 50.
+        jitter : float, optional
+            Maximum random delay in seconds added to each refresh time.
+            Default is 600.0.
+
+        Raises
+        ------
+        ValueError
+            If no variables are given or ``batch_size`` is not positive.
+        """
+        if not hourly and not daily and not current:
+            raise ValueError("at least one hourly, daily or current variable is required")
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self._client = client
+        self._hourly = hourly
+        self._daily = daily
+        self._current = current
+        self._timezone = timezone
+        self._forecast_days = forecast_days
+        self._models = models
+        self._batch_size = batch_size
+        self._jitter = jitter
+        rate = min((limit.rate for limit in client.limiter.limits), default=None)
+        self._pacer = (
+            None
+            if rate is None
+            else rate_limiter.RateLimiter(
+                [rate_limiter.RateLimitConfig(limit=batch_size, period_seconds=batch_size / rate)]
+            )
+        )
+        self._entries: dict[tuple[float, float], _Entry] = {}
+        self._timers: list[tuple[float, int, _Entry]] = []
+        self._ready: list[tuple[int, float, int, _Entry]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, latitude: float, longitude: float, *, priority: int = 0) -> None:
+        """
+        Watch a location; it is fetched as soon as the budget allows.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        priority : int, optional
+            Higher values are refreshed first when several locations are
+            due. Re-adding a location updates its priority. Default is 0.
+        """
+        key = (latitude, longitude)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.priority = priority
+            return
+        entry = _Entry(latitude, longitude, priority, time.time())
+        self._entries[key] = entry
+        self._schedule(entry, entry.due)
+
+    def remove(self, latitude: float, longitude: float) -> None:
+        """Stop watching a location."""
+        self._entries.pop((latitude, longitude), None)
+
+    async def updates(self) -> AsyncIterator[Refresh]:
+        """
+        Refresh due locations forever, yielding every new forecast.
+
+        Failed batches are retried with exponential backoff if the error is
+        transient, otherwise at the next model run.
+
+        Yields
+        ------
+        Refresh
+            A location and its new forecast.
+        """
+        while True:
+            batch = await self._next_batch()
+            if self._pacer is not None:
+                await self._pacer.acquire_async(len(batch))
+            try:
+                responses = await self._client.get_forecast_batch(
+                    latitude=[entry.latitude for entry in batch],
+                    longitude=[entry.longitude for entry in batch],
+                    hourly=self._hourly,
+                    daily=self._daily,
+                    current=self._current,
+                    timezone=self._timezone,
+                    forecast_days=self._forecast_days,
+                    models=self._models,
+                )
+            except (exceptions.XSMeteoError, httpx.HTTPError) as e:
+                now = time.time()
+                for entry in batch:
+                    if retry.is_retryable(e):
+                        delay = retry.backoff_delay(entry.failures, base=5.0, cap=900.0)
+                        entry.failures += 1
+                        self._schedule(entry, now + delay)
+                    else:
+                        self._schedule(entry, self._next_refresh(now))
+                continue
+
+            now = time.time()
+            for entry, response in zip(batch, responses, strict=True):
+                if self._entries.get((entry.latitude, entry.longitude)) is not entry:
+                    continue
+                entry.failures = 0
+                self._schedule(entry, self._next_refresh(now))
+                yield Refresh(entry.latitude, entry.longitude, response)
+
+    async def run(self, callback: Callable[[Refresh], Awaitable[None] | None]) -> None:
+        """
+        Refresh forever, passing every new forecast to ``callback``.
+
+        Parameters
+        ----------
+        callback : Callable[[Refresh], Awaitable[None] | None]
+            Plain function or coroutine function; coroutines are awaited
+            before the next refresh is delivered.
+        """
+        async for refresh in self.updates():
+            outcome = callback(refresh)
+            if inspect.isawaitable(outcome):
+                await outcome
+
+    def _next_refresh(self, now: float) -> float:
+        return freshness.next_update(self._models, now=now) + random.uniform(0.0, self._jitter)
+
+    def _schedule(self, entry: _Entry, due: float) -> None:
+        entry.due = due
+        heapq.heappush(self._timers, (due, next(self._sequence), entry))
+        self._changed.set()
+
+    def _is_current(self, entry: _Entry, due: float) -> bool:
+        """Return False for removed locations and superseded timers."""
+        key = (entry.latitude, entry.longitude)
+        return self._entries.get(key) is entry and entry.due == due
+
+    async def _next_batch(self) -> list[_Entry]:
+        while True:
+            now = time.time()
+            while self._timers and self._timers[0][0] <= now:
+                due, sequence, entry = heapq.heappop(self._timers)
+                if self._is_current(entry, due):
+                    heapq.heappush(self._ready, (-entry.priority, due, sequence, entry))
+
+            batch: list[_Entry] = []
+            while self._ready and len(batch) < self._batch_size:
+                _, due, _, entry = heapq.heappop(self._ready)
+                if self._is_current(entry, due):
+                    batch.append(entry)
+            if batch:
+                return batch
+
+            self._changed.clear()
+            delay = self._timers[0][0] - now if self._timers else None
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._changed.wait(), timeout=delay)
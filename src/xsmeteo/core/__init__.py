@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from xsmeteo.core.cache import Cache, MemoryCache
 from xsmeteo.core.config import DEFAULT_RATE_LIMITS, ENDPOINTS, APIEndpoints
 from xsmeteo.core.rate_limiter import RateLimitConfig, RateLimiter
+from xsmeteo.core.routing import Backend, EndpointPool
+from xsmeteo.core.shared_cache import SharedMemoryCache
 
 __all__ = [
     "DEFAULT_RATE_LIMITS",
     "ENDPOINTS",
     "APIEndpoints",
+    "Backend",
+    "Cache",
+    "EndpointPool",
+    "MemoryCache",
     "RateLimitConfig",
     "RateLimiter",
+    "SharedMemoryCache",
 ]
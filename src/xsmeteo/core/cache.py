@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+import typing
+import urllib.parse
+from collections import OrderedDict
+from threading import Lock
+
+
+class Cache[K, V](typing.Protocol):
+    """Minimal key/value cache interface used by the clients."""
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        ...
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``; ``ttl=None`` keeps it forever."""
+        ...
+
+
+class MemoryCache[K, V]:
+    """In-process cache with optional per-entry TTL and LRU eviction.
+
+    Thread-safe and specific to an instance (not global state).
+    """
+
+    def __init__(self, *, max_entries: int | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Evict the least recently used entry beyond this size.
+            Unbounded by default.
+        """
+        self._entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if self._max_entries is not None:
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def request_key(url: str, params: dict[str, str]) -> str:
+    """
+    Return a canonical cache key for a GET request.
+
+    Parameters are sorted, so equivalent requests share a key regardless of
+    argument order.
+
+    Parameters
+    ----------
+    url : str
+        Request URL.
+    params : dict[str, str]
+        Serialized query parameters.
+
+    Returns
+    -------
+    str
+        The URL with its sorted, encoded query string.
+    """
+    return f"{url}?{urllib.parse.urlencode(sorted(params.items()))}"
+
+
+def aligned_ttl(interval: float, *, now: float | None = None) -> float:
+    """
+    Return the seconds left until the next multiple of ``interval``.
+
+    Parameters
+    ----------
+    interval : float
+        Update interval in seconds, e.g. 900 for data refreshed every
+        quarter hour on the clock.
+    now : float, optional
+        Current Unix time. Defaults to ``time.time()``.
+
+    Returns
+    -------
+    float
+        A TTL in ``(0, interval]`` that expires on the next boundary.
+    """
+    now = time.time() if now is None else now
+    return interval - now % interval
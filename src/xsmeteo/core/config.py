@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import urllib.parse
+
 import msgspec
 
 from xsmeteo.core.rate_limiter import RateLimitConfig
@@ -22,6 +24,70 @@ class APIEndpoints(msgspec.Struct, frozen=True):
 # Default API endpoints instance
 ENDPOINTS = APIEndpoints()
 
+# Endpoints of the commercial API, used with an ``apikey``
+CUSTOMER_ENDPOINTS = APIEndpoints(
+    FORECAST="https://customer-api.open-meteo.com/v1/forecast",
+    HISTORICAL="https://customer-archive-api.open-meteo.com/v1/archive",
+    MARINE="https://customer-marine-api.open-meteo.com/v1/marine",
+    AIR_QUALITY="https://customer-air-quality-api.open-meteo.com/v1/air-quality",
+    GEOCODING="https://customer-geocoding-api.open-meteo.com/v1/search",
+    ELEVATION="https://customer-api.open-meteo.com/v1/elevation",
+    FLOOD="https://customer-flood-api.open-meteo.com/v1/flood",
+    ENSEMBLE="https://customer-ensemble-api.open-meteo.com/v1/ensemble",
+    CLIMATE="https://customer-climate-api.open-meteo.com/v1/climate",
+)
+
+
+def endpoints_at(base_url: str) -> APIEndpoints:
+    """
+    Return endpoints with the default paths on a single origin.
+
+    Useful for a self-hosted Open-Meteo instance, a proxy or a fake upstream
+    in tests, which serve every API from one host.
+
+    Parameters
+    ----------
+    base_url : str
+        Scheme and host, e.g. "http://localhost:8080".
+
+    Returns
+    -------
+    APIEndpoints
+        E.g. ``FORECAST="http://localhost:8080/v1/forecast"``.
+    """
+    base_url = base_url.rstrip("/")
+    return APIEndpoints(
+        **{
+            name: base_url + urllib.parse.urlsplit(url).path
+            for name, url in msgspec.structs.asdict(ENDPOINTS).items()
+        }
+    )
+
+
+def endpoint_overrides(endpoints: APIEndpoints | None) -> dict[str, str]:
+    """
+    Map the default endpoint URLs to the ones in ``endpoints`` that differ.
+
+    Parameters
+    ----------
+    endpoints : APIEndpoints | None
+        Replacement endpoints; None means no replacement.
+
+    Returns
+    -------
+    dict[str, str]
+        Replacement URL per default URL.
+    """
+    if endpoints is None:
+        return {}
+    return {
+        default: url
+        for default, url in zip(
+            msgspec.structs.astuple(ENDPOINTS), msgspec.structs.astuple(endpoints), strict=True
+        )
+        if default != url
+    }
+
 
 # Default rate limits based on Open-Meteo fair use policy
 DEFAULT_RATE_LIMITS: list[RateLimitConfig] = [
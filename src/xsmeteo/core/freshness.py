@@ -0,0 +1,145 @@
+"""
+Model-run freshness oracle.
+
+Forecasts only change when a weather model publishes a new run, and models
+run on fixed UTC cycles with a fairly stable delay until the run is served.
+Knowing the cycle of the models behind a request tells when a refetch can
+return something new, which is a better cache expiry than a fixed TTL.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelCycle:
+    """
+    Publication cycle of a weather model.
+
+    Attributes
+    ----------
+    interval_hours : int
+        Hours between runs; must divide 24.
+    delay_minutes : int
+        Minutes from the nominal run time until its data is served.
+    first_run_hour : int
+        UTC hour of the first run of the day.
+    """
+
+    interval_hours: int
+    delay_minutes: int
+    first_run_hour: int = 0
+
+    def next_update(self, now: float) -> float:
+        """Return the Unix time the next run becomes available after ``now``."""
+        interval = self.interval_hours * 3600
+        shift = self.first_run_hour * 3600 + self.delay_minutes * 60
+        return ((now - shift) // interval + 1) * interval + shift
+
+    def last_update(self, now: float) -> float:
+        """Return the Unix time the latest run available at ``now`` was published."""
+        return self.next_update(now) - self.interval_hours * 3600
+
+
+# Approximate cycles of the models the API serves, keyed by ``models`` value
+MODEL_CYCLES: dict[str, ModelCycle] = {
+    "icon_seamless": ModelCycle(3, 60),
+    "icon_d2": ModelCycle(3, 60),
+    "icon_eu": ModelCycle(3, 150),
+    "icon_global": ModelCycle(6, 240),
+    "gfs_seamless": ModelCycle(1, 90),
+    "gfs_hrrr": ModelCycle(1, 90),
+    "gfs_global": ModelCycle(6, 240),
+    "gfs025": ModelCycle(6, 240),
+    "ecmwf_ifs025": ModelCycle(12, 420),
+    "ecmwf_ifs04": ModelCycle(12, 420),
+    "ecmwf_aifs025": ModelCycle(6, 420),
+    "meteofrance_seamless": ModelCycle(3, 120),
+    "meteofrance_arpege_world": ModelCycle(6, 240),
+    "gem_seamless": ModelCycle(12, 300),
+    "gem_global": ModelCycle(12, 300),
+    "jma_seamless": ModelCycle(3, 150),
+    "ukmo_seamless": ModelCycle(1, 120),
+    "era5": ModelCycle(24, 0),
+    "era5_land": ModelCycle(24, 0),
+}
+
+# Cycle assumed for ``best_match`` and unknown models: the fastest blended
+# model updates hourly, so an hour is the longest safe expiry
+DEFAULT_CYCLE = ModelCycle(1, 0)
+
+
+def _cycles(models: str | Iterable[str] | None) -> list[ModelCycle]:
+    if models is None:
+        return [DEFAULT_CYCLE]
+    names = models.split(",") if isinstance(models, str) else list(models)
+    return [MODEL_CYCLES.get(name.strip(), DEFAULT_CYCLE) for name in names] or [DEFAULT_CYCLE]
+
+
+def next_update(models: str | Iterable[str] | None = None, *, now: float | None = None) -> float:
+    """
+    Predict when new data can first appear for a request.
+
+    Parameters
+    ----------
+    models : str | Iterable[str], optional
+        The request's ``models`` parameter, as a list or comma-separated
+        string. Defaults to ``best_match``.
+    now : float, optional
+        Current Unix time. Defaults to ``time.time()``.
+
+    Returns
+    -------
+    float
+        Unix time of the earliest upcoming run of any of the models.
+    """
+    now = time.time() if now is None else now
+    return min(cycle.next_update(now) for cycle in _cycles(models))
+
+
+def last_update(models: str | Iterable[str] | None = None, *, now: float | None = None) -> float:
+    """
+    Return when the data available for a request last changed.
+
+    A response fetched after this time cannot change until ``next_update``.
+
+    Parameters
+    ----------
+    models : str | Iterable[str], optional
+        The request's ``models`` parameter. Defaults to ``best_match``.
+    now : float, optional
+        Current Unix time. Defaults to ``time.time()``.
+
+    Returns
+    -------
+    float
+        Unix time of the latest available run of any of the models.
+    """
+    now = time.time() if now is None else now
+    return max(cycle.last_update(now) for cycle in _cycles(models))
+
+
+def ttl(models: str | Iterable[str] | None = None, *, now: float | None = None) -> float:
+    """
+    Return the seconds a response stays fresh.
+
+    Parameters
+    ----------
+    models : str | Iterable[str], optional
+        The request's ``models`` parameter. Defaults to ``best_match``.
+    now : float, optional
+        Current Unix time. Defaults to ``time.time()``.
+
+    Returns
+    -------
+    float
+        Seconds until ``next_update``.
+    """
+    now = time.time() if now is None else now
+    return next_update(models, now=now) - now
@@ -0,0 +1,83 @@
+"""
+Event loop on a background thread.
+
+Lets blocking code submit coroutines to one long-lived loop, so async
+clients keep their connection pools and concurrency across calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+
+class LoopThread:
+    """
+    An asyncio event loop running on a daemon thread.
+
+    Examples
+    --------
+    >>> loop = LoopThread()
+    >>> loop.run(asyncio.sleep(0.1, result="done"))
+    'done'
+    >>> loop.close()
+    """
+
+    def __init__(self, name: str = "xsmeteo-loop") -> None:
+        """
+        Start the loop.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the thread. Default is "xsmeteo-loop".
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop accepts work."""
+        return self._thread.is_alive() and not self._loop.is_closed()
+
+    def run[T](self, coroutine: Coroutine[typing.Any, typing.Any, T]) -> T:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Parameters
+        ----------
+        coroutine : Coroutine
+            The coroutine to run.
+
+        Returns
+        -------
+        T
+            Its result; exceptions are re-raised in the calling thread.
+
+        Raises
+        ------
+        RuntimeError
+            If called from the loop thread itself (it would deadlock) or
+            after ``close``.
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("LoopThread.run() cannot be called from its own loop")
+        if not self.is_running:
+            coroutine.close()
+            raise RuntimeError("LoopThread is closed")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        """Stop the loop, join the thread and close the loop. Idempotent."""
+        if self._loop.is_closed():
+            return
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
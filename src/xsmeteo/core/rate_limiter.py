@@ -47,6 +47,9 @@ class TokenBucket:
 
     def time_to_wait(self, amount: int = 1) -> float:
         self.refill()
+        # Requests larger than the bucket go through once it is full and
+        # leave a debt that later requests wait for
+        amount = min(amount, self.config.limit)
         if self.tokens >= amount:
             return 0.0
         missing = amount - self.tokens
@@ -56,53 +59,54 @@ class TokenBucket:
 class RateLimiter:
     """Hierarchical Token Bucket Rate Limiter.
 
-    Thread-safe and specific to an instance (not global state).
+    Thread-safe and specific to an instance (not global state). One limiter
+    can be shared by threads and event loops: the lock only guards the
+    check-and-consume step and is never held while waiting.
     """
 
     def __init__(self, limits: list[RateLimitConfig]) -> None:
         self._buckets = [TokenBucket(config) for config in limits]
         self._lock = Lock()
 
+    @property
+    def limits(self) -> list[RateLimitConfig]:
+        """The configured limits, one per bucket."""
+        return [bucket.config for bucket in self._buckets]
+
     def acquire_sync(self, tokens: int = 1, timeout: float | None = None) -> None:
         """Acquire tokens synchronously, blocking if necessary."""
-
-        with self._lock:
-            wait_time = self._calculate_wait_time(tokens)
-
-            if timeout is not None and wait_time > timeout:
-                raise RateLimitError(f"Rate limit exceeded. Try again in {wait_time:.2f}s")
-
-            if wait_time > 0:
-                time.sleep(wait_time)
-                # Re-check after sleeping as other threads might have consumed tokens
-                # For strict correctness we should re-loop, but for simple rate limiting
-                # strict FIFO isn't always required. However, let's just consume now.
-                # A more robust implementation would loop.
-
-            # Consume from all buckets
-            for bucket in self._buckets:
-                # We assume wait_time was correct and we can consume now.
-                # In high contention, this might dip negative (acceptable for soft limits).
-                # To be perfectly strict, we'd need a more complex loop.
-                bucket.tokens -= tokens
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Re-check after every sleep: other threads may have taken the tokens
+        while (wait_time := self._reserve(tokens)) > 0:
+            _check_deadline(deadline, wait_time)
+            time.sleep(wait_time)
 
     async def acquire_async(self, tokens: int = 1, timeout: float | None = None) -> None:
         """Acquire tokens asynchronously, yielding if necessary."""
-        # Note: asyncio doesn't use the thread lock.
-        # We assume this method is called from a single event loop.
-        # If shared across threads/loops, explicit async locks would be needed.
-
-        wait_time = self._calculate_wait_time(tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Re-check after every sleep: concurrent tasks waiting on the same
+        # bucket would otherwise all wake up together and burst past the limit.
+        while (wait_time := self._reserve(tokens)) > 0:
+            _check_deadline(deadline, wait_time)
+            await asyncio.sleep(wait_time)
 
-        if timeout is not None and wait_time > timeout:
-            raise RateLimitError(f"Rate limit exceeded. Try again in {wait_time:.2f}s")
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Acquire tokens if they are available right now, without waiting."""
+        return self._reserve(tokens) == 0
 
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
+    def wait_time(self, tokens: int = 1) -> float:
+        """Return the seconds until ``tokens`` are available, without consuming them."""
+        with self._lock:
+            return self._calculate_wait_time(tokens)
 
-        # Consume logic similar to sync
-        for bucket in self._buckets:
-            bucket.tokens -= tokens
+    def _reserve(self, tokens: int) -> float:
+        """Consume tokens if every bucket has them, else return the time to wait."""
+        with self._lock:
+            wait_time = self._calculate_wait_time(tokens)
+            if wait_time == 0:
+                for bucket in self._buckets:
+                    bucket.tokens -= tokens
+            return wait_time
 
     def _calculate_wait_time(self, tokens: int) -> float:
         """Calculate the maximum wait time required across all buckets."""
@@ -111,3 +115,8 @@ class RateLimiter:
             wait = bucket.time_to_wait(tokens)
             max_wait = max(max_wait, wait)
         return max_wait
+
+
+def _check_deadline(deadline: float | None, wait_time: float) -> None:
+    if deadline is not None and time.monotonic() + wait_time > deadline:
+        raise RateLimitError(f"Rate limit exceeded. Try again in {wait_time:.2f}s")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import random
+
+import httpx
+
+import xsmeteo.exceptions as exceptions
+
+# HTTP status codes worth retrying: throttling and transient server failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True if a failed request may succeed when sent again."""
+    if isinstance(error, exceptions.HTTPError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, exceptions.RateLimitError))
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0.0, min(cap, base * 2**attempt))
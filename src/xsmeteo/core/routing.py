@@ -0,0 +1,381 @@
+"""
+Routing requests across several Open-Meteo backends.
+
+An ``EndpointPool`` holds backends such as a self-hosted instance, the
+commercial API with a key and the public API, each with its own rate limits.
+Every request goes to the fastest healthy backend, preferring unlimited ones;
+when it fails with a transport error or a retryable status, the next backend
+is tried. Backends failing repeatedly are skipped for a cooldown period, and
+health checks probe them in the background.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+import time
+import typing
+import urllib.parse
+
+import httpx
+
+import xsmeteo.core.config as config
+import xsmeteo.core.rate_limiter as rate_limiter
+import xsmeteo.core.retry as retry
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Weight of a new sample in the moving average of a backend's latency
+_LATENCY_SMOOTHING = 0.2
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Backend:
+    """
+    One deployment of the Open-Meteo APIs.
+
+    Attributes
+    ----------
+    endpoints : APIEndpoints
+        URLs of the APIs; see ``config.endpoints_at`` for self-hosted
+        instances and ``config.CUSTOMER_ENDPOINTS`` for the commercial API.
+    api_key : str | None
+        Sent as the ``apikey`` query parameter.
+    rate_limits : list[RateLimitConfig] | None
+        Limits of this backend; None means unlimited.
+    name : str | None
+        Label in ``EndpointPool.status``. Defaults to the forecast host.
+    """
+
+    endpoints: config.APIEndpoints
+    api_key: str | None = None
+    rate_limits: list[rate_limiter.RateLimitConfig] | None = None
+    name: str | None = None
+
+    @property
+    def label(self) -> str:
+        """``name``, or the host of the forecast endpoint."""
+        return self.name or urllib.parse.urlsplit(self.endpoints.FORECAST).netloc
+
+
+PUBLIC_BACKEND = Backend(config.ENDPOINTS, rate_limits=config.DEFAULT_RATE_LIMITS, name="public")
+
+
+@dataclasses.dataclass(frozen=True)
+class Route:
+    """
+    A request resolved to one backend.
+
+    Attributes
+    ----------
+    backend : Backend
+        The backend.
+    url : str
+        URL of the requested API on the backend.
+    params : dict[str, str]
+        Query parameters, including the backend's API key.
+    limiter : RateLimiter | None
+        Limiter to acquire before sending; None for unlimited backends.
+    """
+
+    backend: Backend
+    url: str
+    params: dict[str, str]
+    limiter: rate_limiter.RateLimiter | None
+
+
+@dataclasses.dataclass
+class BackendStatus:
+    """
+    Health of a backend.
+
+    Attributes
+    ----------
+    name : str
+        ``Backend.label``.
+    healthy : bool
+        False while the backend is skipped after failures.
+    latency : float | None
+        Moving average of response times in seconds; None before the first
+        response.
+    """
+
+    name: str
+    healthy: bool
+    latency: float | None
+
+
+@dataclasses.dataclass(eq=False)
+class _State:
+    overrides: dict[str, str]
+    limiter: rate_limiter.RateLimiter | None
+    latency: float | None = None
+    failures: int = 0
+    down_until: float = 0.0
+
+
+class EndpointPool:
+    """
+    Latency-ordered routing with failover across backends.
+
+    Examples
+    --------
+    >>> pool = EndpointPool(
+    ...     [
+    ...         Backend(config.endpoints_at("http://meteo.internal:8080"), name="local"),
+    ...         Backend(config.CUSTOMER_ENDPOINTS, api_key="...", rate_limits=[...]),
+    ...     ]
+    ... )
+    >>> client = XSMeteo(endpoint_pool=pool)
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Backend],
+        *,
+        fallback: Backend | None = PUBLIC_BACKEND,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        health_path: str = "?latitude=0&longitude=0",
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Parameters
+        ----------
+        backends : Sequence[Backend]
+            Backends to route to.
+        fallback : Backend | None, optional
+            Backend appended after ``backends``, used when they are down or
+            out of budget. Defaults to the public API with the free-tier
+            limits; None disables it.
+        failure_threshold : int, optional
+            Consecutive failures after which a backend is skipped. Default
+            is 3.
+        cooldown : float, optional
+            Seconds a failed backend is skipped before it is tried again.
+            Default is 30.0.
+        health_path : str, optional
+            Query appended to a backend's elevation endpoint by health
+            checks, the cheapest request of the APIs. Default is
+            "?latitude=0&longitude=0".
+
+        Raises
+        ------
+        ValueError
+            If there are no backends or ``failure_threshold`` is not positive.
+        """
+        self._backends = list(backends)
+        if fallback is not None and fallback not in self._backends:
+            self._backends.append(fallback)
+        if not self._backends:
+            raise ValueError("at least one backend is required")
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive")
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._health_path = health_path
+        self._states = {
+            backend: _State(
+                config.endpoint_overrides(backend.endpoints),
+                None
+                if backend.rate_limits is None
+                else rate_limiter.RateLimiter(backend.rate_limits),
+            )
+            for backend in self._backends
+        }
+        self._lock = threading.Lock()
+
+    def routes(self, url: str, params: dict[str, str]) -> list[Route]:
+        """
+        Return the backends to try for a request, best first.
+
+        Healthy backends come first: unlimited ones, then limited ones with
+        budget left, then limited ones that would have to wait, each group
+        ordered by latency. Backends in cooldown are only returned if no
+        healthy backend exists.
+
+        Parameters
+        ----------
+        url : str
+            Default URL of the API (``config.ENDPOINTS``).
+        params : dict[str, str]
+            Serialized query parameters.
+
+        Returns
+        -------
+        list[Route]
+            Routes in the order to try them.
+        """
+        now = time.monotonic()
+        # Budgets are read before taking the pool lock, which must stay short
+        tiers = {backend: self._tier(self._states[backend]) for backend in self._backends}
+        with self._lock:
+            ranked = sorted(
+                self._backends,
+                key=lambda backend: self._rank(self._states[backend], tiers[backend], now),
+            )
+            healthy = [b for b in ranked if self._states[b].down_until <= now]
+        routes = []
+        for backend in healthy or ranked:
+            state = self._states[backend]
+            route_params = (
+                params if backend.api_key is None else params | {"apikey": backend.api_key}
+            )
+            routes.append(
+                Route(backend, state.overrides.get(url, url), route_params, state.limiter)
+            )
+        return routes
+
+    def record_success(self, backend: Backend, latency: float) -> None:
+        """Mark a backend healthy and add a response time to its average."""
+        with self._lock:
+            state = self._states[backend]
+            state.failures = 0
+            state.down_until = 0.0
+            state.latency = (
+                latency
+                if state.latency is None
+                else state.latency + _LATENCY_SMOOTHING * (latency - state.latency)
+            )
+
+    def record_failure(self, backend: Backend, *, immediate: bool = False) -> None:
+        """
+        Count a failed request; the backend is skipped at the threshold.
+
+        Parameters
+        ----------
+        backend : Backend
+            The backend that failed.
+        immediate : bool, optional
+            Skip the backend right away, e.g. after a failed health check.
+            Default is False.
+        """
+        with self._lock:
+            state = self._states[backend]
+            state.failures += 1
+            if immediate or state.failures >= self._failure_threshold:
+                state.down_until = time.monotonic() + self._cooldown
+
+    def status(self) -> list[BackendStatus]:
+        """Return the health of every backend, in configuration order."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                BackendStatus(
+                    backend.label,
+                    self._states[backend].down_until <= now,
+                    self._states[backend].latency,
+                )
+                for backend in self._backends
+            ]
+
+    async def check(self, http: httpx.AsyncClient | None = None) -> list[BackendStatus]:
+        """
+        Probe every backend concurrently and update its health and latency.
+
+        Limited backends without budget left are not probed.
+
+        Parameters
+        ----------
+        http : httpx.AsyncClient, optional
+            Client to send the probes with. A short-lived one is used by
+            default.
+
+        Returns
+        -------
+        list[BackendStatus]
+            Health of every backend after the probes.
+        """
+        if http is None:
+            async with httpx.AsyncClient(timeout=10.0) as owned:
+                return await self.check(owned)
+
+        async def probe(backend: Backend) -> None:
+            url, params = self._probe_request(backend)
+            started = time.monotonic()
+            try:
+                response = await http.get(url, params=params)
+            except httpx.HTTPError:
+                self.record_failure(backend, immediate=True)
+                return
+            self._record_probe(backend, response, time.monotonic() - started)
+
+        await asyncio.gather(*(probe(b) for b in self._backends if self._has_budget(b)))
+        return self.status()
+
+    def check_sync(self, http: httpx.Client | None = None) -> list[BackendStatus]:
+        """
+        Probe every backend one after another; see ``check``.
+
+        Parameters
+        ----------
+        http : httpx.Client, optional
+            Client to send the probes with. A short-lived one is used by
+            default.
+
+        Returns
+        -------
+        list[BackendStatus]
+            Health of every backend after the probes.
+        """
+        if http is None:
+            with httpx.Client(timeout=10.0) as owned:
+                return self.check_sync(owned)
+        for backend in self._backends:
+            if not self._has_budget(backend):
+                continue
+            url, params = self._probe_request(backend)
+            started = time.monotonic()
+            try:
+                response = http.get(url, params=params)
+            except httpx.HTTPError:
+                self.record_failure(backend, immediate=True)
+                continue
+            self._record_probe(backend, response, time.monotonic() - started)
+        return self.status()
+
+    async def monitor(self, interval: float = 30.0) -> None:
+        """
+        Run ``check`` every ``interval`` seconds until cancelled.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between checks. Default is 30.0.
+        """
+        async with httpx.AsyncClient(timeout=min(interval, 10.0)) as http:
+            while True:
+                await self.check(http)
+                await asyncio.sleep(interval)
+
+    @staticmethod
+    def _tier(state: _State) -> int:
+        if state.limiter is None:
+            return 0
+        return 1 if state.limiter.wait_time() == 0 else 2
+
+    @staticmethod
+    def _rank(state: _State, tier: int, now: float) -> tuple[bool, int, float]:
+        # Unmeasured backends rank first within their tier, so they get measured
+        return state.down_until > now, tier, state.latency or 0.0
+
+    def _has_budget(self, backend: Backend) -> bool:
+        # Never waits, so probes can run from an event loop
+        limiter = self._states[backend].limiter
+        return limiter is None or limiter.try_acquire()
+
+    def _probe_request(self, backend: Backend) -> tuple[str, dict[str, str]]:
+        url, _, query = (backend.endpoints.ELEVATION + self._health_path).partition("?")
+        params = dict(urllib.parse.parse_qsl(query))
+        if backend.api_key is not None:
+            params["apikey"] = backend.api_key
+        return url, params
+
+    def _record_probe(self, backend: Backend, response: httpx.Response, latency: float) -> None:
+        if response.status_code in retry.RETRYABLE_STATUS_CODES:
+            self.record_failure(backend, immediate=True)
+        else:
+            self.record_success(backend, latency)
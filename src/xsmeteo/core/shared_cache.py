@@ -0,0 +1,252 @@
+"""
+Response cache shared by all processes on a host.
+
+``SharedMemoryCache`` keeps raw response bodies in one memory-mapped file, so
+every worker of a pre-forking server (gunicorn, uWSGI, ``multiprocessing``)
+reads and fills the same entries instead of holding its own copy.
+
+The file holds a header, a fixed hash index and a ring buffer of records.
+Writers append to the ring and update the index under a file lock. Readers
+take no lock: every index slot carries a sequence number that is odd while the
+slot is written, and a record is only returned if the ring has not wrapped
+over it by the time it was copied out.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import typing
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_MAGIC = b"XSMC"
+_VERSION = 1
+# magic, version, slots, capacity, head (logical write position of the ring)
+_HEADER = struct.Struct("<4sIQQQ")
+_HEADER_SIZE = 64
+_HEAD_OFFSET = 24
+# sequence, key hash, logical offset, record length, expiry (0.0 = never)
+_SLOT = struct.Struct("<QQQQd")
+_KEY_LENGTH = struct.Struct("<I")
+_PROBES = 8
+
+
+def _hash(key: bytes) -> int:
+    # ``hash()`` is salted per process, so it cannot address a shared index
+    value = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+    return value or 1
+
+
+class SharedMemoryCache:
+    """
+    Cache of raw responses in a memory-mapped file shared across processes.
+
+    Implements ``Cache[str, bytes]``, so it can be passed as ``response_cache``
+    to either client. Processes opening the same ``path`` share all entries;
+    the first one creates the file. When the ring is full, the oldest records
+    are overwritten.
+
+    Examples
+    --------
+    >>> cache = SharedMemoryCache("/dev/shm/xsmeteo.cache", capacity=512 * 2**20)
+    >>> client = XSMeteo(response_cache=cache, response_ttl=900)
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        capacity: int = 256 * 2**20,
+        slots: int = 65_536,
+    ) -> None:
+        """
+        Open or create the cache file.
+
+        Parameters
+        ----------
+        path : str | PathLike
+            File backing the cache. A path on a RAM-backed filesystem such as
+            ``/dev/shm`` keeps it out of the disk cache.
+        capacity : int, optional
+            Bytes available for records. Default is 256 MiB.
+        slots : int, optional
+            Size of the hash index, i.e. an upper bound on the number of
+            entries. Default is 65,536.
+
+        Notes
+        -----
+        ``capacity`` and ``slots`` only apply when the file is created;
+        later processes use the layout found in the file.
+
+        Raises
+        ------
+        ValueError
+            If ``capacity`` or ``slots`` is not positive, or ``path`` is not a
+            cache file.
+        """
+        if capacity < 1 or slots < 1:
+            raise ValueError("capacity and slots must be positive")
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600)
+        try:
+            # Positioned reads and writes, as os.pread/os.pwrite are POSIX-only
+            with self._file_lock():
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, _HEADER_SIZE + slots * _SLOT.size + capacity)
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    os.write(self._fd, _HEADER.pack(_MAGIC, _VERSION, slots, capacity, 0))
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                header = os.read(self._fd, _HEADER.size)
+            magic, version, slots, capacity, _ = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{os.fspath(path)!r} is not an xsmeteo cache file")
+            self._mmap = mmap.mmap(self._fd, _HEADER_SIZE + slots * _SLOT.size + capacity)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._slots = slots
+        self._capacity = capacity
+        self._data = _HEADER_SIZE + slots * _SLOT.size
+
+    def __len__(self) -> int:
+        head = self._head()
+        now = time.time()
+        count = 0
+        for slot in range(self._slots):
+            sequence, key_hash, offset, _, expires = _SLOT.unpack_from(
+                self._mmap, _HEADER_SIZE + slot * _SLOT.size
+            )
+            if key_hash and not sequence & 1 and self._is_live(offset, expires, head, now):
+                count += 1
+        return count
+
+    def get(self, key: str) -> bytes | None:
+        encoded = key.encode()
+        key_hash = _hash(encoded)
+        for position in self._probe(key_hash):
+            sequence, slot_hash, offset, length, expires = _SLOT.unpack_from(self._mmap, position)
+            if slot_hash != key_hash or sequence & 1:
+                continue
+            if not self._is_live(offset, expires, self._head(), time.time()):
+                return None
+            start = self._data + offset % self._capacity
+            (key_length,) = _KEY_LENGTH.unpack_from(self._mmap, start)
+            value_start = start + _KEY_LENGTH.size + key_length
+            if self._mmap[start + _KEY_LENGTH.size : value_start] != encoded:
+                continue
+            value = self._mmap[value_start : start + length]
+            # Discard what was read if a writer touched the slot or the ring
+            # wrapped over the record meanwhile
+            if _SLOT.unpack_from(self._mmap, position)[0] != sequence:
+                return None
+            if offset < self._head() - self._capacity:
+                return None
+            return value
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        encoded = key.encode()
+        length = _KEY_LENGTH.size + len(encoded) + len(value)
+        if length > self._capacity:
+            return
+        key_hash = _hash(encoded)
+        expires = 0.0 if ttl is None else time.time() + ttl
+        with self._lock, self._file_lock():
+            offset = self._head()
+            if offset % self._capacity + length > self._capacity:
+                offset += self._capacity - offset % self._capacity
+            head = offset + length
+            # Reserve the space before writing, so readers of the records
+            # being overwritten notice
+            struct.pack_into("<Q", self._mmap, _HEAD_OFFSET, head)
+            start = self._data + offset % self._capacity
+            _KEY_LENGTH.pack_into(self._mmap, start, len(encoded))
+            value_start = start + _KEY_LENGTH.size + len(encoded)
+            self._mmap[start + _KEY_LENGTH.size : value_start] = encoded
+            self._mmap[value_start : start + length] = value
+
+            position = self._choose_slot(key_hash, head)
+            (sequence,) = struct.unpack_from("<Q", self._mmap, position)
+            struct.pack_into("<Q", self._mmap, position, sequence + 1)
+            _SLOT.pack_into(self._mmap, position, sequence + 1, key_hash, offset, length, expires)
+            struct.pack_into("<Q", self._mmap, position, sequence + 2)
+
+    def clear(self) -> None:
+        """Drop all entries, for every process sharing the file."""
+        with self._lock, self._file_lock():
+            for position in range(_HEADER_SIZE, self._data, _SLOT.size):
+                (sequence,) = struct.unpack_from("<Q", self._mmap, position)
+                struct.pack_into("<Q", self._mmap, position, sequence + 1)
+                _SLOT.pack_into(self._mmap, position, sequence + 1, 0, 0, 0, 0.0)
+                struct.pack_into("<Q", self._mmap, position, sequence + 2)
+
+    def close(self) -> None:
+        """Unmap the file. The file and its entries remain for other processes."""
+        if self._mmap.closed:
+            return
+        self._mmap.close()
+        os.close(self._fd)
+
+    def _head(self) -> int:
+        return typing.cast("int", struct.unpack_from("<Q", self._mmap, _HEAD_OFFSET)[0])
+
+    def _is_live(self, offset: int, expires: float, head: int, now: float) -> bool:
+        return offset >= head - self._capacity and (expires == 0.0 or expires > now)
+
+    def _probe(self, key_hash: int) -> Iterator[int]:
+        for step in range(min(_PROBES, self._slots)):
+            yield _HEADER_SIZE + (key_hash + step) % self._slots * _SLOT.size
+
+    def _choose_slot(self, key_hash: int, head: int) -> int:
+        """Slot for a new record: the key's own, else a free one, else the oldest."""
+        now = time.time()
+        free: int | None = None
+        oldest, oldest_offset = -1, head
+        for position in self._probe(key_hash):
+            _, slot_hash, offset, _, expires = _SLOT.unpack_from(self._mmap, position)
+            if slot_hash == key_hash:
+                return position
+            if not slot_hash or not self._is_live(offset, expires, head, now):
+                if free is None:
+                    free = position
+            elif offset < oldest_offset:
+                oldest, oldest_offset = position, offset
+        return oldest if free is None else free
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock across processes: ``flock``, or ``msvcrt.locking`` on Windows."""
+        if sys.platform == "win32":
+            # Locks the first byte from the file position; LK_LOCK gives up
+            # with OSError after ten one-second attempts, so keep waiting
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                except OSError:
+                    continue
+                break
+            try:
+                yield
+            finally:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
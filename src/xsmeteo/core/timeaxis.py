@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_SECOND = datetime.timedelta(seconds=1)
+
+
+def to_unix_seconds(
+    values: Sequence[float | int | str | None],
+    utc_offset_seconds: int = 0,
+) -> list[int]:
+    """
+    Convert an API time axis to UTC Unix timestamps.
+
+    Parameters
+    ----------
+    values : Sequence[float | int | str | None]
+        ``time`` column of a response: local ISO 8601 strings
+        (``timeformat=iso8601``, the default) or Unix timestamps
+        (``timeformat=unixtime``, already in UTC).
+    utc_offset_seconds : int, optional
+        ``utc_offset_seconds`` of the response, subtracted from ISO times.
+
+    Returns
+    -------
+    list[int]
+        Seconds since the Unix epoch (UTC).
+
+    Raises
+    ------
+    ValueError
+        If a value is missing or not a valid timestamp.
+    """
+    result: list[int] = []
+    for value in values:
+        if isinstance(value, str):
+            local = datetime.datetime.fromisoformat(value)
+            result.append((local - _EPOCH) // _SECOND - utc_offset_seconds)
+        elif value is None:
+            raise ValueError("time axis contains a missing value")
+        else:
+            result.append(int(value))
+    return result
+
+
+def to_unix_second(value: datetime.datetime | int) -> int:
+    """Convert a datetime (naive values are taken as UTC) or timestamp to Unix seconds."""
+    if isinstance(value, int):
+        return value
+    if value.tzinfo is None:
+        return (value - _EPOCH) // _SECOND
+    return int(value.timestamp())
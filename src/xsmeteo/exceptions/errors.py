@@ -10,11 +10,15 @@ class RequestError(XSMeteoError):
 
 
 class HTTPError(RequestError):
-    """Exception raised when an HTTP request fails (non-2xx status)."""
+    """Exception raised when an HTTP request fails (non-2xx status).
 
-    def __init__(self, message: str, status_code: int) -> None:
+    ``body`` holds the raw response body, empty if there was none.
+    """
+
+    def __init__(self, message: str, status_code: int, body: bytes = b"") -> None:
         super().__init__(f"{status_code}: {message}")
         self.status_code = status_code
+        self.body = body
 
 
 class RateLimitError(RequestError):
@@ -13,6 +13,7 @@ from xsmeteo.models.elevation import ElevationResponse
 from xsmeteo.models.ensemble import EnsembleResponse
 from xsmeteo.models.flood import FloodResponse
 from xsmeteo.models.forecast import (
+    CurrentResponse,
     ForecastResponse,
 )
 from xsmeteo.models.geocoding import GeocodingResponse, GeocodingResult
@@ -23,7 +24,7 @@ __all__ = [
     "AirQualityResponse",
     "BaseStruct",
     "ClimateResponse",
-    "ClimateResponse",
+    "CurrentResponse",
     "ElevationResponse",
     "EnsembleResponse",
     "FloodResponse",
@@ -19,3 +19,16 @@ class ForecastResponse(BaseStruct, forbid_unknown_fields=False):
     daily: dict[str, list[float | int | str | None]] | None = None
     current_units: dict[str, str] | None = None
     current: dict[str, float | int | str] | None = None
+    minutely_15_units: dict[str, str] | None = None
+    minutely_15: dict[str, list[float | int | str | None]] | None = None
+
+
+class CurrentResponse(BaseStruct, forbid_unknown_fields=False):
+    """Current conditions from the Forecast API; all other sections are skipped."""
+
+    latitude: float
+    longitude: float
+    utc_offset_seconds: int
+    timezone: str
+    current_units: dict[str, str] | None = None
+    current: dict[str, float | int | str] | None = None
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+from xsmeteo.proxy.server import ProxyServer
+
+__all__ = [
+    "ProxyServer",
+]
@@ -0,0 +1,77 @@
+"""
+Run the caching proxy: ``python -m xsmeteo.proxy --port 8080``.
+
+Apps then use ``http://localhost:8080/v1/forecast`` and the other public API
+paths instead of the Open-Meteo hosts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+
+import xsmeteo.core.cache as cache
+import xsmeteo.core.config as config
+import xsmeteo.core.shared_cache as shared_cache
+import xsmeteo.proxy.server as server
+from xsmeteo.client.async_client import AsyncXSMeteo
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m xsmeteo.proxy", description="Caching proxy for the Open-Meteo APIs."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument(
+        "--upstream",
+        help="origin serving all APIs instead of the public hosts, e.g. http://localhost:9000",
+    )
+    parser.add_argument(
+        "--cache-entries", type=int, default=10_000, help="size of the in-memory response cache"
+    )
+    parser.add_argument(
+        "--shared-cache",
+        metavar="PATH",
+        help="use a SharedMemoryCache on this file instead of the in-memory cache",
+    )
+    parser.add_argument(
+        "--response-ttl", type=float, default=900.0, help="seconds a response stays cached"
+    )
+    parser.add_argument(
+        "--model-aware-ttl",
+        action="store_true",
+        help="expire forecasts when a new model run can be published",
+    )
+    return parser.parse_args(argv)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    response_cache: cache.Cache[str, bytes] = (
+        shared_cache.SharedMemoryCache(args.shared_cache)
+        if args.shared_cache
+        else cache.MemoryCache(max_entries=args.cache_entries)
+    )
+    async with (
+        AsyncXSMeteo(
+            response_cache=response_cache,
+            response_ttl=args.response_ttl,
+            model_aware_ttl=args.model_aware_ttl,
+            endpoints=config.endpoints_at(args.upstream) if args.upstream else None,
+        ) as client,
+        server.ProxyServer(client, host=args.host, port=args.port) as proxy,
+    ):
+        print(f"xsmeteo proxy listening on http://{args.host}:{proxy.port}")
+        await proxy.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the proxy until interrupted."""
+    args = _parse_args(argv)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+HTTP server answering Open-Meteo API requests through one shared client.
+
+Every app on a host, in any language, can point at the proxy instead of the
+public APIs: they then share its response cache, its rate limiter and its
+in-flight requests. Request paths and query strings are those of the public
+APIs (``APIEndpoints``); response bodies are passed through as received.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import typing
+import urllib.parse
+
+import httpx
+import msgspec
+
+import xsmeteo.core.cache as cache
+import xsmeteo.core.config as config
+import xsmeteo.exceptions as exceptions
+from xsmeteo.services.common import RequestDef
+
+if typing.TYPE_CHECKING:
+    from xsmeteo.client.async_client import AsyncXSMeteo
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Content Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+}
+
+
+# Limits on what a client may send; the API takes no request bodies
+_MAX_HEADERS = 100
+_MAX_BODY = 8 * 1024
+
+
+def _routes() -> dict[str, str]:
+    """Map the path of every public endpoint to its URL."""
+    return {
+        urllib.parse.urlsplit(url).path: url for url in msgspec.structs.astuple(config.ENDPOINTS)
+    }
+
+
+def _error_body(reason: str) -> bytes:
+    # Same shape as the errors of the Open-Meteo APIs
+    return msgspec.json.encode({"error": True, "reason": reason})
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError as e:
+        # Raised by the stream for lines above its limit
+        raise ValueError("Request header too long") from e
+
+
+class ProxyServer:
+    """
+    Caching HTTP/1.1 proxy for the Open-Meteo APIs.
+
+    Cache misses are forwarded with ``AsyncXSMeteo.fetch_raw``, so the
+    client's response cache and rate limiter apply. Concurrent identical
+    requests share one upstream fetch.
+
+    Examples
+    --------
+    >>> async with AsyncXSMeteo(response_cache=MemoryCache()) as client:
+    ...     async with ProxyServer(client, port=8080) as server:
+    ...         await server.serve_forever()
+    """
+
+    def __init__(self, client: AsyncXSMeteo, *, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Initialize the server.
+
+        Parameters
+        ----------
+        client : AsyncXSMeteo
+            Client forwarding cache misses. Its ``endpoints`` select the
+            upstream.
+        host : str, optional
+            Address to listen on. Default is "127.0.0.1".
+        port : int, optional
+            Port to listen on; 0 picks a free port. Default is 8080.
+        """
+        self._client = client
+        self._host = host
+        self._port = port
+        self._routes = _routes()
+        self._server: asyncio.Server | None = None
+        self._inflight: dict[str, asyncio.Task[bytes]] = {}
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def __aenter__(self) -> ProxyServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on, once started."""
+        if self._server is None:
+            return self._port
+        return typing.cast("int", self._server.sockets[0].getsockname()[1])
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle, self._host, self._port)
+
+    async def serve_forever(self) -> None:
+        """Start listening if needed and serve until cancelled."""
+        await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and close open connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one connection until either side closes it."""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request_line, headers = await self._read_head(reader)
+                except ValueError as e:
+                    await self._respond(writer, 400, _error_body(str(e)))
+                    return
+                if not request_line:
+                    return
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, _error_body("Malformed request line"))
+                    return
+                method, target, version = parts
+                rejected = await self._read_body(reader, method, headers)
+                if rejected is not None:
+                    await self._respond(writer, rejected[0], _error_body(rejected[1]))
+                    return
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                )
+                status, body = await self._dispatch(method, target)
+                await self._respond(writer, status, body, keep_alive=keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _dispatch(self, method: str, target: str) -> tuple[int, bytes]:
+        if method != "GET":
+            return 405, _error_body(f"Method {method} is not supported")
+        path, _, query = target.partition("?")
+        url = self._routes.get(path)
+        if url is None:
+            return 404, _error_body(f"Unknown endpoint {path}")
+        params = dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+
+        key = cache.request_key(url, params)
+        task = self._inflight.get(key)
+        if task is None:
+            fetch = self._client.fetch_raw(RequestDef(url=url, params=params, model=bytes))
+            task = asyncio.ensure_future(fetch)
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            # A dropped connection must not cancel the fetch the others await
+            return 200, await asyncio.shield(task)
+        except exceptions.HTTPError as e:
+            return e.status_code, e.body or _error_body(str(e))
+        except (exceptions.XSMeteoError, httpx.HTTPError) as e:
+            return 502, _error_body(str(e) or type(e).__name__)
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[bytes, dict[str, str]]:
+        """Read a request line and its headers; ValueError if they exceed the limits."""
+        request_line = await _read_line(reader)
+        headers: dict[str, str] = {}
+        if not request_line:
+            return request_line, headers
+        while (line := await _read_line(reader)) not in (b"\r\n", b"\n", b""):
+            if len(headers) == _MAX_HEADERS:
+                raise ValueError("Too many request headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return request_line, headers
+
+    @staticmethod
+    async def _read_body(
+        reader: asyncio.StreamReader, method: str, headers: dict[str, str]
+    ) -> tuple[int, str] | None:
+        """Consume a request body; return the status and reason if it is rejected."""
+        if "transfer-encoding" in headers:
+            return 400, "Chunked request bodies are not supported"
+        length = headers.get("content-length", "0")
+        if not length.isdigit():
+            return 400, "Malformed Content-Length"
+        if int(length) > _MAX_BODY:
+            return 413, "Request body too large"
+        # Small bodies are read to keep the connection in sync
+        await reader.readexactly(int(length))
+        if method == "GET" and int(length):
+            return 400, "GET requests must not have a body"
+        return None
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: int, body: bytes, *, keep_alive: bool = False
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        writer.write(body)
+        await writer.drain()
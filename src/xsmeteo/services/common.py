@@ -20,3 +20,5 @@ class RequestDef[T]:
     url: str
     params: dict[str, typing.Any]
     model: type[T]
+    # API calls the request counts as; every location of a batch counts
+    weight: int = 1
@@ -6,10 +6,22 @@ This module contains the logic for interacting with the Open-Meteo Elevation API
 
 from __future__ import annotations
 
+import typing
+
 import xsmeteo.core.config as config
 import xsmeteo.models.elevation as models
 from xsmeteo.services.common import RequestDef
 
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Maximum number of coordinates accepted by a single Elevation API call
+MAX_COORDINATES = 100
+
+# Decimal places kept when deduplicating coordinates (~1 m, well below the
+# 90 m resolution of the underlying digital elevation model)
+COORDINATE_PRECISION = 5
+
 
 def get_elevation(
     *,
@@ -43,3 +55,81 @@ def get_elevation(
         params=params,
         model=models.ElevationResponse,
     )
+
+
+def dedupe_coordinates(
+    latitude: Sequence[float],
+    longitude: Sequence[float],
+    *,
+    precision: int = COORDINATE_PRECISION,
+) -> tuple[list[tuple[float, float]], list[int]]:
+    """
+    Collapse duplicate coordinates.
+
+    Parameters
+    ----------
+    latitude : Sequence[float]
+        Latitudes of the input points.
+    longitude : Sequence[float]
+        Longitudes of the input points, aligned to ``latitude``.
+    precision : int, optional
+        Decimal places used to decide whether two points are identical.
+
+    Returns
+    -------
+    tuple[list[tuple[float, float]], list[int]]
+        The unique ``(latitude, longitude)`` pairs in first-seen order and,
+        for every input point, the index of its unique pair.
+
+    Raises
+    ------
+    ValueError
+        If ``latitude`` and ``longitude`` differ in length.
+    """
+    if len(latitude) != len(longitude):
+        raise ValueError("latitude and longitude must have the same length")
+    positions: dict[tuple[float, float], int] = {}
+    inverse: list[int] = []
+    for lat, lon in zip(latitude, longitude, strict=True):
+        key = (round(lat, precision), round(lon, precision))
+        index = positions.get(key)
+        if index is None:
+            index = positions[key] = len(positions)
+        inverse.append(index)
+    return list(positions), inverse
+
+
+def get_elevation_chunks(
+    coordinates: Sequence[tuple[float, float]],
+    *,
+    chunk_size: int = MAX_COORDINATES,
+) -> list[RequestDef[models.ElevationResponse]]:
+    """
+    Prepare API-sized requests covering many coordinates.
+
+    Parameters
+    ----------
+    coordinates : Sequence[tuple[float, float]]
+        ``(latitude, longitude)`` pairs to look up.
+    chunk_size : int, optional
+        Coordinates per request. Defaults to the API limit of 100.
+
+    Returns
+    -------
+    list[RequestDef[ElevationResponse]]
+        One request definition per chunk, in input order.
+
+    Raises
+    ------
+    ValueError
+        If ``chunk_size`` is outside the range accepted by the API.
+    """
+    if not 0 < chunk_size <= MAX_COORDINATES:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_COORDINATES}")
+    return [
+        get_elevation(
+            latitude=[lat for lat, _ in coordinates[start : start + chunk_size]],
+            longitude=[lon for _, lon in coordinates[start : start + chunk_size]],
+        )
+        for start in range(0, len(coordinates), chunk_size)
+    ]
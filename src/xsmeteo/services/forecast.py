@@ -6,10 +6,16 @@ This module contains the logic for interacting with the Open-Meteo Forecast API.
 
 from __future__ import annotations
 
+import datetime
+import zoneinfo
+
 import xsmeteo.core.config as config
 import xsmeteo.models.forecast as models
 from xsmeteo.services.common import RequestDef
 
+# ``current`` conditions are refreshed every 15 minutes on the clock
+CURRENT_INTERVAL_SECONDS = 900
+
 
 def get_forecast(
     *,
@@ -18,6 +24,7 @@ def get_forecast(
     hourly: list[str] | None = None,
     daily: list[str] | None = None,
     current: list[str] | None = None,
+    minutely_15: list[str] | None = None,
     temperature_unit: str | None = None,
     wind_speed_unit: str | None = None,
     precipitation_unit: str | None = None,
@@ -25,6 +32,16 @@ def get_forecast(
     timezone: str | None = None,
     past_days: int | None = None,
     forecast_days: int | None = None,
+    past_hours: int | None = None,
+    forecast_hours: int | None = None,
+    past_minutely_15: int | None = None,
+    forecast_minutely_15: int | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    start_hour: str | None = None,
+    end_hour: str | None = None,
+    start_minutely_15: str | None = None,
+    end_minutely_15: str | None = None,
     models_: list[str] | None = None,  # Renamed from 'models'
 ) -> RequestDef[models.ForecastResponse]:
     """
@@ -42,6 +59,8 @@ def get_forecast(
         List of daily variables (e.g. ["temperature_2m_max"]).
     current : list[str], optional
         List of current weather variables.
+    minutely_15 : list[str], optional
+        List of 15-minutely variables.
     temperature_unit : str, optional
         "celsius" or "fahrenheit".
     wind_speed_unit : str, optional
@@ -56,6 +75,26 @@ def get_forecast(
         Days of past data to include (0-92).
     forecast_days : int, optional
         Days of forecast to return (1-16).
+    past_hours : int, optional
+        Hours of past hourly data, counted back from the current hour.
+    forecast_hours : int, optional
+        Hours of hourly forecast, counted from the current hour.
+    past_minutely_15 : int, optional
+        Past 15-minutely steps, counted back from the current step.
+    forecast_minutely_15 : int, optional
+        15-minutely forecast steps, counted from the current step.
+    start_date : str, optional
+        First date (YYYY-MM-DD); requires ``end_date``.
+    end_date : str, optional
+        Last date (YYYY-MM-DD), inclusive.
+    start_hour : str, optional
+        First hour of hourly data (YYYY-MM-DDTHH:MM); requires ``end_hour``.
+    end_hour : str, optional
+        Last hour of hourly data (YYYY-MM-DDTHH:MM), inclusive.
+    start_minutely_15 : str, optional
+        First step of 15-minutely data (YYYY-MM-DDTHH:MM).
+    end_minutely_15 : str, optional
+        Last step of 15-minutely data (YYYY-MM-DDTHH:MM), inclusive.
     models_ : list[str], optional
         Specific weather models to use.
 
@@ -70,6 +109,7 @@ def get_forecast(
         "hourly": hourly,
         "daily": daily,
         "current": current,
+        "minutely_15": minutely_15,
         "temperature_unit": temperature_unit,
         "wind_speed_unit": wind_speed_unit,
         "precipitation_unit": precipitation_unit,
@@ -77,6 +117,16 @@ def get_forecast(
         "timezone": timezone,
         "past_days": past_days,
         "forecast_days": forecast_days,
+        "past_hours": past_hours,
+        "forecast_hours": forecast_hours,
+        "past_minutely_15": past_minutely_15,
+        "forecast_minutely_15": forecast_minutely_15,
+        "start_date": start_date,
+        "end_date": end_date,
+        "start_hour": start_hour,
+        "end_hour": end_hour,
+        "start_minutely_15": start_minutely_15,
+        "end_minutely_15": end_minutely_15,
         "models": models_,
     }
     return RequestDef(
@@ -84,3 +134,228 @@ def get_forecast(
         params=params,
         model=models.ForecastResponse,
     )
+
+
+def get_forecast_batch(
+    *,
+    latitude: list[float],
+    longitude: list[float],
+    hourly: list[str] | None = None,
+    daily: list[str] | None = None,
+    current: list[str] | None = None,
+    minutely_15: list[str] | None = None,
+    temperature_unit: str | None = None,
+    wind_speed_unit: str | None = None,
+    precipitation_unit: str | None = None,
+    timeformat: str | None = None,
+    timezone: str | None = None,
+    past_days: int | None = None,
+    forecast_days: int | None = None,
+    models_: list[str] | None = None,
+) -> RequestDef[list[models.ForecastResponse]]:
+    """
+    Prepare one request for the forecasts of several locations.
+
+    The API answers a comma-separated list of coordinates with a list of
+    responses in the same order; each location still counts as one call
+    towards the fair-use limits.
+
+    Parameters
+    ----------
+    latitude : list[float]
+        WGS84 Latitudes, at least two.
+    longitude : list[float]
+        WGS84 Longitudes, aligned to ``latitude``.
+    hourly : list[str], optional
+        List of hourly variables.
+    daily : list[str], optional
+        List of daily variables.
+    current : list[str], optional
+        List of current weather variables.
+    minutely_15 : list[str], optional
+        List of 15-minutely variables.
+    temperature_unit : str, optional
+        "celsius" or "fahrenheit".
+    wind_speed_unit : str, optional
+        "kmh", "ms", "mph", or "kn".
+    precipitation_unit : str, optional
+        "mm" or "inch".
+    timeformat : str, optional
+        "iso8601" or "unixtime".
+    timezone : str, optional
+        Timezone identifier or "auto".
+    past_days : int, optional
+        Days of past data to include (0-92).
+    forecast_days : int, optional
+        Days of forecast to return (1-16).
+    models_ : list[str], optional
+        Specific weather models to use.
+
+    Returns
+    -------
+    RequestDef[list[ForecastResponse]]
+        The request definition.
+
+    Raises
+    ------
+    ValueError
+        If the coordinates are not aligned or fewer than two locations are
+        given (a single location is answered with a bare object).
+    """
+    if len(latitude) != len(longitude):
+        raise ValueError("latitude and longitude must have the same length")
+    if len(latitude) < 2:
+        raise ValueError("a batch needs at least two locations; use get_forecast")
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "hourly": hourly,
+        "daily": daily,
+        "current": current,
+        "minutely_15": minutely_15,
+        "temperature_unit": temperature_unit,
+        "wind_speed_unit": wind_speed_unit,
+        "precipitation_unit": precipitation_unit,
+        "timeformat": timeformat,
+        "timezone": timezone,
+        "past_days": past_days,
+        "forecast_days": forecast_days,
+        "models": models_,
+    }
+    return RequestDef(
+        url=config.ENDPOINTS.FORECAST,
+        params=params,
+        model=list[models.ForecastResponse],
+        weight=len(latitude),
+    )
+
+
+def get_current(
+    *,
+    latitude: float,
+    longitude: float,
+    current: list[str],
+    temperature_unit: str | None = None,
+    wind_speed_unit: str | None = None,
+    precipitation_unit: str | None = None,
+    timezone: str | None = None,
+    models_: list[str] | None = None,
+) -> RequestDef[models.CurrentResponse]:
+    """
+    Prepare the smallest request for current conditions.
+
+    Parameters
+    ----------
+    latitude : float
+        WGS84 Latitude (-90 to 90).
+    longitude : float
+        WGS84 Longitude (-180 to 180).
+    current : list[str]
+        List of current weather variables.
+    temperature_unit : str, optional
+        "celsius" or "fahrenheit".
+    wind_speed_unit : str, optional
+        "kmh", "ms", "mph", or "kn".
+    precipitation_unit : str, optional
+        "mm" or "inch".
+    timezone : str, optional
+        Timezone identifier or "auto".
+    models_ : list[str], optional
+        Specific weather models to use.
+
+    Returns
+    -------
+    RequestDef[CurrentResponse]
+        The request definition.
+    """
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": current,
+        "temperature_unit": temperature_unit,
+        "wind_speed_unit": wind_speed_unit,
+        "precipitation_unit": precipitation_unit,
+        "timezone": timezone,
+        "models": models_,
+    }
+    return RequestDef(
+        url=config.ENDPOINTS.FORECAST,
+        params=params,
+        model=models.CurrentResponse,
+    )
+
+
+def forecast_window(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    *,
+    timezone: str = "GMT",
+    resolution: str = "hourly",
+) -> dict[str, str]:
+    """
+    Compute the tightest window parameters covering a time range.
+
+    The result selects only the rows inside ``[start, end]`` (rounded out to
+    the step of the resolution) instead of whole forecast days, and can be
+    passed straight to ``get_forecast``.
+
+    Parameters
+    ----------
+    start : datetime
+        First instant needed. Naive values are local times of ``timezone``.
+    end : datetime
+        Last instant needed. Naive values are local times of ``timezone``.
+    timezone : str, optional
+        The ``timezone`` the request is sent with, "GMT", "UTC" or an IANA
+        name. "auto" is not accepted because the zone is only resolved
+        upstream. Default is "GMT".
+    resolution : str, optional
+        "hourly" or "minutely_15". Default is "hourly".
+
+    Returns
+    -------
+    dict[str, str]
+        ``start_hour``/``end_hour`` or ``start_minutely_15``/``end_minutely_15``.
+
+    Raises
+    ------
+    ValueError
+        If the resolution is unknown, ``end`` precedes ``start`` or the
+        timezone is unknown or "auto".
+
+    Examples
+    --------
+    >>> now = datetime.datetime.now(datetime.UTC)
+    >>> window = forecast_window(now, now + datetime.timedelta(hours=6))
+    >>> get_forecast(latitude=52.52, longitude=13.41, hourly=["temperature_2m"], **window)
+    """
+    steps = {"hourly": 60, "minutely_15": 15}
+    if resolution not in steps:
+        raise ValueError(f"resolution must be one of {list(steps)}, got {resolution!r}")
+    if timezone == "auto":
+        raise ValueError("timezone='auto' is resolved upstream; pass an IANA timezone name")
+    if timezone in ("GMT", "UTC"):
+        zone: datetime.tzinfo = datetime.UTC
+    else:
+        try:
+            zone = zoneinfo.ZoneInfo(timezone)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"unknown timezone {timezone!r}") from e
+
+    def local(value: datetime.datetime) -> datetime.datetime:
+        if value.tzinfo is not None:
+            value = value.astimezone(zone)
+        return value.replace(tzinfo=None)
+
+    first, last = local(start), local(end)
+    if last < first:
+        raise ValueError("end must not precede start")
+    step = datetime.timedelta(minutes=steps[resolution])
+    epoch = datetime.datetime(1970, 1, 1)
+    first = epoch + (first - epoch) // step * step
+    last = epoch + -((epoch - last) // step) * step
+    prefix = "hour" if resolution == "hourly" else "minutely_15"
+    return {
+        f"start_{prefix}": first.isoformat(timespec="minutes"),
+        f"end_{prefix}": last.isoformat(timespec="minutes"),
+    }
@@ -0,0 +1,122 @@
+"""
+Date range planning service module.
+
+This module splits long ``start_date``/``end_date`` windows into chunks that
+can be fetched concurrently, and stitches the chunked responses back into a
+single response.
+"""
+
+from __future__ import annotations
+
+import datetime
+import typing
+
+import msgspec
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from xsmeteo.models.base import BaseStruct
+
+# Sections of a response that carry a time axis and can be concatenated
+TIME_SECTIONS = ("hourly", "daily")
+
+
+def plan_date_ranges(
+    start_date: str,
+    end_date: str,
+    *,
+    chunk: str = "year",
+) -> list[tuple[str, str]]:
+    """
+    Split an inclusive date range into calendar-aligned chunks.
+
+    Parameters
+    ----------
+    start_date : str
+        Start date (YYYY-MM-DD).
+    end_date : str
+        End date (YYYY-MM-DD), inclusive.
+    chunk : str, optional
+        "year" or "month". Default is "year".
+
+    Returns
+    -------
+    list[tuple[str, str]]
+        Consecutive, non-overlapping ``(start_date, end_date)`` pairs covering
+        the whole range.
+
+    Raises
+    ------
+    ValueError
+        If ``chunk`` is unknown or ``end_date`` precedes ``start_date``.
+    """
+    if chunk not in ("year", "month"):
+        raise ValueError(f"chunk must be 'year' or 'month', got {chunk!r}")
+    start = datetime.date.fromisoformat(start_date)
+    end = datetime.date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError("end_date must not precede start_date")
+
+    ranges: list[tuple[str, str]] = []
+    current = start
+    while current <= end:
+        if chunk == "year" or current.month == 12:
+            boundary = datetime.date(current.year + 1, 1, 1)
+        else:
+            boundary = datetime.date(current.year, current.month + 1, 1)
+        last = min(boundary - datetime.timedelta(days=1), end)
+        ranges.append((current.isoformat(), last.isoformat()))
+        current = boundary
+    return ranges
+
+
+def stitch_responses[T: BaseStruct](responses: Sequence[T]) -> T:
+    """
+    Concatenate the time sections of chunked responses.
+
+    Rows are appended in response order; a timestamp already present is
+    skipped, so overlapping chunks yield a deduplicated time axis. Metadata is
+    taken from the first response.
+
+    Parameters
+    ----------
+    responses : Sequence[T]
+        Responses for consecutive date ranges of the same request.
+
+    Returns
+    -------
+    T
+        A single response covering all chunks.
+
+    Raises
+    ------
+    ValueError
+        If ``responses`` is empty.
+    """
+    if not responses:
+        raise ValueError("nothing to stitch")
+    first = responses[0]
+    changes: dict[str, typing.Any] = {}
+    for section in TIME_SECTIONS:
+        parts = [getattr(response, section, None) for response in responses]
+        present = [part for part in parts if part]
+        if not present:
+            continue
+        keys = list(dict.fromkeys(key for part in present for key in part))
+        merged: dict[str, list[typing.Any]] = {key: [] for key in keys}
+        seen: set[typing.Any] = set()
+        for part in present:
+            times = part.get("time", [])
+            fresh = [index for index, value in enumerate(times) if value not in seen]
+            seen.update(times)
+            for key in keys:
+                column = part.get(key)
+                if column is None:
+                    merged[key].extend([None] * len(fresh))
+                elif len(fresh) == len(column):
+                    merged[key].extend(column)
+                else:
+                    merged[key].extend(column[index] for index in fresh)
+        changes[section] = merged
+    return msgspec.structs.replace(first, **changes)
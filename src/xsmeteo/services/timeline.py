@@ -0,0 +1,256 @@
+"""
+Archive and forecast timeline service module.
+
+A window reaching from the past into the future is served by two endpoints:
+the reanalysis archive (complete up to a few days ago) and the forecast API
+(up to 92 past days and 16 forecast days). This module plans the smallest set
+of requests covering a window and merges their responses into one series,
+resolving overlaps by source priority.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import typing
+
+import xsmeteo.models.forecast as forecast_models
+import xsmeteo.services.forecast as forecast_service
+import xsmeteo.services.historical as historical_service
+import xsmeteo.services.ranges as ranges_service
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from xsmeteo.models.base import BaseStruct
+    from xsmeteo.services.common import RequestDef
+
+SOURCES = ("archive", "forecast")
+
+# Days the reanalysis archive typically lags behind today
+ARCHIVE_DELAY_DAYS = 5
+
+# Days the forecast endpoint serves before and from today
+FORECAST_PAST_DAYS = 92
+FORECAST_DAYS = 16
+
+
+@dataclasses.dataclass
+class Segment:
+    """A date range (inclusive) served by one source, with its request."""
+
+    source: str
+    start_date: str
+    end_date: str
+    request_def: RequestDef[typing.Any]
+
+
+def _check_priority(priority: Sequence[str]) -> None:
+    if sorted(priority) != sorted(SOURCES):
+        raise ValueError(f"priority must order {SOURCES}, got {tuple(priority)}")
+
+
+def plan_timeline(
+    *,
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    hourly: list[str] | None = None,
+    daily: list[str] | None = None,
+    timezone: str | None = None,
+    priority: Sequence[str] = SOURCES,
+    chunk: str = "year",
+    today: datetime.date | None = None,
+) -> list[Segment]:
+    """
+    Plan the requests covering a window across archive and forecast.
+
+    The preferred source covers as much of the window as it can and the other
+    source only fills the rest, so no day is requested twice. Long archive
+    ranges are split into calendar chunks that can be fetched concurrently.
+
+    Parameters
+    ----------
+    latitude : float
+        WGS84 Latitude.
+    longitude : float
+        WGS84 Longitude.
+    start_date : str
+        First date of the window (YYYY-MM-DD).
+    end_date : str
+        Last date of the window (YYYY-MM-DD), inclusive.
+    hourly : list[str], optional
+        Hourly variables.
+    daily : list[str], optional
+        Daily variables.
+    timezone : str, optional
+        Timezone for time alignment.
+    priority : Sequence[str], optional
+        Source order, "archive" and "forecast". Default prefers the archive
+        (reanalysis) over the forecast's past days.
+    chunk : str, optional
+        Archive chunk size, "year" or "month". Default is "year".
+    today : date, optional
+        Reference date. Defaults to today.
+
+    Returns
+    -------
+    list[Segment]
+        The planned requests in chronological order.
+
+    Raises
+    ------
+    ValueError
+        If the window is empty, ends beyond the forecast horizon or the
+        priority is invalid.
+    """
+    _check_priority(priority)
+    today = today or datetime.date.today()
+    start = datetime.date.fromisoformat(start_date)
+    end = datetime.date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError("end_date must not precede start_date")
+    horizon = today + datetime.timedelta(days=FORECAST_DAYS - 1)
+    if end > horizon:
+        raise ValueError(f"end_date must not be after {horizon.isoformat()}")
+
+    archive_last = today - datetime.timedelta(days=ARCHIVE_DELAY_DAYS)
+    forecast_first = today - datetime.timedelta(days=FORECAST_PAST_DAYS)
+    if priority[0] == "archive":
+        archive = (start, min(end, archive_last))
+        forecast = (max(start, archive_last + datetime.timedelta(days=1)), end)
+    else:
+        forecast = (max(start, forecast_first), end)
+        archive = (start, min(end, forecast_first - datetime.timedelta(days=1)))
+
+    segments: list[Segment] = []
+    if archive[0] <= archive[1]:
+        for chunk_start, chunk_end in ranges_service.plan_date_ranges(
+            archive[0].isoformat(), archive[1].isoformat(), chunk=chunk
+        ):
+            request_def = historical_service.get_historical(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=chunk_start,
+                end_date=chunk_end,
+                hourly=hourly,
+                daily=daily,
+                timezone=timezone,
+            )
+            segments.append(Segment("archive", chunk_start, chunk_end, request_def))
+    if forecast[0] <= forecast[1]:
+        forecast_def = forecast_service.get_forecast(
+            latitude=latitude,
+            longitude=longitude,
+            hourly=hourly,
+            daily=daily,
+            timezone=timezone,
+            start_date=forecast[0].isoformat(),
+            end_date=forecast[1].isoformat(),
+        )
+        segments.append(
+            Segment("forecast", forecast[0].isoformat(), forecast[1].isoformat(), forecast_def)
+        )
+    return segments
+
+
+def _date_bounds(
+    time: list[typing.Any], start_date: str, end_date: str, utc_offset_seconds: int
+) -> tuple[typing.Any, typing.Any]:
+    """Return inclusive/exclusive time bounds comparable to a time column."""
+    last = datetime.date.fromisoformat(end_date) + datetime.timedelta(days=1)
+    if time and isinstance(time[0], str):
+        return start_date, last.isoformat()
+    epoch = datetime.date(1970, 1, 1)
+    return (
+        (datetime.date.fromisoformat(start_date) - epoch).days * 86400 - utc_offset_seconds,
+        (last - epoch).days * 86400 - utc_offset_seconds,
+    )
+
+
+def merge_sources(
+    parts: Sequence[tuple[str, BaseStruct]],
+    *,
+    start_date: str,
+    end_date: str,
+    priority: Sequence[str] = SOURCES,
+) -> forecast_models.ForecastResponse:
+    """
+    Merge archive and forecast responses into one contiguous series.
+
+    For every timestamp and variable, the first non-null value in priority
+    order wins, so gaps in the preferred source are filled by the other.
+
+    Parameters
+    ----------
+    parts : Sequence[tuple[str, BaseStruct]]
+        ``(source, response)`` pairs, e.g. from the segments of
+        ``plan_timeline``.
+    start_date : str
+        First date to keep (YYYY-MM-DD).
+    end_date : str
+        Last date to keep (YYYY-MM-DD), inclusive.
+    priority : Sequence[str], optional
+        Source order used to resolve overlaps.
+
+    Returns
+    -------
+    ForecastResponse
+        The merged series. Metadata is taken from the highest-priority
+        source.
+
+    Raises
+    ------
+    ValueError
+        If ``parts`` is empty or the priority is invalid.
+    """
+    _check_priority(priority)
+    if not parts:
+        raise ValueError("nothing to merge")
+    rank = {source: index for index, source in enumerate(priority)}
+    ordered = sorted(parts, key=lambda part: rank[part[0]])
+    by_source: dict[str, list[BaseStruct]] = {}
+    for source, response in ordered:
+        by_source.setdefault(source, []).append(response)
+    # Stitch each source's chunks first, then overlay the sources
+    responses = [ranges_service.stitch_responses(chunks) for chunks in by_source.values()]
+    first = responses[0]
+
+    changes: dict[str, typing.Any] = {}
+    for section in ranges_service.TIME_SECTIONS:
+        present = [part for part in (getattr(r, section, None) for r in responses) if part]
+        if not present:
+            continue
+        keys = list(dict.fromkeys(key for part in present for key in part))
+        lo, hi = _date_bounds(
+            present[0].get("time", []),
+            start_date,
+            end_date,
+            getattr(first, "utc_offset_seconds", 0),
+        )
+        rows: dict[typing.Any, dict[str, typing.Any]] = {}
+        for part in present:
+            for index, moment in enumerate(part.get("time", [])):
+                if not lo <= moment < hi:
+                    continue
+                row = rows.setdefault(moment, {})
+                for key in keys:
+                    column = part.get(key)
+                    if row.get(key) is None and column is not None:
+                        row[key] = column[index]
+        times = sorted(rows)
+        merged = {key: [rows[moment].get(key) for moment in times] for key in keys}
+        merged["time"] = times
+        changes[section] = merged
+        units: dict[str, str] = {}
+        for response in reversed(responses):
+            units.update(getattr(response, f"{section}_units", None) or {})
+        changes[f"{section}_units"] = units or None
+
+    fields = {
+        field: getattr(first, field)
+        for field in forecast_models.ForecastResponse.__struct_fields__
+        if hasattr(first, field)
+    }
+    return forecast_models.ForecastResponse(**{**fields, **changes})
@@ -0,0 +1,246 @@
+"""
+Timezone rebasing service module.
+
+Each ``timezone`` value is a separate upstream request and cache entry. When
+requests are fetched once in UTC with Unix timestamps instead, the time axis
+can be re-labelled locally for any IANA zone, DST transitions included.
+"""
+
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import datetime
+import time
+import typing
+import zoneinfo
+
+import msgspec
+
+import xsmeteo.core.timeaxis as timeaxis
+from xsmeteo.models.common import TimeFormat
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from xsmeteo.models.base import BaseStruct
+    from xsmeteo.services.common import RequestDef
+
+# Parameters of the canonical UTC fetch
+UTC_PARAMS = {"timezone": "GMT", "timeformat": TimeFormat.UNIXTIME}
+
+# Sections whose rows can be re-labelled; daily rows are aggregated over
+# UTC days and cannot
+REBASE_SECTIONS = ("hourly", "minutely_15")
+
+# Window parameters given in local time of the requested ``timezone``
+LOCAL_WINDOW_PARAMS = (
+    "start_date",
+    "end_date",
+    "start_hour",
+    "end_hour",
+    "start_minutely_15",
+    "end_minutely_15",
+)
+
+# Windows counted in steps from the current time, per section; they cover the
+# same instants in every zone. Without them, and with ``past_days``, sections
+# span whole local days of the requested zone
+HOUR_WINDOW_PARAMS = {"hourly": "forecast_hours", "minutely_15": "forecast_minutely_15"}
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_DAY = 86400
+
+
+def _zone(timezone: str) -> zoneinfo.ZoneInfo:
+    try:
+        return zoneinfo.ZoneInfo(timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown timezone {timezone!r}") from e
+
+
+def _offset(timestamp: int, zone: zoneinfo.ZoneInfo) -> int:
+    offset = datetime.datetime.fromtimestamp(timestamp, zone).utcoffset()
+    return 0 if offset is None else int(offset.total_seconds())
+
+
+def utc_offsets(timestamps: Sequence[int], timezone: str) -> list[int]:
+    """
+    Return the UTC offset of a zone at each timestamp.
+
+    Offsets are probed once per day and bisected only around transitions,
+    so long series cost O(days) zone lookups rather than O(rows).
+
+    Parameters
+    ----------
+    timestamps : Sequence[int]
+        Ascending UTC Unix seconds.
+    timezone : str
+        IANA timezone name, e.g. "Europe/Berlin".
+
+    Returns
+    -------
+    list[int]
+        Offset in seconds for every timestamp.
+
+    Raises
+    ------
+    ValueError
+        If the timezone is unknown.
+    """
+    zone = _zone(timezone)
+    count = len(timestamps)
+    offsets: list[int] = []
+    start = 0
+    while start < count:
+        offset = _offset(timestamps[start], zone)
+        lo, end = start, count
+        while lo < count - 1:
+            hi = min(bisect.bisect_left(timestamps, timestamps[lo] + _DAY, lo + 1), count - 1)
+            if _offset(timestamps[hi], zone) == offset:
+                lo = hi
+                continue
+            # The first row with another offset lies in (lo, hi]
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _offset(timestamps[mid], zone) == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            end = hi
+            break
+        offsets.extend([offset] * (end - start))
+        start = end
+    return offsets
+
+
+def to_utc_request[T](request_def: RequestDef[T]) -> tuple[RequestDef[T], dict[str, str]]:
+    """
+    Rewrite a request to fetch UTC Unix timestamps.
+
+    Only requests whose rows are the same instants in every zone are
+    rewritten, i.e. ``hourly`` and ``minutely_15`` sections windowed with
+    ``HOUR_WINDOW_PARAMS``. Requests for ``timezone="auto"`` (the zone is only
+    known upstream), with a ``daily`` section (aggregated over upstream days),
+    with a window in ``LOCAL_WINDOW_PARAMS`` or with day-counted windows
+    (``past_days``, ``forecast_days`` or the default window, all counted in
+    local days) are left unchanged: in UTC they would select other rows.
+
+    Parameters
+    ----------
+    request_def : RequestDef[T]
+        The request as built by a service function.
+
+    Returns
+    -------
+    tuple[RequestDef[T], dict[str, str]]
+        The rewritten request and the ``timezone``/``timeformat`` it asked
+        for, ready to pass to ``rebase_response``; an empty dict if the
+        request was left unchanged.
+    """
+    params = request_def.params
+    if "timezone" not in params or "timeformat" not in params:
+        return request_def, {}
+    if params.get("timezone") == "auto" or params.get("daily"):
+        return request_def, {}
+    if any(params.get(name) for name in LOCAL_WINDOW_PARAMS) or params.get("past_days"):
+        return request_def, {}
+    if any(
+        params.get(section) and params.get(window) is None
+        for section, window in HOUR_WINDOW_PARAMS.items()
+    ):
+        return request_def, {}
+    wanted = {
+        "timezone": str(params.get("timezone") or "GMT"),
+        "timeformat": str(params.get("timeformat") or TimeFormat.ISO8601),
+    }
+    rewritten = dataclasses.replace(request_def, params={**params, **UTC_PARAMS})
+    return rewritten, wanted
+
+
+def _labels(timestamps: list[int], offsets: list[int], timeformat: str) -> list[typing.Any]:
+    if timeformat == TimeFormat.UNIXTIME:
+        return timestamps
+    return [
+        (_EPOCH + datetime.timedelta(seconds=moment + offset)).isoformat(timespec="minutes")
+        for moment, offset in zip(timestamps, offsets, strict=True)
+    ]
+
+
+def rebase_response[T: BaseStruct](
+    response: T,
+    timezone: str,
+    *,
+    timeformat: str = TimeFormat.ISO8601,
+) -> T:
+    """
+    Re-label the time axis of a UTC response for another timezone.
+
+    Parameters
+    ----------
+    response : T
+        A response fetched with ``timezone="GMT"`` (any ``timeformat``).
+    timezone : str
+        IANA timezone name, or "GMT"/"UTC".
+    timeformat : str, optional
+        "iso8601" for local wall-clock labels or "unixtime". Default is
+        "iso8601".
+
+    Returns
+    -------
+    T
+        A copy with local ``time`` columns and matching ``timezone``,
+        ``timezone_abbreviation`` and ``utc_offset_seconds`` (taken at the
+        first row). Any ``daily`` section is removed because it was
+        aggregated over UTC days; derive daily values from the rebased
+        hourly rows instead (``xsmeteo.analytics.resample_response``).
+
+    Raises
+    ------
+    ValueError
+        If the response is not in UTC or the timezone is unknown.
+    """
+    if getattr(response, "utc_offset_seconds", 0) != 0:
+        raise ValueError("response must be fetched with timezone='GMT'")
+    zone = _zone(timezone)
+
+    changes: dict[str, typing.Any] = {}
+    reference: int | None = None
+    for section in REBASE_SECTIONS:
+        columns = getattr(response, section, None)
+        if not columns or "time" not in columns:
+            continue
+        utc = timeaxis.to_unix_seconds(columns["time"])
+        if reference is None and utc:
+            reference = utc[0]
+        changes[section] = {
+            **columns,
+            "time": _labels(utc, utc_offsets(utc, timezone), timeformat),
+        }
+        units = getattr(response, f"{section}_units", None)
+        if units is not None:
+            changes[f"{section}_units"] = {**units, "time": str(timeformat)}
+
+    current = getattr(response, "current", None)
+    if current and "time" in current:
+        moment = timeaxis.to_unix_seconds([current["time"]])[0]
+        reference = moment if reference is None else reference
+        changes["current"] = {
+            **current,
+            "time": _labels([moment], [_offset(moment, zone)], timeformat)[0],
+        }
+        units = getattr(response, "current_units", None)
+        if units is not None:
+            changes["current_units"] = {**units, "time": str(timeformat)}
+
+    if getattr(response, "daily", None) is not None:
+        changes["daily"] = None
+        changes["daily_units"] = None
+
+    local = datetime.datetime.fromtimestamp(
+        int(time.time()) if reference is None else reference, zone
+    )
+    changes["timezone"] = timezone
+    changes["timezone_abbreviation"] = local.tzname() or timezone
+    changes["utc_offset_seconds"] = _offset(int(local.timestamp()), zone)
+    return msgspec.structs.replace(response, **changes)
@@ -0,0 +1,231 @@
+"""
+Unit conversion service module.
+
+Every unit the API offers is an affine transform (``scale * value + offset``)
+of a canonical SI unit. Converting locally lets a client fetch each forecast
+once in SI units and serve it in any unit system, instead of sending (and
+caching) one upstream request per unit combination.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+import msgspec
+
+from xsmeteo.models.common import PrecipitationUnit, TemperatureUnit, WindSpeedUnit
+
+if typing.TYPE_CHECKING:
+    from xsmeteo.models.base import BaseStruct
+    from xsmeteo.services.common import RequestDef
+
+# Request parameters that select a unit, with the canonical SI value of each
+CANONICAL_UNITS = {
+    "temperature_unit": TemperatureUnit.CELSIUS,
+    "wind_speed_unit": WindSpeedUnit.MS,
+    "precipitation_unit": PrecipitationUnit.MM,
+}
+
+# Units the API uses when a unit parameter is omitted
+DEFAULT_UNITS = {
+    "temperature_unit": TemperatureUnit.CELSIUS,
+    "wind_speed_unit": WindSpeedUnit.KMH,
+    "precipitation_unit": PrecipitationUnit.MM,
+}
+
+# Sections of a response that carry ``<section>_units``
+UNIT_SECTIONS = ("hourly", "daily", "current", "minutely_15")
+
+
+@dataclasses.dataclass(frozen=True)
+class Unit:
+    """A unit label as reported in ``*_units`` and its affine map from SI."""
+
+    label: str
+    scale: float
+    offset: float = 0.0
+
+
+# Keyed by request parameter, then by unit enum value
+_UNITS: dict[str, dict[str, Unit]] = {
+    "temperature_unit": {
+        TemperatureUnit.CELSIUS: Unit("°C", 1.0),
+        TemperatureUnit.FAHRENHEIT: Unit("°F", 1.8, 32.0),
+    },
+    "wind_speed_unit": {
+        WindSpeedUnit.MS: Unit("m/s", 1.0),
+        WindSpeedUnit.KMH: Unit("km/h", 3.6),
+        WindSpeedUnit.MPH: Unit("mp/h", 3600 / 1609.344),
+        WindSpeedUnit.KN: Unit("kn", 3600 / 1852),
+    },
+    "precipitation_unit": {
+        PrecipitationUnit.MM: Unit("mm", 1.0),
+        PrecipitationUnit.INCH: Unit("inch", 1 / 25.4),
+    },
+}
+
+# Snowfall (cm) and snow depth (m) follow ``precipitation_unit`` as well
+_SNOW_UNITS: dict[str, dict[str, Unit]] = {
+    "snowfall": {
+        PrecipitationUnit.MM: Unit("cm", 1.0),
+        PrecipitationUnit.INCH: Unit("inch", 1 / 2.54),
+    },
+    "snow_depth": {
+        PrecipitationUnit.MM: Unit("m", 1.0),
+        PrecipitationUnit.INCH: Unit("ft", 1 / 0.3048),
+    },
+}
+
+
+def convert_values(values: typing.Any, source: Unit, target: Unit) -> typing.Any:
+    """
+    Convert values between two units of the same quantity.
+
+    Parameters
+    ----------
+    values : list | float | numpy.ndarray
+        Values in ``source`` units. Lists may contain ``None``; arrays and
+        scalars are converted with plain arithmetic (so numpy arrays are
+        converted in one vectorized pass).
+    source : Unit
+        Unit of ``values``.
+    target : Unit
+        Desired unit.
+
+    Returns
+    -------
+    list | float | numpy.ndarray
+        Values in ``target`` units, of the same kind as ``values``.
+    """
+    scale = target.scale / source.scale
+    offset = target.offset - source.offset * scale
+    if isinstance(values, list | tuple):
+        return [
+            value if value is None or isinstance(value, str) else value * scale + offset
+            for value in values
+        ]
+    return values * scale + offset
+
+
+def _units_for(column: str, parameter: str) -> dict[str, Unit]:
+    if parameter == "precipitation_unit":
+        for prefix, units in _SNOW_UNITS.items():
+            if column.startswith(prefix):
+                return units
+    return _UNITS[parameter]
+
+
+def _classify(column: str, label: str) -> tuple[str, Unit] | None:
+    """Return the unit parameter and unit a column's label belongs to."""
+    for parameter in _UNITS:
+        for unit in _units_for(column, parameter).values():
+            if unit.label == label:
+                return parameter, unit
+    return None
+
+
+def convert_response[T: BaseStruct](
+    response: T,
+    *,
+    temperature_unit: str | None = None,
+    wind_speed_unit: str | None = None,
+    precipitation_unit: str | None = None,
+) -> T:
+    """
+    Convert every unit-bearing column of a response.
+
+    Columns are recognised by their ``*_units`` label, and the unit maps are
+    updated to match.
+
+    Parameters
+    ----------
+    response : T
+        A decoded response with ``hourly``/``daily``/``current`` sections.
+    temperature_unit : str, optional
+        Target ``TemperatureUnit``. Unchanged if omitted.
+    wind_speed_unit : str, optional
+        Target ``WindSpeedUnit``. Unchanged if omitted.
+    precipitation_unit : str, optional
+        Target ``PrecipitationUnit``. Unchanged if omitted.
+
+    Returns
+    -------
+    T
+        A converted copy, or ``response`` itself if nothing changes.
+
+    Raises
+    ------
+    ValueError
+        If a target unit is unknown.
+    """
+    targets = {
+        parameter: value
+        for parameter, value in (
+            ("temperature_unit", temperature_unit),
+            ("wind_speed_unit", wind_speed_unit),
+            ("precipitation_unit", precipitation_unit),
+        )
+        if value is not None
+    }
+    for parameter, value in targets.items():
+        if value not in _UNITS[parameter]:
+            raise ValueError(
+                f"unknown {parameter} {value!r}; expected one of {list(_UNITS[parameter])}"
+            )
+
+    changes: dict[str, typing.Any] = {}
+    for section in UNIT_SECTIONS:
+        units: dict[str, str] | None = getattr(response, f"{section}_units", None)
+        columns: dict[str, typing.Any] | None = getattr(response, section, None)
+        if not units or not columns:
+            continue
+        new_units = dict(units)
+        new_columns = dict(columns)
+        for name, label in units.items():
+            found = _classify(name, label)
+            if found is None or found[0] not in targets or name not in columns:
+                continue
+            parameter, source = found
+            target = _units_for(name, parameter)[targets[parameter]]
+            if target == source:
+                continue
+            new_columns[name] = convert_values(columns[name], source, target)
+            new_units[name] = target.label
+        if new_units != units:
+            changes[f"{section}_units"] = new_units
+            changes[section] = new_columns
+    if not changes:
+        return response
+    return msgspec.structs.replace(response, **changes)
+
+
+def canonicalize[T](request_def: RequestDef[T]) -> tuple[RequestDef[T], dict[str, str]]:
+    """
+    Rewrite a request to fetch canonical SI units.
+
+    Every unit variant of a request maps to the same canonical request, so
+    they share one upstream fetch and one cache entry.
+
+    Parameters
+    ----------
+    request_def : RequestDef[T]
+        The request as built by a service function.
+
+    Returns
+    -------
+    tuple[RequestDef[T], dict[str, str]]
+        The canonical request and the units the original request asked for
+        (explicitly or through the API defaults) that differ from the
+        canonical ones, ready to pass to ``convert_response``. Requests to
+        endpoints without unit parameters are returned unchanged.
+    """
+    if not any(parameter in request_def.params for parameter in CANONICAL_UNITS):
+        return request_def, {}
+    wanted: dict[str, str] = {}
+    for parameter, canonical in CANONICAL_UNITS.items():
+        value = str(request_def.params.get(parameter) or DEFAULT_UNITS[parameter])
+        if value != canonical:
+            wanted[parameter] = value
+    params = {**request_def.params, **CANONICAL_UNITS}
+    return dataclasses.replace(request_def, params=params), wanted
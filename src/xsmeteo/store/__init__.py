@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from xsmeteo.store.columnar import ColumnarStore, Scan
+from xsmeteo.store.coverage import CoverageIndex, Gap, location_key
+from xsmeteo.store.elevation import ElevationStore
+from xsmeteo.store.sync import HistoricalSync, TimeSeriesSink
+
+__all__ = [
+    "ColumnarStore",
+    "CoverageIndex",
+    "ElevationStore",
+    "Gap",
+    "HistoricalSync",
+    "Scan",
+    "TimeSeriesSink",
+    "location_key",
+]
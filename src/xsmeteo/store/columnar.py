@@ -0,0 +1,426 @@
+"""
+Columnar time-series store.
+
+Every ``(endpoint, location, section)`` gets its own directory holding an
+``int64`` time index (UTC Unix seconds) and one fixed-width float file per
+variable. Reads go through ``mmap`` and return zero-copy ``memoryview``
+slices, so scanning years of data never loads whole files. Writes of newer
+rows are appended in place; writes touching stored rows (backfills, added
+variables) rewrite the series into a new directory that replaces the old one.
+
+Layout::
+
+    <root>/<endpoint>/<latitude>,<longitude>/<section>/time.i64
+    <root>/<endpoint>/<latitude>,<longitude>/<section>/<variable>.f32
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import dataclasses
+import mmap
+import pathlib
+import shutil
+import typing
+from threading import Lock
+
+import xsmeteo.core.timeaxis as timeaxis
+import xsmeteo.store.coverage as coverage
+
+if typing.TYPE_CHECKING:
+    import datetime
+    import os
+    from collections.abc import Sequence
+
+    import xsmeteo.models.forecast as forecast_models
+    import xsmeteo.models.historical as historical_models
+
+type _Typecode = typing.Literal["f", "d", "q"]
+
+_TIME_FILE = "time.i64"
+_NAN = float("nan")
+
+# Typecode and file suffix per supported value width
+_FORMATS: dict[str, tuple[typing.Literal["f", "d"], str]] = {
+    "float32": ("f", ".f32"),
+    "float64": ("d", ".f64"),
+}
+
+
+@dataclasses.dataclass
+class Scan:
+    """
+    Result of a range scan.
+
+    Attributes
+    ----------
+    time : memoryview
+        UTC Unix seconds (format ``"q"``).
+    columns : dict[str, memoryview]
+        Values per variable (format ``"f"`` or ``"d"``), NaN where missing.
+        All views are zero-copy slices of the memory-mapped files; wrap them
+        with ``numpy.frombuffer`` for vectorized work.
+    """
+
+    time: memoryview
+    columns: dict[str, memoryview]
+
+
+class _Mapping:
+    """Read-only map of a growing file, remapped when the file size changes."""
+
+    def __init__(self, path: pathlib.Path, typecode: _Typecode) -> None:
+        self._path = path
+        self._typecode = typecode
+        self._identity: tuple[int, int] = (-1, -1)
+        self._view: memoryview[typing.Any] = memoryview(b"").cast(typecode)
+
+    def view(self) -> memoryview[typing.Any]:
+        # A rewritten series replaces the file, so the inode changes too
+        stat = self._path.stat() if self._path.exists() else None
+        identity = (0, 0) if stat is None else (stat.st_ino, stat.st_size)
+        if identity != self._identity:
+            size = identity[1]
+            if size == 0:
+                self._view = memoryview(b"").cast(self._typecode)
+            else:
+                with self._path.open("rb") as handle:
+                    mapped = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+                self._view = memoryview(mapped).cast(self._typecode)
+            self._identity = identity
+        return self._view
+
+
+class ColumnarStore:
+    """
+    Memory-mapped columnar store for fetched time series.
+
+    Rows newer than the last stored timestamp are appended; column files are
+    written before the time index, so a crash mid-write never exposes partial
+    rows. Writes that reach back into stored rows are merged: the time index
+    becomes the union of both, and non-null new values replace stored ones.
+    The merged series is written to a staging directory and swapped in, so
+    readers see either the old or the new series.
+
+    The store implements ``TimeSeriesSink`` and can be used directly with
+    ``HistoricalSync``.
+
+    Examples
+    --------
+    >>> store = ColumnarStore("~/.cache/xsmeteo/series")
+    >>> store.write(
+    ...     "forecast",
+    ...     client.get_forecast(latitude=52.52, longitude=13.41, hourly=["temperature_2m"]),
+    ... )
+    >>> scan = store.scan("forecast", 52.52, 13.41, "hourly", ["temperature_2m"], start=since)
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        *,
+        dtype: str = "float32",
+    ) -> None:
+        """
+        Open or create a store.
+
+        Parameters
+        ----------
+        root : str | PathLike
+            Root directory. Created if missing.
+        dtype : str, optional
+            Width of newly created value files: "float32" or "float64".
+            Existing files keep their width. Default is "float32".
+
+        Raises
+        ------
+        ValueError
+            If ``dtype`` is not supported.
+        """
+        if dtype not in _FORMATS:
+            raise ValueError(f"dtype must be one of {sorted(_FORMATS)}, got {dtype!r}")
+        self._root = pathlib.Path(root).expanduser()
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._typecode, self._suffix = _FORMATS[dtype]
+        self._mappings: dict[pathlib.Path, _Mapping] = {}
+        self._lock = Lock()
+
+    def write(
+        self,
+        endpoint: str,
+        response: historical_models.HistoricalResponse | forecast_models.ForecastResponse,
+        *,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        sections: Sequence[str] = ("hourly", "daily"),
+    ) -> int:
+        """
+        Append the time sections of a decoded response.
+
+        Non-numeric columns (e.g. ``sunrise``) are skipped.
+
+        Parameters
+        ----------
+        endpoint : str
+            Namespace of the data, e.g. "forecast" or "historical".
+        response : HistoricalResponse | ForecastResponse
+            The decoded response.
+        latitude : float, optional
+            Location key of the series. Defaults to the grid-cell latitude
+            reported by the response.
+        longitude : float, optional
+            Location key of the series. Defaults to the grid-cell longitude
+            reported by the response.
+        sections : Sequence[str], optional
+            Sections to store. Default is ``("hourly", "daily")``.
+
+        Returns
+        -------
+        int
+            Number of new timestamps across all sections.
+        """
+        appended = 0
+        for section in sections:
+            columns = getattr(response, section, None)
+            if not columns or "time" not in columns:
+                continue
+            appended += self.append_columns(
+                endpoint,
+                response.latitude if latitude is None else latitude,
+                response.longitude if longitude is None else longitude,
+                section,
+                time=timeaxis.to_unix_seconds(columns["time"], response.utc_offset_seconds),
+                columns={key: values for key, values in columns.items() if key != "time"},
+            )
+        return appended
+
+    def append(
+        self,
+        latitude: float,
+        longitude: float,
+        response: historical_models.HistoricalResponse,
+    ) -> None:
+        """Store a historical response under the requested location (``TimeSeriesSink``)."""
+        self.write("historical", response, latitude=latitude, longitude=longitude)
+
+    def append_columns(
+        self,
+        endpoint: str,
+        latitude: float,
+        longitude: float,
+        section: str,
+        *,
+        time: Sequence[int],
+        columns: dict[str, list[float | int | str | None]],
+    ) -> int:
+        """
+        Write raw columns to a series.
+
+        Parameters
+        ----------
+        endpoint : str
+            Namespace of the data.
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        section : str
+            Section name, e.g. "hourly".
+        time : Sequence[int]
+            Ascending UTC Unix seconds.
+        columns : dict[str, list]
+            Values per variable, aligned to ``time``. ``None`` becomes NaN
+            for new rows and keeps the stored value for existing ones.
+
+        Returns
+        -------
+        int
+            Number of new timestamps.
+        """
+        directory = self._directory(endpoint, latitude, longitude, section)
+        with self._lock:
+            self._recover(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            if not time:
+                return 0
+            time_path = directory / _TIME_FILE
+            stored = self._mapping(time_path, "q").view()
+            rows = len(stored)
+            numeric = {
+                name: values
+                for name, values in columns.items()
+                if not any(isinstance(value, str) for value in values)
+            }
+            if rows and time[0] <= stored[-1]:
+                return self._merge(directory, stored.tolist(), time, numeric)
+
+            existing = {path.stem: path for path in directory.iterdir() if path.stem != "time"}
+            for name in dict.fromkeys([*existing, *numeric]):
+                path = existing.get(name, directory / f"{name}{self._suffix}")
+                typecode: typing.Literal["f", "d"] = "d" if path.suffix == ".f64" else "f"
+                self._truncate(path, rows, typecode)
+                values = numeric.get(name)
+                if values is None:
+                    block = array.array(typecode, [_NAN]) * len(time)
+                else:
+                    block = array.array(
+                        typecode, (_NAN if value is None else float(value) for value in values)
+                    )
+                with path.open("ab") as handle:
+                    block.tofile(handle)
+
+            with time_path.open("ab") as handle:
+                array.array("q", time).tofile(handle)
+            return len(time)
+
+    def variables(
+        self, endpoint: str, latitude: float, longitude: float, section: str
+    ) -> list[str]:
+        """List the variables stored for a series."""
+        directory = self._directory(endpoint, latitude, longitude, section)
+        if not directory.exists():
+            return []
+        return sorted(path.stem for path in directory.iterdir() if path.stem != "time")
+
+    def scan(
+        self,
+        endpoint: str,
+        latitude: float,
+        longitude: float,
+        section: str,
+        variables: Sequence[str],
+        *,
+        start: datetime.datetime | int | None = None,
+        end: datetime.datetime | int | None = None,
+    ) -> Scan:
+        """
+        Read a time range without copying.
+
+        Parameters
+        ----------
+        endpoint : str
+            Namespace of the data.
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        section : str
+            Section name, e.g. "hourly".
+        variables : Sequence[str]
+            Variables to read.
+        start : datetime | int, optional
+            Inclusive lower bound (naive datetimes are UTC).
+        end : datetime | int, optional
+            Exclusive upper bound (naive datetimes are UTC).
+
+        Returns
+        -------
+        Scan
+            Zero-copy views of the selected rows.
+
+        Raises
+        ------
+        KeyError
+            If a variable is not stored for the series.
+        """
+        directory = self._directory(endpoint, latitude, longitude, section)
+        with self._lock:
+            self._recover(directory)
+            time = self._mapping(directory / _TIME_FILE, "q").view()
+            rows = len(time)
+            lo = 0 if start is None else bisect.bisect_left(time, timeaxis.to_unix_second(start))
+            hi = rows if end is None else bisect.bisect_left(time, timeaxis.to_unix_second(end))
+            hi = max(lo, hi)
+            columns = {}
+            for name in variables:
+                path = self._column_path(directory, name)
+                view = self._mapping(path, "d" if path.suffix == ".f64" else "f").view()
+                columns[name] = view[lo:hi]
+            return Scan(time=time[lo:hi], columns=columns)
+
+    def _merge(
+        self,
+        directory: pathlib.Path,
+        stored: list[int],
+        time: Sequence[int],
+        columns: dict[str, list[float | int | str | None]],
+    ) -> int:
+        """Rewrite a series with rows merged in anywhere on its time axis."""
+        merged_time = sorted(set(stored).union(time))
+        position = {value: index for index, value in enumerate(merged_time)}
+        stored_rows = [position[value] for value in stored]
+        new_rows = [position[value] for value in time]
+
+        staging = directory.with_name(f"{directory.name}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        existing = {path.stem: path for path in directory.iterdir() if path.stem != "time"}
+        for name in dict.fromkeys([*existing, *columns]):
+            path = existing.get(name, directory / f"{name}{self._suffix}")
+            typecode: typing.Literal["f", "d"] = "d" if path.suffix == ".f64" else "f"
+            values = array.array(typecode, [_NAN]) * len(merged_time)
+            if name in existing:
+                self._truncate(path, len(stored), typecode)
+                old = array.array(typecode)
+                old.frombytes(path.read_bytes())
+                for row, value in zip(stored_rows, old, strict=True):
+                    values[row] = value
+            for row, new in zip(new_rows, columns.get(name, ()), strict=False):
+                if new is not None:
+                    values[row] = float(new)
+            with (staging / path.name).open("wb") as handle:
+                values.tofile(handle)
+        with (staging / _TIME_FILE).open("wb") as handle:
+            array.array("q", merged_time).tofile(handle)
+
+        backup = directory.with_name(f"{directory.name}.old")
+        directory.rename(backup)
+        staging.rename(directory)
+        shutil.rmtree(backup)
+        return len(merged_time) - len(stored)
+
+    @staticmethod
+    def _recover(directory: pathlib.Path) -> None:
+        """Finish or roll back a rewrite interrupted by a crash."""
+        backup = directory.with_name(f"{directory.name}.old")
+        if backup.exists():
+            if directory.exists():
+                shutil.rmtree(backup)
+            else:
+                backup.rename(directory)
+        shutil.rmtree(directory.with_name(f"{directory.name}.tmp"), ignore_errors=True)
+
+    def _column_path(self, directory: pathlib.Path, name: str) -> pathlib.Path:
+        for _, suffix in _FORMATS.values():
+            path = directory / f"{name}{suffix}"
+            if path.exists():
+                return path
+        raise KeyError(name)
+
+    def _directory(
+        self, endpoint: str, latitude: float, longitude: float, section: str
+    ) -> pathlib.Path:
+        return self._root / endpoint / coverage.location_key(latitude, longitude) / section
+
+    def _mapping(self, path: pathlib.Path, typecode: _Typecode) -> _Mapping:
+        mapping = self._mappings.get(path)
+        if mapping is None:
+            mapping = self._mappings[path] = _Mapping(path, typecode)
+        return mapping
+
+    @staticmethod
+    def _truncate(path: pathlib.Path, rows: int, typecode: typing.Literal["f", "d"]) -> None:
+        """Bring a column to exactly ``rows`` values (pad with NaN or drop a torn write)."""
+        width = array.array(typecode).itemsize
+        size = path.stat().st_size if path.exists() else 0
+        if size == rows * width:
+            return
+        if size > rows * width:
+            with path.open("r+b") as handle:
+                handle.truncate(rows * width)
+            return
+        missing = rows - size // width
+        with path.open("ab") as handle:
+            handle.truncate(size // width * width)
+            (array.array(typecode, [_NAN]) * missing).tofile(handle)
@@ -0,0 +1,220 @@
+"""
+Coverage bookkeeping for locally stored time series.
+
+Records which ``(location, variable, date range)`` tuples are already held
+locally and computes the gaps that still need to be fetched.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import itertools
+import os
+import pathlib
+import typing
+from threading import Lock
+
+import msgspec
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Decimal places used to identify a location (~11 m)
+LOCATION_PRECISION = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class Gap:
+    """A date range (inclusive) missing for a set of variables."""
+
+    start_date: str
+    end_date: str
+    variables: tuple[str, ...]
+
+
+def location_key(latitude: float, longitude: float) -> str:
+    """Return the canonical key identifying a location."""
+    return f"{latitude:.{LOCATION_PRECISION}f},{longitude:.{LOCATION_PRECISION}f}"
+
+
+def _merge(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _ordinal(value: str) -> int:
+    return datetime.date.fromisoformat(value).toordinal()
+
+
+def _iso(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).isoformat()
+
+
+class CoverageIndex:
+    """
+    Per-location, per-variable record of stored date ranges.
+
+    The index is kept in memory and persisted as JSON when a path is given.
+    Writes are atomic (write to a temporary file, then rename).
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        """
+        Load or create an index.
+
+        Parameters
+        ----------
+        path : str | PathLike, optional
+            JSON file backing the index. Loaded if it exists.
+        """
+        self._path = None if path is None else pathlib.Path(path).expanduser()
+        self._intervals: dict[str, dict[str, list[tuple[int, int]]]] = {}
+        self._lock = Lock()
+        if self._path is not None and self._path.exists():
+            raw = msgspec.json.decode(
+                self._path.read_bytes(), type=dict[str, dict[str, list[tuple[str, str]]]]
+            )
+            self._intervals = {
+                location: {
+                    variable: [(_ordinal(start), _ordinal(end)) for start, end in ranges]
+                    for variable, ranges in variables.items()
+                }
+                for location, variables in raw.items()
+            }
+
+    def covered(self, location: str, variable: str) -> list[tuple[str, str]]:
+        """
+        Return the stored date ranges of a variable.
+
+        Parameters
+        ----------
+        location : str
+            Key from ``location_key``.
+        variable : str
+            Variable name.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            Merged, sorted ``(start_date, end_date)`` pairs (inclusive).
+        """
+        with self._lock:
+            ranges = self._intervals.get(location, {}).get(variable, [])
+            return [(_iso(start), _iso(end)) for start, end in ranges]
+
+    def add(self, location: str, variables: Iterable[str], start_date: str, end_date: str) -> None:
+        """
+        Mark a date range as stored for some variables.
+
+        Parameters
+        ----------
+        location : str
+            Key from ``location_key``.
+        variables : Iterable[str]
+            Variables now stored for the range.
+        start_date : str
+            First stored date (YYYY-MM-DD).
+        end_date : str
+            Last stored date (YYYY-MM-DD), inclusive.
+        """
+        interval = (_ordinal(start_date), _ordinal(end_date))
+        with self._lock:
+            stored = self._intervals.setdefault(location, {})
+            for variable in variables:
+                stored[variable] = _merge([*stored.get(variable, []), interval])
+
+    def gaps(
+        self,
+        location: str,
+        variables: Iterable[str],
+        start_date: str,
+        end_date: str,
+    ) -> list[Gap]:
+        """
+        Compute the missing parts of a requested range.
+
+        Adjacent missing days needing the same variables are grouped, so each
+        returned gap maps to a single request.
+
+        Parameters
+        ----------
+        location : str
+            Key from ``location_key``.
+        variables : Iterable[str]
+            Variables that should be stored.
+        start_date : str
+            First requested date (YYYY-MM-DD).
+        end_date : str
+            Last requested date (YYYY-MM-DD), inclusive.
+
+        Returns
+        -------
+        list[Gap]
+            Missing ranges in chronological order.
+        """
+        first, last = _ordinal(start_date), _ordinal(end_date)
+        names = list(dict.fromkeys(variables))
+        with self._lock:
+            stored = self._intervals.get(location, {})
+            missing = {name: self._missing(stored.get(name, []), first, last) for name in names}
+
+        # Split the requested range at every boundary of a missing interval
+        cuts = {first, last + 1}
+        for intervals in missing.values():
+            for start, end in intervals:
+                cuts.update((start, end + 1))
+        bounds = sorted(cut for cut in cuts if first <= cut <= last + 1)
+
+        gaps: list[Gap] = []
+        for start, stop in itertools.pairwise(bounds):
+            needed = tuple(
+                name
+                for name in names
+                if any(lo <= start and stop - 1 <= hi for lo, hi in missing[name])
+            )
+            if not needed:
+                continue
+            if gaps and gaps[-1].variables == needed and _ordinal(gaps[-1].end_date) + 1 == start:
+                gaps[-1] = dataclasses.replace(gaps[-1], end_date=_iso(stop - 1))
+            else:
+                gaps.append(Gap(_iso(start), _iso(stop - 1), needed))
+        return gaps
+
+    def save(self) -> None:
+        """Persist the index if it is backed by a file."""
+        if self._path is None:
+            return
+        with self._lock:
+            raw = {
+                location: {
+                    variable: [(_iso(start), _iso(end)) for start, end in ranges]
+                    for variable, ranges in variables.items()
+                }
+                for location, variables in self._intervals.items()
+            }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._path.with_suffix(self._path.suffix + ".tmp")
+        temporary.write_bytes(msgspec.json.encode(raw))
+        os.replace(temporary, self._path)
+
+    @staticmethod
+    def _missing(stored: list[tuple[int, int]], first: int, last: int) -> list[tuple[int, int]]:
+        missing = []
+        cursor = first
+        for start, end in stored:
+            if end < cursor:
+                continue
+            if start > last:
+                break
+            if start > cursor:
+                missing.append((cursor, start - 1))
+            cursor = max(cursor, end + 1)
+        if cursor <= last:
+            missing.append((cursor, last))
+        return missing
@@ -0,0 +1,237 @@
+"""
+Offline elevation store.
+
+Elevations resolved through the API are written into a tiled grid of
+memory-mapped ``float32`` files so repeat lookups never leave the host.
+"""
+
+from __future__ import annotations
+
+import array
+import math
+import mmap
+import pathlib
+import typing
+from threading import Lock
+
+if typing.TYPE_CHECKING:
+    import os
+    from typing import BinaryIO
+
+# Grid spacing matching the 3 arc-second (~90 m) DEM served by the API
+DEFAULT_RESOLUTION = 1 / 1200
+
+# Every tile spans one degree of latitude and longitude
+TILE_DEGREES = 1.0
+
+_MISSING = float("nan")
+
+
+class _Tile:
+    """One memory-mapped tile of ``size x size`` grid nodes."""
+
+    def __init__(self, size: int, path: pathlib.Path | None) -> None:
+        nbytes = size * size * 4
+        self._file: BinaryIO | None = None
+        if path is None:
+            self._mmap = mmap.mmap(-1, nbytes)
+            self._mmap[:] = (array.array("f", [_MISSING]) * (size * size)).tobytes()
+        else:
+            exists = path.exists()
+            self._file = path.open("r+b" if exists else "w+b")
+            if not exists:
+                self._file.write((array.array("f", [_MISSING]) * (size * size)).tobytes())
+                self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), nbytes)
+        self.values = memoryview(self._mmap).cast("f")
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    def close(self) -> None:
+        self.values.release()
+        self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class ElevationStore:
+    """
+    Local spatial index of elevations on a regular latitude/longitude grid.
+
+    The grid is split into one-degree tiles, each backed by a memory-mapped
+    file (or anonymous memory when no path is given). Values are stored at
+    the grid node nearest to the looked-up coordinate.
+
+    The store implements the ``Cache`` interface for coordinate keys, so it
+    can be passed as ``elevation_cache`` to either client; ``get_elevation_bulk``
+    then only calls the API for points the store cannot answer.
+
+    Examples
+    --------
+    >>> store = ElevationStore("~/.cache/xsmeteo/elevation", interpolate=True)
+    >>> with XSMeteo(elevation_cache=store) as client:
+    ...     elevations = client.get_elevation_bulk(latitude=lats, longitude=lons)
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        resolution: float = DEFAULT_RESOLUTION,
+        tolerance: float | None = None,
+        interpolate: bool = False,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Parameters
+        ----------
+        path : str | PathLike, optional
+            Directory holding the tile files. Created if missing. When omitted
+            the store lives in anonymous memory only.
+        resolution : float, optional
+            Grid spacing in degrees. Must divide one degree evenly.
+            Default is 3 arc-seconds.
+        tolerance : float, optional
+            Maximum distance in degrees (per axis) between a query and the
+            populated node answering it. Defaults to half the resolution, so
+            every query within a grid cell is answered by its nearest node.
+        interpolate : bool, optional
+            Answer queries by bilinear interpolation when all four surrounding
+            nodes are populated. Default is False.
+
+        Raises
+        ------
+        ValueError
+            If ``resolution`` does not divide one degree evenly.
+        """
+        size = round(TILE_DEGREES / resolution)
+        if size < 1 or not math.isclose(size * resolution, TILE_DEGREES):
+            raise ValueError("resolution must divide one degree evenly")
+        self._size = size
+        self._resolution = resolution
+        self._tolerance = resolution / 2 if tolerance is None else tolerance
+        self._interpolate = interpolate
+        self._path = None if path is None else pathlib.Path(path).expanduser()
+        if self._path is not None:
+            self._path.mkdir(parents=True, exist_ok=True)
+        self._tiles: dict[tuple[int, int], _Tile] = {}
+        self._lock = Lock()
+
+    def __enter__(self) -> ElevationStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: typing.Any,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Flush and unmap all open tiles."""
+        with self._lock:
+            for tile in self._tiles.values():
+                tile.flush()
+                tile.close()
+            self._tiles.clear()
+
+    def flush(self) -> None:
+        """Write pending changes of all open tiles to disk."""
+        with self._lock:
+            for tile in self._tiles.values():
+                tile.flush()
+
+    def get(self, key: tuple[float, float]) -> float | None:
+        """
+        Look up the elevation at a coordinate.
+
+        Parameters
+        ----------
+        key : tuple[float, float]
+            ``(latitude, longitude)`` of the point.
+
+        Returns
+        -------
+        float | None
+            The elevation in meters, or ``None`` if the store cannot answer.
+        """
+        latitude, longitude = key
+        y = latitude / self._resolution
+        x = longitude / self._resolution
+
+        if self._interpolate:
+            row, col = math.floor(y), math.floor(x)
+            corners = (
+                self._node(row, col, create=False),
+                self._node(row, col + 1, create=False),
+                self._node(row + 1, col, create=False),
+                self._node(row + 1, col + 1, create=False),
+            )
+            if not any(math.isnan(value) for value in corners):
+                fy, fx = y - row, x - col
+                south = corners[0] * (1 - fx) + corners[1] * fx
+                north = corners[2] * (1 - fx) + corners[3] * fx
+                return south * (1 - fy) + north * fy
+
+        row, col = round(y), round(x)
+        limit = self._tolerance + 1e-12
+        if (
+            abs(latitude - row * self._resolution) > limit
+            or abs(longitude - col * self._resolution) > limit
+        ):
+            return None
+        value = self._node(row, col, create=False)
+        return None if math.isnan(value) else value
+
+    def set(self, key: tuple[float, float], value: float, ttl: float | None = None) -> None:
+        """
+        Store the elevation at a coordinate.
+
+        Parameters
+        ----------
+        key : tuple[float, float]
+            ``(latitude, longitude)`` of the point.
+        value : float
+            Elevation in meters.
+        ttl : float, optional
+            Ignored; terrain does not change.
+        """
+        latitude, longitude = key
+        row = round(latitude / self._resolution)
+        col = round(longitude / self._resolution)
+        tile, offset = self._locate(row, col, create=True)
+        if tile is not None:
+            tile.values[offset] = value
+
+    def _node(self, row: int, col: int, *, create: bool) -> float:
+        tile, offset = self._locate(row, col, create=create)
+        return _MISSING if tile is None else tile.values[offset]
+
+    def _locate(self, row: int, col: int, *, create: bool) -> tuple[_Tile | None, int]:
+        tile_row, local_row = divmod(row, self._size)
+        tile_col, local_col = divmod(col, self._size)
+        return (
+            self._tile(tile_row, tile_col, create=create),
+            local_row * self._size + local_col,
+        )
+
+    def _tile(self, tile_row: int, tile_col: int, *, create: bool) -> _Tile | None:
+        tile = self._tiles.get((tile_row, tile_col))
+        if tile is not None:
+            return tile
+        with self._lock:
+            tile = self._tiles.get((tile_row, tile_col))
+            if tile is not None:
+                return tile
+            path = None
+            if self._path is not None:
+                path = self._path / f"{tile_row}_{tile_col}_{self._size}.f32"
+                if not create and not path.exists():
+                    return None
+            elif not create:
+                return None
+            tile = self._tiles[(tile_row, tile_col)] = _Tile(self._size, path)
+            return tile
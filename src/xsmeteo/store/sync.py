@@ -0,0 +1,294 @@
+"""
+Incremental historical sync.
+
+Fetches only the parts of a historical window that are not stored locally
+yet, hands them to a sink and records the new coverage. A daily job then
+costs O(new days) instead of O(history).
+"""
+
+from __future__ import annotations
+
+import datetime
+import typing
+
+import xsmeteo.core.timeaxis as timeaxis
+import xsmeteo.services.timeline as timeline_service
+import xsmeteo.store.coverage as coverage
+
+if typing.TYPE_CHECKING:
+    import xsmeteo.models.historical as historical_models
+    from xsmeteo.client.async_client import AsyncXSMeteo
+    from xsmeteo.client.sync_client import XSMeteo
+
+ARCHIVE_DELAY_DAYS = timeline_service.ARCHIVE_DELAY_DAYS
+
+
+class TimeSeriesSink(typing.Protocol):
+    """Destination for synced data."""
+
+    def append(
+        self,
+        latitude: float,
+        longitude: float,
+        response: historical_models.HistoricalResponse,
+    ) -> None:
+        """Store the hourly/daily sections of ``response`` for a location."""
+        ...
+
+
+class HistoricalSync:
+    """
+    Keep a local copy of historical data up to date with minimal requests.
+
+    Examples
+    --------
+    >>> sync = HistoricalSync(sink, CoverageIndex("coverage.json"), hourly=["temperature_2m"])
+    >>> with XSMeteo() as client:
+    ...     sync.sync(client, latitude=52.52, longitude=13.41, start_date="2000-01-01")
+    """
+
+    def __init__(
+        self,
+        sink: TimeSeriesSink,
+        index: coverage.CoverageIndex,
+        *,
+        hourly: list[str] | None = None,
+        daily: list[str] | None = None,
+        timezone: str | None = None,
+        chunk: str = "year",
+        concurrency: int = 4,
+        retries: int = 2,
+    ) -> None:
+        """
+        Initialize the sync.
+
+        Parameters
+        ----------
+        sink : TimeSeriesSink
+            Store receiving newly fetched data.
+        index : CoverageIndex
+            Record of what the sink already holds.
+        hourly : list[str], optional
+            Hourly variables to keep in sync.
+        daily : list[str], optional
+            Daily variables to keep in sync.
+        timezone : str, optional
+            Timezone for time alignment; must not change between runs.
+        chunk : str, optional
+            Chunk size used for large gaps, "year" or "month".
+        concurrency : int, optional
+            Maximum number of chunks in flight. Default is 4.
+        retries : int, optional
+            Retries per failing chunk. Default is 2.
+
+        Raises
+        ------
+        ValueError
+            If neither hourly nor daily variables are given.
+        """
+        if not hourly and not daily:
+            raise ValueError("at least one hourly or daily variable is required")
+        self._sink = sink
+        self._index = index
+        self._hourly = hourly or []
+        self._daily = daily or []
+        self._timezone = timezone
+        self._chunk = chunk
+        self._concurrency = concurrency
+        self._retries = retries
+
+    def plan(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str | None = None,
+    ) -> list[coverage.Gap]:
+        """
+        Compute the gaps a sync would fetch, without fetching.
+
+        Parameters
+        ----------
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        start_date : str
+            First date that should be stored (YYYY-MM-DD).
+        end_date : str, optional
+            Last date that should be stored. Defaults to the most recent day
+            the archive is expected to hold.
+
+        Returns
+        -------
+        list[Gap]
+            Missing ranges with the variables to fetch for each.
+        """
+        if end_date is None:
+            latest = datetime.date.today() - datetime.timedelta(days=ARCHIVE_DELAY_DAYS)
+            end_date = latest.isoformat()
+        if end_date < start_date:
+            return []
+        return self._index.gaps(
+            coverage.location_key(latitude, longitude),
+            self._variables(),
+            start_date,
+            end_date,
+        )
+
+    def sync(
+        self,
+        client: XSMeteo,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str | None = None,
+    ) -> list[coverage.Gap]:
+        """
+        Fetch and store the missing parts of a window.
+
+        Coverage is recorded and saved after each gap, so an interrupted sync
+        resumes where it stopped. Trailing days the archive returned without
+        data are not recorded, so the next sync fetches them again.
+
+        Parameters
+        ----------
+        client : XSMeteo
+            The client used to fetch the data.
+        latitude : float
+            WGS84 Latitude.
+        longitude : float
+            WGS84 Longitude.
+        start_date : str
+            First date that should be stored (YYYY-MM-DD).
+        end_date : str, optional
+            Last date that should be stored. See ``plan``.
+
+        Returns
+        -------
+        list[Gap]
+            The gaps that were filled.
+        """
+        gaps = self.plan(
+            latitude=latitude, longitude=longitude, start_date=start_date, end_date=end_date
+        )
+        for gap in gaps:
+            hourly, daily = self._selection(gap)
+            response = client.get_historical_range(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=gap.start_date,
+                end_date=gap.end_date,
+                hourly=hourly,
+                daily=daily,
+                timezone=self._timezone,
+                chunk=self._chunk,
+                concurrency=self._concurrency,
+                retries=self._retries,
+            )
+            self._commit(latitude, longitude, gap, response)
+        return gaps
+
+    async def sync_async(
+        self,
+        client: AsyncXSMeteo,
+        *,
+        latitude: float,
+        longitude: float,
+        start_date: str,
+        end_date: str | None = None,
+    ) -> list[coverage.Gap]:
+        """
+        Fetch and store the missing parts of a window.
+
+        Asynchronous counterpart of ``sync`` with the same parameters.
+
+        Returns
+        -------
+        list[Gap]
+            The gaps that were filled.
+        """
+        gaps = self.plan(
+            latitude=latitude, longitude=longitude, start_date=start_date, end_date=end_date
+        )
+        for gap in gaps:
+            hourly, daily = self._selection(gap)
+            response = await client.get_historical_range(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=gap.start_date,
+                end_date=gap.end_date,
+                hourly=hourly,
+                daily=daily,
+                timezone=self._timezone,
+                chunk=self._chunk,
+                concurrency=self._concurrency,
+                retries=self._retries,
+            )
+            self._commit(latitude, longitude, gap, response)
+        return gaps
+
+    def _variables(self) -> list[str]:
+        return [f"hourly:{name}" for name in self._hourly] + [
+            f"daily:{name}" for name in self._daily
+        ]
+
+    @staticmethod
+    def _selection(gap: coverage.Gap) -> tuple[list[str] | None, list[str] | None]:
+        hourly = [name.partition(":")[2] for name in gap.variables if name.startswith("hourly:")]
+        daily = [name.partition(":")[2] for name in gap.variables if name.startswith("daily:")]
+        return hourly or None, daily or None
+
+    def _commit(
+        self,
+        latitude: float,
+        longitude: float,
+        gap: coverage.Gap,
+        response: historical_models.HistoricalResponse,
+    ) -> None:
+        self._sink.append(latitude, longitude, response)
+        # Days the archive has not filled yet come back as nulls; recent ones
+        # stay uncovered so the next sync fetches them again. Nulls older than
+        # the archive delay are final (the variable does not exist there), so
+        # refetching them would never fill anything
+        settled = datetime.date.today() - datetime.timedelta(days=ARCHIVE_DELAY_DAYS + 1)
+        ends: dict[str, list[str]] = {}
+        for variable in gap.variables:
+            last = max(_last_filled_day(response, variable) or "", settled.isoformat())
+            if last >= gap.start_date:
+                ends.setdefault(min(last, gap.end_date), []).append(variable)
+        for end_date, variables in ends.items():
+            self._index.add(
+                coverage.location_key(latitude, longitude), variables, gap.start_date, end_date
+            )
+        self._index.save()
+
+
+def _last_filled_day(response: historical_models.HistoricalResponse, variable: str) -> str | None:
+    """
+    Return the last local day up to which ``variable`` holds data.
+
+    A day whose last values are null is incomplete, so it ends the range
+    the day before.
+    """
+    section, _, name = variable.partition(":")
+    columns = getattr(response, section, None) or {}
+    times = columns.get("time") or []
+    values = columns.get(name) or []
+    last = next((i for i in range(len(values) - 1, -1, -1) if values[i] is not None), None)
+    if last is None:
+        return None
+    day = _local_day(times[last], response.utc_offset_seconds)
+    if last + 1 < len(times) and _local_day(times[last + 1], response.utc_offset_seconds) == day:
+        return (datetime.date.fromisoformat(day) - datetime.timedelta(days=1)).isoformat()
+    return day
+
+
+def _local_day(value: float | int | str | None, utc_offset_seconds: int) -> str:
+    if isinstance(value, str):
+        return value[:10]
+    (timestamp,) = timeaxis.to_unix_seconds([value])
+    local = datetime.datetime.fromtimestamp(timestamp + utc_offset_seconds, tz=datetime.UTC)
+    return local.date().isoformat()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.alerts import (  # noqa: E402
+    AlertRule,
+    evaluate_rule,
+    evaluate_rules,
+    stack_locations,
+)
+from xsmeteo.models.forecast import ForecastResponse  # noqa: E402
+
+HOUR = 3600
+
+
+def _forecast(gusts: list[float | None], *, start: int = 0) -> ForecastResponse:
+    return ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly={
+            "time": [start + HOUR * step for step in range(len(gusts))],
+            "wind_gusts_10m": gusts,
+        },
+    )
+
+
+def test_threshold_rule_reports_first_onset() -> None:
+    # Arrange
+    responses = [
+        _forecast([10.0, 90.0, 95.0, 20.0]),
+        _forecast([10.0, 20.0, None, 30.0]),
+        _forecast([85.0, 10.0, 10.0, 81.0]),
+    ]
+    rule = AlertRule("gusts", "wind_gusts_10m", ">", 80.0)
+
+    # Act
+    matches = evaluate_rules([rule], responses)["gusts"]
+
+    # Assert
+    assert matches.index.tolist() == [0, 2]
+    assert matches.onset.tolist() == [HOUR, 0]
+    assert matches.value.tolist() == [90.0, 85.0]
+
+
+def test_duration_and_within_limit_onsets() -> None:
+    time_axis = np.arange(6, dtype=np.int64) * HOUR
+    values = np.array(
+        [
+            [60.0, 10.0, 10.0, 60.0, 60.0, 60.0],
+            [60.0, 10.0, 60.0, 10.0, 60.0, 10.0],
+        ]
+    )
+
+    sustained = evaluate_rule(AlertRule("pm25", "pm2_5", ">", 50.0, duration=3), time_axis, values)
+    soon = evaluate_rule(
+        AlertRule("pm25", "pm2_5", ">", 50.0, within=2), time_axis, values, now=HOUR
+    )
+
+    assert sustained.index.tolist() == [0]
+    assert sustained.onset.tolist() == [3 * HOUR]
+    assert soon.index.tolist() == [1]
+    assert soon.onset.tolist() == [2 * HOUR]
+
+
+def test_windowed_aggregate_rule() -> None:
+    time_axis = np.arange(5, dtype=np.int64) * HOUR
+    values = np.array([[5.0, 10.0, np.nan, 20.0, 0.0], [5.0, 5.0, 5.0, 5.0, 5.0]])
+
+    matches = evaluate_rule(
+        AlertRule("rain", "precipitation", ">=", 30.0, window=3, aggregate="sum"),
+        time_axis,
+        values,
+    )
+
+    # The onset is the start of the window [1, 3] whose sum triggers
+    assert matches.index.tolist() == [0]
+    assert matches.onset.tolist() == [HOUR]
+    assert matches.value.tolist() == [30.0]
+
+
+def test_windowed_duration_rule_onset_starts_the_first_window() -> None:
+    time_axis = np.arange(6, dtype=np.int64) * HOUR
+    values = np.array([[0.0, 0.0, 20.0, 20.0, 20.0, 0.0]])
+
+    matches = evaluate_rule(
+        AlertRule("rain", "precipitation", ">=", 20.0, window=2, aggregate="min", duration=2),
+        time_axis,
+        values,
+    )
+
+    # Windows ending at 3 and 4 hold; the first of them covers [2, 3]
+    assert matches.onset.tolist() == [2 * HOUR]
+    assert matches.value.tolist() == [20.0]
+
+
+def test_invalid_rule_and_misaligned_responses() -> None:
+    with pytest.raises(ValueError, match="operator"):
+        AlertRule("bad", "x", "==", 1.0)
+    with pytest.raises(ValueError, match="time axis"):
+        stack_locations([_forecast([1.0]), _forecast([1.0, 2.0])], ["wind_gusts_10m"])
+    with pytest.raises(ValueError, match="time axis"):
+        stack_locations(
+            [_forecast([1.0, 2.0]), _forecast([1.0, 2.0], start=HOUR)], ["wind_gusts_10m"]
+        )
+
+
+@pytest.mark.benchmark
+def test_rules_scale_to_many_locations() -> None:
+    # Arrange: decoded responses, so stacking and evaluation are both timed
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0.0, 100.0, size=(10_000, 48))
+    responses = [_forecast(row.tolist()) for row in values]
+    rule = AlertRule("gusts", "wind_gusts_10m", ">", 80.0, duration=2, within=24)
+
+    # Act
+    started = time.perf_counter()
+    matches = evaluate_rules([rule], responses, now=0)["gusts"]
+    elapsed = time.perf_counter() - started
+
+    # Assert: a generous bound, a per-location loop takes far longer
+    assert matches.index.size > 0
+    assert elapsed < 5.0
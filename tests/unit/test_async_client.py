@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, cast
 from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 
-from xsmeteo.client.async_client import AsyncXSMeteo
+from xsmeteo.client.async_client import AsyncXSMeteo, stream_calls
+from xsmeteo.core import config
+from xsmeteo.core.cache import MemoryCache
 from xsmeteo.exceptions import DecodeError, HTTPError
 from xsmeteo.models.forecast import ForecastResponse
 from xsmeteo.models.historical import HistoricalResponse
+from xsmeteo.services import elevation
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterator
+
+    from xsmeteo.models.elevation import ElevationResponse
+    from xsmeteo.services.common import RequestDef
 
 
 @pytest.fixture
@@ -204,3 +211,191 @@ async def test_search_locations_success(client: AsyncXSMeteo) -> None:
     assert result.results is not None
     assert len(result.results) == 1
     assert result.results[0].name == "Berlin"
+
+
+@pytest.mark.asyncio
+async def test_get_elevation_bulk_dedupes_and_caches(client: AsyncXSMeteo) -> None:
+    # Arrange
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        count = len(params["latitude"].split(","))
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = f'{{"elevation": {[float(i) for i in range(count)]}}}'.encode()
+        return mock_response
+
+    cast("AsyncMock", client._client.get).side_effect = respond
+    latitude = [float(i % 150) for i in range(300)]
+    longitude = [1.0] * 300
+
+    # Act
+    first = await client.get_elevation_bulk(latitude=latitude, longitude=longitude)
+    second = await client.get_elevation_bulk(latitude=latitude[:10], longitude=longitude[:10])
+
+    # Assert
+    assert len(first) == 300
+    assert first[0] == first[150] == 0.0
+    assert first[149] == 49.0  # second chunk of 100 unique points
+    assert list(second) == list(first[:10])
+    assert cast("AsyncMock", client._client.get).call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_historical_range_stitches_chunks(client: AsyncXSMeteo) -> None:
+    # Arrange
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0, "hourly": {"time": ["'
+            + params["start_date"].encode()
+            + b'T00:00"], "temperature_2m": [1.0]}}'
+        )
+        return mock_response
+
+    cast("AsyncMock", client._client.get).side_effect = respond
+
+    # Act
+    result = await client.get_historical_range(
+        latitude=52.52,
+        longitude=13.41,
+        start_date="2024-01-15",
+        end_date="2024-03-02",
+        hourly=["temperature_2m"],
+        chunk="month",
+    )
+
+    # Assert
+    assert result.hourly is not None
+    assert result.hourly["time"] == ["2024-01-15T00:00", "2024-02-01T00:00", "2024-03-01T00:00"]
+    assert cast("AsyncMock", client._client.get).call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_repeated_fetches() -> None:
+    # Arrange
+    async with AsyncXSMeteo(response_cache=MemoryCache()) as client:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = b'{"elevation": [38.0]}'
+        get = cast("AsyncMock", client._client.get)
+        get.return_value = mock_response
+
+        # Act
+        first = await client.get_elevation(latitude=[52.52], longitude=[13.41])
+        second = await client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    # Assert
+    assert first == second
+    assert get.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_coalesces_concurrent_calls(client: AsyncXSMeteo) -> None:
+    # Arrange
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = (
+        b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 0.1,'
+        b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+        b'"elevation": 38.0, "current": {"time": "2024-01-01T12:15", "temperature_2m": 4.2}}'
+    )
+    get = cast("AsyncMock", client._client.get)
+    get.return_value = mock_response
+
+    # Act
+    results = await asyncio.gather(
+        *(
+            client.get_current(latitude=52.52, longitude=13.41, current=["temperature_2m"])
+            for _ in range(10)
+        )
+    )
+    cached = await client.get_current(latitude=52.52, longitude=13.41, current=["temperature_2m"])
+
+    # Assert
+    assert get.call_count == 1
+    assert all(result is results[0] for result in results)
+    assert cached is results[0]
+    assert not client._current_inflight
+
+
+def _elevation_response(url: str, params: dict[str, str]) -> MagicMock:
+    response = MagicMock(spec=httpx.Response)
+    if params["latitude"] == "0.0":
+        response.status_code = 400
+        response.content = b'{"error": true, "reason": "bad coordinate"}'
+    else:
+        response.status_code = 200
+        response.content = f'{{"elevation": [{params["latitude"]}]}}'.encode()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_results_and_errors_by_key(client: AsyncXSMeteo) -> None:
+    # Arrange
+    cast("AsyncMock", client._client.get).side_effect = _elevation_response
+    requests = [
+        (name, elevation.get_elevation(latitude=[latitude], longitude=[13.41]))
+        for name, latitude in (("a", 1.0), ("bad", 0.0), ("c", 3.0))
+    ]
+
+    # Act
+    results = {key: result async for key, result in client.stream(requests)}
+
+    # Assert
+    assert set(results) == {"a", "bad", "c"}
+    assert isinstance(results["bad"], HTTPError)
+    assert not isinstance(results["a"], Exception)
+    assert results["a"].elevation == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_input_lazily(client: AsyncXSMeteo) -> None:
+    # Arrange
+    cast("AsyncMock", client._client.get).side_effect = _elevation_response
+    pulled = 0
+
+    def requests() -> Iterator[tuple[int, RequestDef[ElevationResponse]]]:
+        nonlocal pulled
+        for index in range(1, 10_000):
+            pulled += 1
+            yield index, elevation.get_elevation(latitude=[float(index)], longitude=[0.0])
+
+    # Act
+    received = []
+    async for key, _ in client.stream(requests(), concurrency=3):
+        received.append(key)
+        if len(received) == 2:
+            break
+
+    # Assert
+    assert len(received) == 2
+    assert pulled <= 4
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_non_positive_concurrency(client: AsyncXSMeteo) -> None:
+    request = elevation.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    with pytest.raises(ValueError, match="concurrency"):
+        client.stream([(0, request)], concurrency=0)
+    with pytest.raises(ValueError, match="concurrency"):
+        async for _ in stream_calls([(0, request)], client._request, concurrency=-1):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_endpoints_override_the_upstream(client: AsyncXSMeteo) -> None:
+    # Arrange
+    overridden = AsyncXSMeteo(endpoints=config.endpoints_at("http://localhost:9000"))
+    overridden._client = client._client
+    cast("AsyncMock", client._client.get).side_effect = _elevation_response
+
+    # Act
+    await overridden.get_elevation(latitude=[1.0], longitude=[13.41])
+
+    # Assert
+    url = cast("AsyncMock", client._client.get).call_args.args[0]
+    assert url == "http://localhost:9000/v1/elevation"
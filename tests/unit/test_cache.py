@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+
+from xsmeteo.core.cache import MemoryCache, aligned_ttl
+
+
+def test_memory_cache_roundtrip() -> None:
+    cache: MemoryCache[str, int] = MemoryCache()
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+
+def test_memory_cache_ttl_expires() -> None:
+    cache: MemoryCache[str, int] = MemoryCache()
+
+    cache.set("a", 1, ttl=0.05)
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache: MemoryCache[str, int] = MemoryCache(max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_aligned_ttl_expires_on_the_next_boundary() -> None:
+    assert aligned_ttl(900, now=1_800_000_100) == 800
+    assert aligned_ttl(900, now=1_800_000_000) == 900
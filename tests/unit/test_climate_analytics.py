@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import msgspec
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.climate import (  # noqa: E402
+    ClimateModels,
+    ClimateReducer,
+    ModelSeries,
+    fetch_models,
+    split_model_columns,
+    stream_models,
+)
+from xsmeteo.client.async_client import AsyncXSMeteo  # noqa: E402
+from xsmeteo.client.sync_client import XSMeteo  # noqa: E402
+from xsmeteo.models.climate import ClimateResponse  # noqa: E402
+
+
+def make_response(daily: dict[str, list[float | int | str | None]]) -> ClimateResponse:
+    return ClimateResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=1.0,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        daily=daily,
+    )
+
+
+def respond(url: str, params: dict[str, str]) -> MagicMock:
+    model = params["models"]
+    offset = {"A": 0.0, "B": 10.0, "C": 20.0}[model]
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = msgspec.json.encode(
+        make_response({"time": ["2000-01-01", "2000-01-02"], "t2m": [offset, offset + 1]})
+    )
+    return mock_response
+
+
+def test_split_model_columns() -> None:
+    response = make_response(
+        {"time": ["2000-01-01"], "t2m_A": [1.0], "t2m_B": [None], "rain_A": [0.5]}
+    )
+
+    series = split_model_columns(response, ["A", "B"])
+
+    assert [item.model for item in series] == ["A", "B"]
+    assert set(series[0].columns) == {"t2m", "rain"}
+    assert np.isnan(series[1].columns["t2m"][0])
+
+
+def test_split_single_model_has_no_suffix() -> None:
+    response = make_response({"time": ["2000-01-01"], "t2m": [1.0]})
+
+    series = split_model_columns(response, ["A"])
+
+    assert series[0].columns["t2m"].tolist() == [1.0]
+
+
+def test_fetch_models_stacks_one_request_per_model() -> None:
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).side_effect = respond
+
+        stack = fetch_models(
+            client,
+            latitude=52.52,
+            longitude=13.41,
+            start_date="2000-01-01",
+            end_date="2000-01-02",
+            models=["A", "B", "C"],
+            daily=["t2m"],
+            concurrency=2,
+        )
+
+    assert stack.models == ["A", "B", "C"]
+    assert stack["t2m"].tolist() == [[0.0, 1.0], [10.0, 11.0], [20.0, 21.0]]
+    assert cast("MagicMock", client._client.get).call_count == 3
+
+
+def test_climate_models_reject_shifted_time_axes() -> None:
+    # Arrange: same length, different days
+    series = [
+        ModelSeries(model="A", time=["2000-01-01", "2000-01-02"], columns={"t2m": np.zeros(2)}),
+        ModelSeries(model="B", time=["2000-01-02", "2000-01-03"], columns={"t2m": np.zeros(2)}),
+    ]
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="same time axis"):
+        ClimateModels(series)
+
+
+@pytest.mark.asyncio
+async def test_stream_models_feeds_reducer() -> None:
+    reducer = ClimateReducer(q=[0.5], bins=(0.0, 30.0, 30))
+    async with AsyncXSMeteo() as client:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        cast("AsyncMock", client._client.get).side_effect = respond
+
+        async for series in stream_models(
+            client,
+            latitude=52.52,
+            longitude=13.41,
+            start_date="2000-01-01",
+            end_date="2000-01-02",
+            models=["A", "B"],
+            daily=["t2m"],
+        ):
+            reducer.update(series)
+
+    summary = reducer.summary("t2m")
+    assert summary.models == ["A", "B"]
+    assert summary.decades == [2000]
+    np.testing.assert_allclose(summary.decade_means[:, 0], [0.5, 10.5])
+
+
+def test_reducer_chunks_match_full_series() -> None:
+    time = np.arange("1990-01-01", "2010-01-01", dtype="datetime64[D]")
+    values = np.linspace(0.0, 2.0, len(time))
+    dates = [str(day) for day in time]
+    reducer = ClimateReducer(q=[0.5], bins=(0.0, 2.0, 200))
+
+    for start in range(0, len(time), 1000):
+        reducer.update(
+            ModelSeries(
+                model="A",
+                time=dates[start : start + 1000],
+                columns={"t2m": values[start : start + 1000]},
+            )
+        )
+    summary = reducer.summary("t2m")
+
+    assert summary.decades == [1990, 2000]
+    np.testing.assert_allclose(
+        summary.decade_means[0], [values[:3652].mean(), values[3652:].mean()], rtol=1e-3
+    )
+    np.testing.assert_allclose(summary.trend_per_decade, [1.0], rtol=1e-3)
+    np.testing.assert_allclose(summary.quantiles[0], [1.0], atol=0.01)
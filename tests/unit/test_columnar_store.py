@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import datetime
+import math
+from typing import TYPE_CHECKING
+
+import pytest
+
+from xsmeteo.core.timeaxis import to_unix_seconds
+from xsmeteo.models.forecast import ForecastResponse
+from xsmeteo.models.historical import HistoricalResponse
+from xsmeteo.store.columnar import ColumnarStore
+
+if TYPE_CHECKING:
+    import pathlib
+
+HOUR = 3600
+BASE = int(datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC).timestamp())
+
+
+def forecast(times: list[str], **columns: list[float | int | str | None]) -> ForecastResponse:
+    return ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=3600,
+        timezone="Europe/Berlin",
+        timezone_abbreviation="CET",
+        elevation=38.0,
+        hourly={"time": list(times), **columns},
+    )
+
+
+def test_to_unix_seconds_applies_offset() -> None:
+    assert to_unix_seconds(["2024-01-01T01:00", BASE], 3600) == [BASE, BASE]
+
+
+def test_write_and_scan(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path)
+    response = forecast(
+        ["2024-01-01T01:00", "2024-01-01T02:00", "2024-01-01T03:00"],
+        temperature_2m=[1.5, None, 3.5],
+    )
+
+    # Act
+    appended = store.write("forecast", response)
+    scan = store.scan("forecast", 52.52, 13.41, "hourly", ["temperature_2m"])
+
+    # Assert
+    assert appended == 3
+    assert scan.time.tolist() == [BASE, BASE + HOUR, BASE + 2 * HOUR]
+    values = scan.columns["temperature_2m"].tolist()
+    assert values[0] == 1.5
+    assert math.isnan(values[1])
+    assert values[2] == 3.5
+
+
+def test_overlapping_write_merges_rows_and_pads_new_columns(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path, dtype="float64")
+    store.write("forecast", forecast(["2024-01-01T01:00", "2024-01-01T02:00"], t=[1.0, 2.0]))
+
+    # Act
+    appended = store.write(
+        "forecast",
+        forecast(["2024-01-01T02:00", "2024-01-01T03:00"], t=[9.0, 3.0], rain=[0.0, 0.5]),
+    )
+    scan = store.scan("forecast", 52.52, 13.41, "hourly", ["t", "rain"])
+
+    # Assert
+    assert appended == 1
+    assert scan.columns["t"].tolist() == [1.0, 9.0, 3.0]
+    rain = scan.columns["rain"].tolist()
+    assert math.isnan(rain[0])
+    assert rain[1:] == [0.0, 0.5]
+    assert store.variables("forecast", 52.52, 13.41, "hourly") == ["rain", "t"]
+
+
+def test_backfill_before_stored_rows_is_merged(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path)
+    store.write("forecast", forecast(["2024-01-01T03:00", "2024-01-01T04:00"], t=[3.0, 4.0]))
+
+    # Act
+    appended = store.write(
+        "forecast", forecast(["2024-01-01T01:00", "2024-01-01T02:00"], t=[1.0, None])
+    )
+    scan = store.scan("forecast", 52.52, 13.41, "hourly", ["t"])
+
+    # Assert
+    assert appended == 2
+    assert scan.time.tolist() == [BASE, BASE + HOUR, BASE + 2 * HOUR, BASE + 3 * HOUR]
+    values = scan.columns["t"].tolist()
+    assert values[0] == 1.0
+    assert math.isnan(values[1])
+    assert values[2:] == [3.0, 4.0]
+    assert not list(tmp_path.glob("**/*.tmp")) and not list(tmp_path.glob("**/*.old"))
+
+
+def test_new_variable_for_stored_rows_is_written(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path)
+    times = ["2024-01-01T01:00", "2024-01-01T02:00"]
+    store.write("forecast", forecast(times, t=[1.0, 2.0]))
+    before = store.scan("forecast", 52.52, 13.41, "hourly", ["t"])
+
+    # Act
+    appended = store.write("forecast", forecast(times, p=[0.5, 0.25]))
+    scan = store.scan("forecast", 52.52, 13.41, "hourly", ["t", "p"])
+
+    # Assert
+    assert appended == 0
+    assert scan.columns["t"].tolist() == [1.0, 2.0]
+    assert scan.columns["p"].tolist() == [0.5, 0.25]
+    # Views handed out before the rewrite stay readable
+    assert before.columns["t"].tolist() == [1.0, 2.0]
+
+
+def test_scan_range_is_half_open(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path)
+    times = [f"2024-01-01T{hour:02d}:00" for hour in range(1, 11)]
+    store.write("forecast", forecast(times, t=list(range(10))))
+
+    # Act
+    scan = store.scan(
+        "forecast",
+        52.52,
+        13.41,
+        "hourly",
+        ["t"],
+        start=BASE + 2 * HOUR,
+        end=datetime.datetime(2024, 1, 1, 5),
+    )
+
+    # Assert
+    assert scan.columns["t"].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_sink_stores_under_requested_location(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path)
+    response = HistoricalResponse(
+        latitude=52.5,
+        longitude=13.4,
+        generationtime_ms=0.1,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        daily={"time": ["2024-01-01"], "sunrise": ["2024-01-01T08:00"], "t": [1.0]},
+    )
+
+    # Act
+    store.append(52.52, 13.41, response)
+
+    # Assert
+    assert store.variables("historical", 52.52, 13.41, "daily") == ["t"]
+    with pytest.raises(KeyError):
+        store.scan("historical", 52.52, 13.41, "daily", ["sunrise"])
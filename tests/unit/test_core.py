@@ -26,3 +26,14 @@ def test_host_config() -> None:
     assert config.ENDPOINTS.FORECAST == "https://api.open-meteo.com/v1/forecast"
     assert config.ENDPOINTS.HISTORICAL == "https://archive-api.open-meteo.com/v1/archive"
     assert config.ENDPOINTS.MARINE == "https://marine-api.open-meteo.com/v1/marine"
+
+
+def test_endpoints_at_keeps_paths_on_one_origin() -> None:
+    endpoints = config.endpoints_at("http://localhost:9000/")
+
+    assert endpoints.FORECAST == "http://localhost:9000/v1/forecast"
+    assert endpoints.GEOCODING == "http://localhost:9000/v1/search"
+    assert config.endpoint_overrides(endpoints)[config.ENDPOINTS.FORECAST] == (
+        "http://localhost:9000/v1/forecast"
+    )
+    assert config.endpoint_overrides(None) == {}
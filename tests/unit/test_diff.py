@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.diff import DiffEngine, diff_series  # noqa: E402
+from xsmeteo.analytics.timeseries import TimeSeries  # noqa: E402
+from xsmeteo.client.watchlist import Refresh  # noqa: E402
+from xsmeteo.models.forecast import ForecastResponse  # noqa: E402
+
+
+def _forecast(time: list[int], **columns: list[Any]) -> ForecastResponse:
+    return ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly={"time": time, **columns},
+    )
+
+
+def test_diff_series_applies_tolerances_and_reports_new_steps() -> None:
+    # Arrange
+    previous = TimeSeries([0, 3600, 7200], {"t": [1.0, 2.0, 3.0], "p": [0.0, 0.0, np.nan]})
+    current = TimeSeries([3600, 7200, 10800], {"t": [2.1, 3.5, 4.0], "p": [0.0, 0.0, 0.0]})
+
+    # Act
+    time, values = diff_series(previous, current, tolerances={"t": 0.2})
+
+    # Assert
+    assert time.tolist() == [7200, 10800]
+    np.testing.assert_array_equal(values["t"], [3.5, 4.0])
+    np.testing.assert_array_equal(values["p"], [0.0, 0.0])
+
+
+def test_diff_series_without_changes_is_empty() -> None:
+    series = TimeSeries([0, 3600], {"t": [1.0, np.nan]})
+
+    time, values = diff_series(series, TimeSeries([0, 3600], {"t": [1.0, np.nan]}))
+
+    assert time.size == 0
+    assert values == {}
+
+
+def test_diff_engine_reports_full_first_response_then_deltas() -> None:
+    # Arrange
+    engine = DiffEngine(tolerances={"temperature_2m": 0.5})
+    first = _forecast([0, 3600], temperature_2m=[10.0, 11.0], rain=[0.0, None])
+    second = _forecast([0, 3600], temperature_2m=[10.2, 12.0], rain=[0.0, None])
+
+    # Act
+    initial = engine.update(52.52, 13.41, first)
+    delta = engine.update(52.52, 13.41, second)
+    unchanged = engine.update(52.52, 13.41, second)
+
+    # Assert
+    assert initial[0].time == [0, 3600]
+    assert initial[0].values["rain"] == [0.0, None]
+    assert len(delta) == 1
+    assert delta[0].section == "hourly"
+    assert delta[0].time == [3600]
+    assert delta[0].values == {"temperature_2m": [12.0]}
+    assert unchanged == []
+
+
+def test_diff_engine_reports_slow_drift() -> None:
+    # Arrange: every run moves 0.3 degrees, below the tolerance of 0.5
+    engine = DiffEngine(tolerances={"temperature_2m": 0.5})
+    runs = [_forecast([0], temperature_2m=[10.0 + 0.3 * run]) for run in range(4)]
+
+    # Act
+    deltas = [engine.update(52.52, 13.41, response) for response in runs]
+
+    # Assert: compared with the last reported 10.0, not the previous run
+    assert [len(delta) for delta in deltas] == [1, 0, 1, 0]
+    assert deltas[2][0].values == {"temperature_2m": [pytest.approx(10.6)]}
+
+
+@pytest.mark.asyncio
+async def test_diff_engine_streams_deltas_from_refreshes() -> None:
+    # Arrange
+    engine = DiffEngine()
+    response = _forecast([0], temperature_2m=[10.0])
+
+    async def refreshes() -> Any:
+        for _ in range(3):
+            yield Refresh(52.52, 13.41, response)
+
+    # Act
+    deltas = [delta async for delta in engine.deltas(refreshes())]
+
+    # Assert
+    assert len(deltas) == 1
+    assert deltas[0].values == {"temperature_2m": [10.0]}
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.store.elevation import ElevationStore
+
+if TYPE_CHECKING:
+    import pathlib
+
+
+def test_exact_hit_snaps_to_nearest_node() -> None:
+    store = ElevationStore(resolution=0.01)
+
+    store.set((52.52, 13.41), 34.0)
+
+    assert store.get((52.52, 13.41)) == 34.0
+    assert store.get((52.5240, 13.4140)) == 34.0
+    assert store.get((52.53, 13.41)) is None
+
+
+def test_tolerance_limits_snapping() -> None:
+    store = ElevationStore(resolution=0.01, tolerance=0.001)
+
+    store.set((52.52, 13.41), 34.0)
+
+    assert store.get((52.5205, 13.41)) == 34.0
+    assert store.get((52.5240, 13.41)) is None
+
+
+def test_bilinear_interpolation() -> None:
+    store = ElevationStore(resolution=0.5, interpolate=True)
+    store.set((10.0, 20.0), 0.0)
+    store.set((10.0, 20.5), 10.0)
+    store.set((10.5, 20.0), 20.0)
+    store.set((10.5, 20.5), 30.0)
+
+    assert store.get((10.25, 20.25)) == pytest.approx(15.0)
+    assert store.get((10.0, 20.25)) == pytest.approx(5.0)
+
+
+def test_negative_coordinates_and_tile_edges() -> None:
+    store = ElevationStore(resolution=0.5, interpolate=True)
+    store.set((-0.5, -0.5), 1.0)
+    store.set((-0.5, 0.0), 1.0)
+    store.set((0.0, -0.5), 3.0)
+    store.set((0.0, 0.0), 3.0)
+
+    assert store.get((-0.25, -0.25)) == pytest.approx(2.0)
+
+
+def test_persistence(tmp_path: pathlib.Path) -> None:
+    with ElevationStore(tmp_path, resolution=0.01) as store:
+        store.set((45.0, 7.0), 1200.0)
+
+    with ElevationStore(tmp_path, resolution=0.01) as store:
+        assert store.get((45.0, 7.0)) == 1200.0
+        assert store.get((46.0, 7.0)) is None
+
+
+def test_invalid_resolution() -> None:
+    with pytest.raises(ValueError):
+        ElevationStore(resolution=0.3)
+
+
+def test_backs_get_elevation_bulk() -> None:
+    store = ElevationStore(resolution=0.01)
+    with XSMeteo(elevation_cache=store) as client:
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = b'{"elevation": [34.0]}'
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).return_value = mock_response
+
+        client.get_elevation_bulk(latitude=[52.52], longitude=[13.41])
+        result = client.get_elevation_bulk(latitude=[52.521], longitude=[13.411])
+
+    assert list(result) == [34.0]
+    assert cast("MagicMock", client._client.get).call_count == 1
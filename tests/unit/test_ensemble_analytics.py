@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.ensemble import EnsembleMembers, group_member_columns  # noqa: E402
+from xsmeteo.models.ensemble import EnsembleResponse  # noqa: E402
+
+
+@pytest.fixture
+def response() -> EnsembleResponse:
+    return EnsembleResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=1.0,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly={
+            "time": ["2024-01-01T00:00", "2024-01-01T01:00"],
+            "temperature_2m": [1.0, 2.0],
+            "temperature_2m_member02": [3.0, None],
+            "temperature_2m_member01": [2.0, 4.0],
+            "rain": [0.0, 1.0],
+        },
+    )
+
+
+def test_group_member_columns() -> None:
+    groups = group_member_columns(
+        {
+            "time": [],
+            "t2m_member01_icon_eps": [],
+            "t2m_icon_eps": [],
+            "rain": [],
+        }
+    )
+
+    assert groups == {
+        "t2m_icon_eps": [(0, "t2m_icon_eps"), (1, "t2m_member01_icon_eps")],
+        "rain": [(0, "rain")],
+    }
+
+
+def test_member_matrix(response: EnsembleResponse) -> None:
+    members = EnsembleMembers.from_response(response)
+
+    matrix = members["temperature_2m"]
+    assert members.variables == ["temperature_2m", "rain"]
+    assert members.members("temperature_2m") == [0, 1, 2]
+    assert matrix.shape == (3, 2)
+    assert matrix.flags.c_contiguous
+    assert np.isnan(matrix[2, 1])
+
+
+def test_statistics_ignore_missing(response: EnsembleResponse) -> None:
+    members = EnsembleMembers.from_response(response)
+
+    np.testing.assert_allclose(members.mean("temperature_2m"), [2.0, 3.0])
+    np.testing.assert_allclose(members.spread("temperature_2m"), [np.sqrt(2 / 3), 1.0])
+    np.testing.assert_allclose(members.quantiles("temperature_2m", 0.5), [2.0, 3.0])
+    assert members.quantiles("temperature_2m", [0.0, 1.0]).shape == (2, 2)
+    np.testing.assert_allclose(members.exceedance_probability("temperature_2m", 1.5), [2 / 3, 1.0])
+    np.testing.assert_allclose(
+        members.exceedance_probability("temperature_2m", 1.5, below=True), [1 / 3, 0.0]
+    )
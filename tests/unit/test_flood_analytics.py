@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.flood import (  # noqa: E402
+    exceedance_probability,
+    iter_exceedance,
+    stack_members,
+    stream_exceedance,
+)
+from xsmeteo.client.async_client import AsyncXSMeteo  # noqa: E402
+from xsmeteo.client.sync_client import XSMeteo  # noqa: E402
+from xsmeteo.models.flood import FloodResponse  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def make_response(
+    *members: Sequence[float | None], time: Sequence[str] = ("2024-01-01", "2024-01-02")
+) -> FloodResponse:
+    daily: dict[str, list[float | int | str | None]] = {"time": list(time)}
+    for member, values in enumerate(members):
+        key = "river_discharge" if member == 0 else f"river_discharge_member{member:02d}"
+        daily[key] = list(values)
+    return FloodResponse(latitude=0.0, longitude=0.0, generationtime_ms=1.0, daily=daily)
+
+
+def respond(url: str, params: dict[str, str]) -> MagicMock:
+    base = float(params["latitude"])
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = (
+        b'{"latitude": 0, "longitude": 0, "generationtime_ms": 1,'
+        b'"daily": {"time": ["2024-01-01"],'
+        + f'"river_discharge": [{base}], "river_discharge_member01": [{base + 10}]'.encode()
+        + b"}}"
+    )
+    return mock_response
+
+
+def test_stack_members() -> None:
+    time, stack = stack_members([make_response([1.0, 2.0], [3.0, None]), make_response([5.0, 6.0])])
+
+    assert time == ["2024-01-01", "2024-01-02"]
+    assert stack.shape == (2, 2, 2)
+    assert np.isnan(stack[0, 1, 1])
+    assert np.isnan(stack[1, 1]).all()
+
+
+def test_stack_members_rejects_misaligned_days() -> None:
+    shifted = make_response([5.0, 6.0], time=["2024-01-02", "2024-01-03"])
+
+    with pytest.raises(ValueError, match="time axis"):
+        stack_members([make_response([1.0, 2.0]), shifted])
+
+
+def test_exceedance_probability_per_point() -> None:
+    _, stack = stack_members(
+        [make_response([1.0, 2.0], [3.0, None]), make_response([5.0, 6.0], [7.0, 8.0])]
+    )
+
+    probability = exceedance_probability(stack, [2.5, 6.5])
+
+    np.testing.assert_allclose(probability, [[0.5, 0.0], [0.5, 0.5]])
+
+
+def test_iter_exceedance_batches() -> None:
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).side_effect = respond
+
+        batches = list(
+            iter_exceedance(
+                client,
+                latitude=[1.0, 2.0, 3.0],
+                longitude=[0.0, 0.0, 0.0],
+                thresholds=5.0,
+                batch_size=2,
+            )
+        )
+
+    assert [batch.offset for batch in batches] == [0, 2]
+    assert batches[0].discharge.shape == (2, 2, 1)
+    np.testing.assert_allclose(batches[1].probability, [[0.5]])
+
+
+@pytest.mark.asyncio
+async def test_stream_exceedance_batches() -> None:
+    async with AsyncXSMeteo() as client:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        cast("AsyncMock", client._client.get).side_effect = respond
+
+        batches = [
+            batch
+            async for batch in stream_exceedance(
+                client,
+                latitude=[1.0, 2.0, 3.0],
+                longitude=[0.0, 0.0, 0.0],
+                thresholds=[0.0, 20.0, 12.5],
+                batch_size=2,
+            )
+        ]
+
+    np.testing.assert_allclose(batches[0].probability, [[1.0], [0.0]])
+    np.testing.assert_allclose(batches[1].probability, [[0.5]])
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from xsmeteo.core.freshness import MODEL_CYCLES, ModelCycle, last_update, next_update, ttl
+
+# 2024-01-01T00:00Z
+MIDNIGHT = 1_704_067_200
+
+
+def test_model_cycle_predicts_next_run_after_delay() -> None:
+    cycle = ModelCycle(6, 240)
+
+    # The 00Z run is served from 04:00, the 06Z run from 10:00
+    assert cycle.next_update(MIDNIGHT + 3 * 3600) == MIDNIGHT + 4 * 3600
+    assert cycle.next_update(MIDNIGHT + 4 * 3600) == MIDNIGHT + 10 * 3600
+    assert cycle.last_update(MIDNIGHT + 5 * 3600) == MIDNIGHT + 4 * 3600
+
+
+def test_next_update_takes_the_fastest_model() -> None:
+    now = MIDNIGHT + 8 * 3600
+
+    icon = next_update(["icon_d2"], now=now)
+    ifs = next_update("ecmwf_ifs025", now=now)
+    both = next_update("ecmwf_ifs025,icon_d2", now=now)
+
+    assert icon == MIDNIGHT + 10 * 3600
+    assert ifs == MIDNIGHT + 19 * 3600
+    assert both == icon
+    assert last_update("ecmwf_ifs025,icon_d2", now=now) == MIDNIGHT + 7 * 3600
+
+
+@pytest.mark.parametrize("models", [None, "best_match", ["unknown_model"]])
+def test_ttl_falls_back_to_hourly(models: str | list[str] | None) -> None:
+    assert ttl(models, now=MIDNIGHT + 1800) == 1800
+
+
+def test_model_cycles_divide_the_day() -> None:
+    assert all(24 % cycle.interval_hours == 0 for cycle in MODEL_CYCLES.values())
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from xsmeteo.core.loop_thread import LoopThread
+
+
+def test_loop_thread_runs_coroutines_off_the_calling_thread() -> None:
+    loop = LoopThread()
+
+    async def where() -> str:
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    try:
+        assert loop.run(where()) == "xsmeteo-loop"
+    finally:
+        loop.close()
+
+
+def test_loop_thread_propagates_errors_and_closes_cleanly() -> None:
+    loop = LoopThread()
+
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        loop.run(fail())
+    loop.close()
+    loop.close()
+
+    assert not loop.is_running
+    with pytest.raises(RuntimeError, match="closed"):
+        loop.run(asyncio.sleep(0))
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics import pipeline  # noqa: E402
+from xsmeteo.analytics.pipeline import DecodePool  # noqa: E402
+from xsmeteo.analytics.timeseries import TimeSeries  # noqa: E402
+from xsmeteo.client.async_client import AsyncXSMeteo  # noqa: E402
+from xsmeteo.exceptions import DecodeError  # noqa: E402
+from xsmeteo.models.historical import HistoricalResponse  # noqa: E402
+from xsmeteo.services import historical  # noqa: E402
+
+# 2024-01-02T00:00 in Berlin
+SLOW_DAY = 1704063600 + 86400
+
+
+def to_kelvin(series: TimeSeries) -> TimeSeries:
+    return TimeSeries(
+        series.time,
+        {"temperature_2m": series["temperature_2m"] + 273.15},
+        utc_offset_seconds=series.utc_offset_seconds,
+        timezone=series.timezone,
+    )
+
+
+def slow_kelvin(series: TimeSeries) -> TimeSeries:
+    if int(series.time[0]) == SLOW_DAY:
+        time.sleep(0.5)
+    return to_kelvin(series)
+
+
+class _Unreadable(TimeSeries):
+    def __getitem__(self, name: str) -> Any:
+        raise RuntimeError("column lost")
+
+
+def unreadable(series: TimeSeries) -> TimeSeries:
+    return _Unreadable(series.time, {"temperature_2m": series["temperature_2m"]})
+
+
+def _request(day: int) -> Any:
+    return historical.get_historical(
+        latitude=52.52,
+        longitude=13.41,
+        start_date=f"2024-01-0{day}",
+        end_date=f"2024-01-0{day}",
+        hourly=["temperature_2m"],
+    )
+
+
+def _respond(url: str, params: dict[str, str]) -> MagicMock:
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = 200
+    if params["latitude"] == "0.0":
+        response.content = b"not json"
+        return response
+    start = int(params["start_date"][-2:])
+    response.content = (
+        b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+        b'"utc_offset_seconds": 3600, "timezone": "Europe/Berlin",'
+        b'"timezone_abbreviation": "CET", "elevation": 38.0,'
+        b'"hourly": {"time": ["2024-01-%02dT00:00", "2024-01-%02dT01:00"],'
+        b'"temperature_2m": [1.0, null]}}' % (start, start)
+    )
+    return response
+
+
+@pytest.mark.asyncio
+async def test_decode_pool_decodes_in_worker_processes() -> None:
+    # Arrange
+    request_defs = [
+        historical.get_historical(
+            latitude=52.52,
+            longitude=13.41,
+            start_date=f"2024-01-0{day}",
+            end_date=f"2024-01-0{day}",
+            hourly=["temperature_2m"],
+        )
+        for day in (1, 2, 3)
+    ]
+    broken = historical.get_historical(
+        latitude=0.0, longitude=0.0, start_date="2024-01-01", end_date="2024-01-01"
+    )
+
+    async with AsyncXSMeteo() as client:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        cast("AsyncMock", client._client.get).side_effect = _respond
+
+        # Act
+        async with DecodePool(client, transform=to_kelvin, processes=2) as pool:
+            series = await pool.run(request_defs)
+            failures = [result async for _, result in pool.stream([("broken", broken)])]
+
+    # Assert
+    assert [int(item.time[0]) for item in series] == [
+        1704063600,
+        1704063600 + 86400,
+        1704063600 + 2 * 86400,
+    ]
+    assert series[0].utc_offset_seconds == 3600
+    assert series[0]["temperature_2m"][0] == pytest.approx(274.15)
+    assert np.isnan(series[0]["temperature_2m"][1])
+    assert isinstance(failures[0], DecodeError)
+
+
+def test_decode_releases_the_block_when_writing_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    created: list[str] = []
+
+    class Recorded(shared_memory.SharedMemory):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    monkeypatch.setattr(pipeline.shared_memory, "SharedMemory", Recorded)
+    content = _respond("", {"latitude": "52.52", "start_date": "2024-01-01"}).content
+
+    # Act
+    with pytest.raises(RuntimeError, match="column lost"):
+        pipeline._decode(content, HistoricalResponse, "hourly", unreadable)
+
+    # Assert
+    assert len(created) == 1
+    monkeypatch.undo()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm")
+@pytest.mark.asyncio
+async def test_decode_pool_releases_blocks_of_cancelled_decodes() -> None:
+    # Arrange
+    before = set(os.listdir("/dev/shm"))
+    async with AsyncXSMeteo() as client:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        cast("AsyncMock", client._client.get).side_effect = _respond
+        async with DecodePool(client, transform=slow_kelvin, processes=1) as pool:
+            # Start the worker, then cancel while it decodes the slow day
+            await pool.run([_request(1)])
+            task = asyncio.ensure_future(pool.run([_request(2)]))
+            await asyncio.sleep(0.2)
+
+            # Act
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.6)
+
+    # Assert
+    assert set(os.listdir("/dev/shm")) - before == set()
+
+
+def test_decode_pool_rejects_non_positive_concurrency() -> None:
+    with pytest.raises(ValueError, match="concurrency"):
+        DecodePool(MagicMock(spec=AsyncXSMeteo), concurrency=0)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from xsmeteo.client.async_client import AsyncXSMeteo
+from xsmeteo.core import config
+from xsmeteo.core.cache import MemoryCache
+from xsmeteo.proxy import ProxyServer
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+BODY = b'{"latitude":52.52,"longitude":13.41,"elevation":[38.0]}'
+# Spacing and field order the proxy must keep
+ERROR_BODY = b'{"reason": "Latitude out of range", "error": true}'
+
+
+class FakeUpstream:
+    """Stand-in for the Open-Meteo APIs that records the requests it gets."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.requests: list[httpx.Request] = []
+        self.delay = delay
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        if request.url.params.get("latitude") == "999":
+            return httpx.Response(400, content=ERROR_BODY)
+        return httpx.Response(200, content=BODY)
+
+
+@pytest.fixture
+def upstream() -> FakeUpstream:
+    return FakeUpstream(delay=0.05)
+
+
+@pytest.fixture
+async def proxy_url(upstream: FakeUpstream) -> AsyncGenerator[str, None]:
+    endpoints = config.endpoints_at("http://upstream.test")
+    async with AsyncXSMeteo(response_cache=MemoryCache(), endpoints=endpoints) as client:
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        async with ProxyServer(client, port=0) as server:
+            yield f"http://127.0.0.1:{server.port}"
+
+
+@pytest.mark.asyncio
+async def test_proxy_forwards_and_caches(proxy_url: str, upstream: FakeUpstream) -> None:
+    # Arrange
+    async with httpx.AsyncClient(base_url=proxy_url) as http:
+        # Act
+        first = await http.get("/v1/elevation", params={"latitude": 52.52, "longitude": 13.41})
+        second = await http.get("/v1/elevation?longitude=13.41&latitude=52.52")
+
+    # Assert
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == BODY
+    assert len(upstream.requests) == 1
+    assert str(upstream.requests[0].url).startswith("http://upstream.test/v1/elevation?")
+
+
+@pytest.mark.asyncio
+async def test_proxy_coalesces_concurrent_misses(proxy_url: str, upstream: FakeUpstream) -> None:
+    # Arrange
+    async with httpx.AsyncClient(base_url=proxy_url) as http:
+        # Act
+        responses = await asyncio.gather(
+            *(http.get("/v1/forecast?latitude=1&longitude=2") for _ in range(20))
+        )
+
+    # Assert
+    assert all(response.content == BODY for response in responses)
+    assert len(upstream.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_proxy_passes_upstream_errors_through(proxy_url: str, upstream: FakeUpstream) -> None:
+    # Arrange
+    async with httpx.AsyncClient(base_url=proxy_url) as http:
+        # Act
+        response = await http.get("/v1/forecast?latitude=999&longitude=0")
+
+    # Assert
+    assert response.status_code == 400
+    assert response.content == ERROR_BODY
+
+
+@pytest.mark.asyncio
+async def test_proxy_rejects_unknown_paths_and_methods(proxy_url: str) -> None:
+    # Arrange
+    async with httpx.AsyncClient(base_url=proxy_url) as http:
+        # Act
+        unknown = await http.get("/v1/unknown")
+        post = await http.post("/v1/forecast")
+
+    # Assert
+    assert unknown.status_code == 404
+    assert unknown.json()["error"] is True
+    assert post.status_code == 405
+
+
+@pytest.mark.asyncio
+async def test_proxy_answers_oversized_headers_with_bad_request(proxy_url: str) -> None:
+    # Arrange
+    port = int(proxy_url.rsplit(":", 1)[1])
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    # Act
+    writer.write(b"GET /v1/forecast HTTP/1.1\r\nX-Long: " + b"a" * 100_000 + b"\r\n\r\n")
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    # Assert
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert response.endswith(b'"reason":"Request header too long"}')
+
+
+async def _exchange(proxy_url: str, request: bytes) -> bytes:
+    port = int(proxy_url.rsplit(":", 1)[1])
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_proxy_limits_header_count(proxy_url: str) -> None:
+    # Arrange
+    headers = b"".join(b"X-%d: a\r\n" % index for index in range(1_000))
+
+    # Act
+    response = await _exchange(proxy_url, b"GET /v1/forecast HTTP/1.1\r\n" + headers + b"\r\n")
+
+    # Assert
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert response.endswith(b'"reason":"Too many request headers"}')
+
+
+@pytest.mark.asyncio
+async def test_proxy_rejects_request_bodies(proxy_url: str, upstream: FakeUpstream) -> None:
+    # Act
+    large = await _exchange(
+        proxy_url, b"POST /v1/forecast HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n"
+    )
+    get = await _exchange(proxy_url, b"GET /v1/elevation HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}")
+
+    # Assert
+    assert large.startswith(b"HTTP/1.1 413 Content Too Large\r\n")
+    assert get.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert upstream.requests == []
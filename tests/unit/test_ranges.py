@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from xsmeteo.models.historical import HistoricalResponse
+from xsmeteo.services.ranges import plan_date_ranges, stitch_responses
+
+
+def make_response(
+    hourly: dict[str, list[float | int | str | None]] | None = None,
+    daily: dict[str, list[float | int | str | None]] | None = None,
+) -> HistoricalResponse:
+    return HistoricalResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=1.0,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly=hourly,
+        daily=daily,
+    )
+
+
+def test_plan_by_year() -> None:
+    assert plan_date_ranges("2020-06-15", "2022-02-01") == [
+        ("2020-06-15", "2020-12-31"),
+        ("2021-01-01", "2021-12-31"),
+        ("2022-01-01", "2022-02-01"),
+    ]
+
+
+def test_plan_by_month() -> None:
+    assert plan_date_ranges("2023-11-20", "2024-01-10", chunk="month") == [
+        ("2023-11-20", "2023-11-30"),
+        ("2023-12-01", "2023-12-31"),
+        ("2024-01-01", "2024-01-10"),
+    ]
+
+
+def test_plan_single_day() -> None:
+    assert plan_date_ranges("2024-02-29", "2024-02-29") == [("2024-02-29", "2024-02-29")]
+
+
+def test_plan_rejects_invalid_input() -> None:
+    with pytest.raises(ValueError):
+        plan_date_ranges("2024-01-02", "2024-01-01")
+    with pytest.raises(ValueError):
+        plan_date_ranges("2024-01-01", "2024-01-02", chunk="week")
+
+
+def test_stitch_dedupes_time_axis() -> None:
+    stitched = stitch_responses(
+        [
+            make_response(hourly={"time": ["t0", "t1"], "temperature_2m": [1.0, 2.0]}),
+            make_response(
+                hourly={"time": ["t1", "t2"], "temperature_2m": [9.0, 3.0], "rain": [0.0, 0.1]}
+            ),
+        ]
+    )
+
+    assert stitched.hourly == {
+        "time": ["t0", "t1", "t2"],
+        "temperature_2m": [1.0, 2.0, 3.0],
+        "rain": [None, None, 0.1],
+    }
+    assert stitched.daily is None
+    assert stitched.latitude == 52.52
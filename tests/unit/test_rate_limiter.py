@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
 
 import pytest
 
 from xsmeteo.core.rate_limiter import RateLimitConfig, RateLimiter
+from xsmeteo.exceptions import RateLimitError
 
 
 def test_rate_limiter_sync_basic() -> None:
@@ -51,3 +54,72 @@ async def test_rate_limiter_async_wait() -> None:
     await limiter.acquire_async()
     duration = time.monotonic() - start
     assert duration >= 0.09
+
+
+def test_rate_limiter_is_shared_across_threads_and_loops() -> None:
+    # Arrange
+    limiter = RateLimiter([RateLimitConfig(limit=5, period_seconds=60.0)])
+    granted: list[bool] = []
+    barrier = threading.Barrier(8)
+
+    def acquire_sync() -> None:
+        barrier.wait()
+        try:
+            limiter.acquire_sync(timeout=0.0)
+        except RateLimitError:
+            granted.append(False)
+        else:
+            granted.append(True)
+
+    def acquire_async() -> None:
+        barrier.wait()
+        try:
+            asyncio.run(limiter.acquire_async(timeout=0.0))
+        except RateLimitError:
+            granted.append(False)
+        else:
+            granted.append(True)
+
+    threads = [threading.Thread(target=acquire_sync) for _ in range(4)]
+    threads += [threading.Thread(target=acquire_async) for _ in range(4)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert granted.count(True) == 5
+
+
+def test_rate_limiter_does_not_hold_the_lock_while_waiting() -> None:
+    # Arrange
+    limiter = RateLimiter([RateLimitConfig(limit=1, period_seconds=0.5)])
+    limiter.acquire_sync()
+    waiter = threading.Thread(target=limiter.acquire_sync)
+    waiter.start()
+    time.sleep(0.05)
+
+    # Act
+    start = time.monotonic()
+    wait = limiter.wait_time()
+    taken = limiter.try_acquire()
+    duration = time.monotonic() - start
+    waiter.join()
+
+    # Assert
+    assert duration < 0.05
+    assert wait > 0
+    assert not taken
+
+
+def test_rate_limiter_lets_oversized_requests_through_once_full() -> None:
+    # Arrange
+    limiter = RateLimiter([RateLimitConfig(limit=2, period_seconds=0.1)])
+
+    # Act
+    limiter.acquire_sync(tokens=5)
+
+    # Assert: the excess is a debt later requests wait for
+    assert limiter.wait_time() > 0.1
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import msgspec
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.resample import (  # noqa: E402
+    daily_name,
+    default_aggregations,
+    resample_daily,
+    resample_response,
+)
+from xsmeteo.analytics.timeseries import TimeSeries  # noqa: E402
+from xsmeteo.models.historical import HistoricalResponse  # noqa: E402
+
+
+@pytest.fixture
+def response() -> HistoricalResponse:
+    times = [f"2024-01-0{day}T{hour:02d}:00" for day in (1, 2) for hour in range(24)]
+    return HistoricalResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=3600,
+        timezone="Europe/Berlin",
+        timezone_abbreviation="CET",
+        elevation=38.0,
+        hourly_units={"time": "iso8601", "temperature_2m": "°C", "precipitation": "mm"},
+        hourly={
+            "time": times,
+            "temperature_2m": [float(index) for index in range(48)],
+            "precipitation": [0.5] * 24 + [None] * 24,
+            "weather_code": [3] * 10 + [61] * 10 + [0] * 4 + [1, 2] * 12,
+        },
+    )
+
+
+def test_default_aggregations() -> None:
+    assert default_aggregations("weather_code") == ("mode",)
+    assert default_aggregations("precipitation") == ("sum",)
+    assert default_aggregations("temperature_2m") == ("min", "max", "mean")
+    assert default_aggregations("shortwave_radiation") == ("sum",)
+    # Names sharing a word with accumulated variables are not accumulated
+    assert default_aggregations("precipitation_probability") == ("min", "max", "mean")
+    assert default_aggregations("snowfall_height") == ("min", "max", "mean")
+    assert default_aggregations("shortwave_radiation_instant") == ("min", "max", "mean")
+    assert default_aggregations("wind_direction_10m") == ("dominant",)
+
+
+def test_daily_name_matches_api() -> None:
+    assert daily_name("temperature_2m", "max") == "temperature_2m_max"
+    assert daily_name("precipitation", "sum") == "precipitation_sum"
+    assert daily_name("sunshine_duration", "sum") == "sunshine_duration"
+    assert daily_name("et0_fao_evapotranspiration", "sum") == "et0_fao_evapotranspiration"
+    assert daily_name("wind_direction_10m", "dominant") == "wind_direction_10m_dominant"
+    assert daily_name("sunshine_duration", "max") == "sunshine_duration_max"
+
+
+def test_resample_daily_cuts_at_local_midnight(response: HistoricalResponse) -> None:
+    # Arrange
+    series = TimeSeries.from_response(response)
+
+    # Act
+    daily = resample_daily(series)
+
+    # Assert
+    assert daily.time.tolist() == series.time[[0, 24]].tolist()
+    assert daily["temperature_2m_min"].tolist() == [0.0, 24.0]
+    assert daily["temperature_2m_max"].tolist() == [23.0, 47.0]
+    assert daily["temperature_2m_mean"].tolist() == [11.5, 35.5]
+    np.testing.assert_array_equal(daily["precipitation_sum"], [12.0, np.nan])
+    # Tie between codes 1 and 2 resolves to the more severe code
+    assert daily["weather_code"].tolist() == [61.0, 2.0]
+
+
+def test_resample_daily_min_count(response: HistoricalResponse) -> None:
+    series = TimeSeries.from_response(response).slice(None, "2024-01-02T06:00")
+
+    daily = resample_daily(series, {"temperature_2m": ["mean"]}, min_count=12)
+
+    np.testing.assert_array_equal(daily["temperature_2m_mean"], [11.5, np.nan])
+
+
+def test_resample_daily_rejects_unknown_aggregation(response: HistoricalResponse) -> None:
+    with pytest.raises(ValueError, match="median"):
+        resample_daily(TimeSeries.from_response(response), {"temperature_2m": ["median"]})
+
+
+def test_resample_response_fills_daily_section(response: HistoricalResponse) -> None:
+    # Act
+    result = resample_response(response, {"temperature_2m": ["max"], "precipitation": ["sum"]})
+
+    # Assert
+    assert result.daily == {
+        "time": ["2024-01-01", "2024-01-02"],
+        "temperature_2m_max": [23.0, 47.0],
+        "precipitation_sum": [12.0, None],
+    }
+    assert result.daily_units == {
+        "time": "iso8601",
+        "temperature_2m_max": "°C",
+        "precipitation_sum": "mm",
+    }
+    assert result.hourly == response.hourly
+
+
+def test_resample_daily_uses_dst_aware_midnights() -> None:
+    # Arrange: 2024-03-30T23:00Z is local midnight in Berlin (CET); the next
+    # local midnight is only 23 hours later because clocks spring forward
+    start = 1711839600
+    series = TimeSeries(
+        [start + hour * 3600 for hour in range(47)],
+        {"temperature_2m": [1.0] * 23 + [2.0] * 24},
+    )
+
+    # Act
+    daily = resample_daily(series, {"temperature_2m": ["mean"]}, timezone="Europe/Berlin")
+
+    # Assert
+    assert daily.time.tolist() == [start, start + 23 * 3600]
+    assert daily["temperature_2m_mean"].tolist() == [1.0, 2.0]
+
+
+def test_resample_response_sums_radiation_in_megajoules(response: HistoricalResponse) -> None:
+    # Arrange: 500 W/m² for every hour of the first day
+    hourly = response.hourly | {"shortwave_radiation": [500.0] * 24 + [0.0] * 24}
+    units = response.hourly_units | {"shortwave_radiation": "W/m²"}
+    response = msgspec.structs.replace(response, hourly=hourly, hourly_units=units)
+
+    # Act
+    result = resample_response(response, {"shortwave_radiation": ["sum", "max"]})
+
+    # Assert
+    assert result.daily is not None
+    assert result.daily["shortwave_radiation_sum"] == [pytest.approx(43.2), 0.0]
+    assert result.daily["shortwave_radiation_max"] == [500.0, 0.0]
+    assert result.daily_units is not None
+    assert result.daily_units["shortwave_radiation_sum"] == "MJ/m²"
+    assert result.daily_units["shortwave_radiation_max"] == "W/m²"
+
+
+def test_resample_daily_dominant_direction_wraps_north(response: HistoricalResponse) -> None:
+    # Arrange: the wind swings between 350° and 10°, whose arithmetic mean is 180°
+    hourly = response.hourly | {"wind_direction_10m": [350.0, 10.0] * 24}
+    response = msgspec.structs.replace(response, hourly=hourly)
+
+    # Act
+    daily = resample_daily(TimeSeries.from_response(response))
+
+    # Assert
+    for value in daily["wind_direction_10m_dominant"].tolist():
+        assert min(value, 360.0 - value) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_resample_daily_dominant_direction_weighted_by_speed(
+    response: HistoricalResponse,
+) -> None:
+    # Arrange: a light westerly and a strong easterly
+    hourly = response.hourly | {
+        "wind_direction_10m": [270.0, 90.0] * 24,
+        "wind_speed_10m": [1.0, 9.0] * 24,
+    }
+    response = msgspec.structs.replace(response, hourly=hourly)
+
+    # Act
+    daily = resample_daily(TimeSeries.from_response(response), {"wind_direction_10m": ["dominant"]})
+
+    # Assert
+    assert daily["wind_direction_10m_dominant"].tolist() == [pytest.approx(90.0)] * 2
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from xsmeteo.client.async_client import AsyncXSMeteo
+from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.core import config
+from xsmeteo.core.rate_limiter import RateLimitConfig
+from xsmeteo.core.routing import PUBLIC_BACKEND, Backend, EndpointPool
+from xsmeteo.exceptions import RateLimitError
+
+BODY = b'{"elevation":[38.0]}'
+
+LOCAL = Backend(config.endpoints_at("http://local.test"), name="local")
+OTHER = Backend(config.endpoints_at("http://other.test"), name="other")
+PAID = Backend(
+    config.CUSTOMER_ENDPOINTS,
+    api_key="secret",
+    rate_limits=[RateLimitConfig(limit=100, period_seconds=60.0)],
+    name="paid",
+)
+
+
+def _tight() -> Backend:
+    """A limited backend allowing one request per minute."""
+    return Backend(
+        config.endpoints_at("http://tight.test"),
+        rate_limits=[RateLimitConfig(limit=1, period_seconds=60.0)],
+        name="tight",
+    )
+
+
+def _stand_in(down: set[str]) -> httpx.MockTransport:
+    """Backends answering elevation requests, except the hosts in ``down``."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host in down:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, content=BODY)
+
+    return httpx.MockTransport(handler)
+
+
+def test_routes_prefer_unlimited_then_fastest() -> None:
+    # Arrange
+    pool = EndpointPool([PAID, LOCAL, OTHER])
+    pool.record_success(LOCAL, 0.3)
+    pool.record_success(OTHER, 0.1)
+    pool.record_success(PAID, 0.01)
+    pool.record_success(PUBLIC_BACKEND, 0.5)
+
+    # Act
+    routes = pool.routes(config.ENDPOINTS.FORECAST, {"latitude": "1"})
+
+    # Assert
+    assert [route.backend.label for route in routes] == ["other", "local", "paid", "public"]
+    assert routes[0].url == "http://other.test/v1/forecast"
+    assert routes[0].limiter is None
+    assert routes[2].url == "https://customer-api.open-meteo.com/v1/forecast"
+    assert routes[2].params == {"latitude": "1", "apikey": "secret"}
+
+
+def test_failing_backends_are_skipped_until_all_are_down() -> None:
+    # Arrange
+    pool = EndpointPool([LOCAL], fallback=None, failure_threshold=2)
+
+    # Act
+    pool.record_failure(LOCAL)
+    healthy_after_one = pool.status()[0].healthy
+    pool.record_failure(LOCAL)
+
+    # Assert
+    assert healthy_after_one
+    assert not pool.status()[0].healthy
+    # A pool without healthy backends still tries the unhealthy ones
+    assert [route.backend for route in pool.routes(config.ENDPOINTS.FORECAST, {})] == [LOCAL]
+
+
+def test_sync_client_fails_over_to_the_public_host() -> None:
+    # Arrange
+    pool = EndpointPool([LOCAL], failure_threshold=1)
+    client = XSMeteo(endpoint_pool=pool)
+    client._client = httpx.Client(transport=_stand_in(down={"local.test"}))
+
+    # Act
+    response = client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    # Assert
+    assert response.elevation == [38.0]
+    assert {status.name: status.healthy for status in pool.status()} == {
+        "local": False,
+        "public": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_client_fails_over_on_server_errors() -> None:
+    # Arrange
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        if request.url.host == "local.test":
+            return httpx.Response(503, json={"error": True, "reason": "Overloaded"})
+        return httpx.Response(200, content=BODY)
+
+    pool = EndpointPool([LOCAL, OTHER], fallback=None)
+    async with AsyncXSMeteo(endpoint_pool=pool) as client:
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        # Act
+        response = await client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    # Assert
+    assert response.elevation == [38.0]
+    assert hosts == ["local.test", "other.test"]
+
+
+@pytest.mark.asyncio
+async def test_health_check_marks_unreachable_backends_down() -> None:
+    # Arrange
+    pool = EndpointPool([LOCAL, OTHER], fallback=None)
+
+    # Act
+    async with httpx.AsyncClient(transport=_stand_in(down={"local.test"})) as http:
+        statuses = await pool.check(http)
+
+    # Assert
+    assert [(status.name, status.healthy) for status in statuses] == [
+        ("local", False),
+        ("other", True),
+    ]
+    assert statuses[1].latency is not None
+    assert pool.routes(config.ENDPOINTS.FORECAST, {})[0].backend is OTHER
+
+
+def test_routes_do_not_wait_for_a_sleeping_limiter() -> None:
+    # Arrange: another thread waits for the budget of the limited backend
+    slow = Backend(
+        config.endpoints_at("http://slow.test"),
+        rate_limits=[RateLimitConfig(limit=1, period_seconds=0.5)],
+        name="slow",
+    )
+    pool = EndpointPool([slow, LOCAL], fallback=None)
+    limiter = pool.routes(config.ENDPOINTS.FORECAST, {})[1].limiter
+    assert limiter is not None
+    limiter.acquire_sync()
+    waiter = threading.Thread(target=limiter.acquire_sync)
+    waiter.start()
+    time.sleep(0.05)
+
+    # Act
+    started = time.monotonic()
+    routes = pool.routes(config.ENDPOINTS.FORECAST, {})
+    duration = time.monotonic() - started
+    waiter.join()
+
+    # Assert
+    assert duration < 0.05
+    assert [route.backend for route in routes] == [LOCAL, slow]
+
+
+def test_pooled_request_raises_when_no_backend_has_budget() -> None:
+    # Arrange
+    pool = EndpointPool([_tight()], fallback=None)
+    client = XSMeteo(endpoint_pool=pool, timeout=0.05)
+    client._client = httpx.Client(transport=_stand_in(down=set()))
+    client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    # Act / Assert
+    with pytest.raises(RateLimitError):
+        client.get_elevation(latitude=[48.85], longitude=[2.35])
+
+
+def test_pooled_request_only_waits_for_the_last_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange: the first route ran out of budget after the routes were ranked
+    slow = Backend(
+        config.endpoints_at("http://slow.test"),
+        rate_limits=[RateLimitConfig(limit=1, period_seconds=2.0)],
+        name="slow",
+    )
+    pool = EndpointPool([slow, PAID], fallback=None)
+    routes = sorted(
+        pool.routes(config.ENDPOINTS.ELEVATION, {}), key=lambda route: route.backend is PAID
+    )
+    assert routes[0].limiter is not None
+    routes[0].limiter.acquire_sync()
+    monkeypatch.setattr(pool, "routes", lambda url, params: routes)
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        return httpx.Response(200, content=BODY)
+
+    client = XSMeteo(endpoint_pool=pool, timeout=5.0)
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    # Act
+    started = time.monotonic()
+    client.get_elevation(latitude=[52.52], longitude=[13.41])
+    duration = time.monotonic() - started
+
+    # Assert
+    assert duration < 0.5
+    assert hosts == ["customer-api.open-meteo.com"]
+
+
+@pytest.mark.asyncio
+async def test_async_pooled_request_fails_over_when_budget_runs_out() -> None:
+    # Arrange: the unlimited backend is down, the limited one out of budget
+    tight = _tight()
+    pool = EndpointPool([LOCAL, tight], fallback=None, failure_threshold=10)
+    async with AsyncXSMeteo(endpoint_pool=pool, timeout=0.05) as client:
+        client._client = httpx.AsyncClient(transport=_stand_in(down={"local.test"}))
+        await client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+        # Act / Assert
+        with pytest.raises(RateLimitError):
+            await client.get_elevation(latitude=[48.85], longitude=[2.35])
+
+
+@pytest.mark.asyncio
+async def test_health_check_skips_backends_without_budget() -> None:
+    # Arrange
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        return httpx.Response(200, content=BODY)
+
+    tight = _tight()
+    pool = EndpointPool([tight, LOCAL], fallback=None)
+    limiter = pool.routes(config.ENDPOINTS.FORECAST, {})[1].limiter
+    assert limiter is not None
+    limiter.acquire_sync()
+
+    # Act
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        await pool.check(http)
+
+    # Assert
+    assert hosts == ["local.test"]
+
+
+def test_clients_reject_endpoints_with_a_pool() -> None:
+    with pytest.raises(ValueError, match="cannot be combined"):
+        XSMeteo(endpoints=LOCAL.endpoints, endpoint_pool=EndpointPool([LOCAL]))
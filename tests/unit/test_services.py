@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import datetime
+
+import pytest
+
+from xsmeteo.models.forecast import ForecastResponse
 from xsmeteo.services import (
     air_quality,
     climate,
@@ -10,6 +15,8 @@ from xsmeteo.services import (
     geocoding,
     historical,
     marine,
+    timezones,
+    units,
 )
 
 
@@ -39,6 +46,55 @@ def test_forecast_service_full() -> None:
     assert req.params["forecast_days"] == 3
 
 
+def test_forecast_service_windows() -> None:
+    req = forecast.get_forecast(
+        latitude=52.52,
+        longitude=13.41,
+        minutely_15=["precipitation"],
+        forecast_hours=6,
+        forecast_minutely_15=8,
+        start_hour="2024-06-01T06:00",
+        end_hour="2024-06-01T18:00",
+    )
+
+    assert req.params["minutely_15"] == ["precipitation"]
+    assert req.params["forecast_hours"] == 6
+    assert req.params["forecast_minutely_15"] == 8
+    assert req.params["start_hour"] == "2024-06-01T06:00"
+    assert req.params["end_hour"] == "2024-06-01T18:00"
+    assert req.params["past_hours"] is None
+
+
+def test_forecast_batch_service() -> None:
+    req = forecast.get_forecast_batch(
+        latitude=[52.52, 48.85], longitude=[13.41, 2.35], hourly=["temperature_2m"]
+    )
+
+    assert req.params["latitude"] == [52.52, 48.85]
+    assert req.model == list[ForecastResponse]
+    # Every location counts as one API call
+    assert req.weight == 2
+    with pytest.raises(ValueError, match="at least two"):
+        forecast.get_forecast_batch(latitude=[52.52], longitude=[13.41])
+
+
+def test_forecast_window_rounds_out_to_steps() -> None:
+    start = datetime.datetime(2024, 6, 1, 4, 20, tzinfo=datetime.UTC)
+    end = datetime.datetime(2024, 6, 1, 9, 5, tzinfo=datetime.UTC)
+
+    assert forecast.forecast_window(start, end, timezone="Europe/Berlin") == {
+        "start_hour": "2024-06-01T06:00",
+        "end_hour": "2024-06-01T12:00",
+    }
+    assert forecast.forecast_window(
+        start.replace(tzinfo=None), end.replace(tzinfo=None), resolution="minutely_15"
+    ) == {"start_minutely_15": "2024-06-01T04:15", "end_minutely_15": "2024-06-01T09:15"}
+    with pytest.raises(ValueError, match="precede"):
+        forecast.forecast_window(end, start)
+    with pytest.raises(ValueError, match="auto"):
+        forecast.forecast_window(start, end, timezone="auto")
+
+
 def test_historical_service() -> None:
     req = historical.get_historical(
         latitude=52.52,
@@ -110,3 +166,183 @@ def test_climate_service() -> None:
 
     assert req.url == "https://climate-api.open-meteo.com/v1/climate"
     assert req.params["models"] == ["CMCC_CM2_VHR4"]
+
+
+def test_elevation_dedupe_coordinates() -> None:
+    coordinates, inverse = elevation.dedupe_coordinates(
+        [52.52, 48.85, 52.520000001, 52.52],
+        [13.41, 2.35, 13.41, 13.41],
+    )
+
+    assert coordinates == [(52.52, 13.41), (48.85, 2.35)]
+    assert inverse == [0, 1, 0, 0]
+
+
+def test_elevation_chunks_respect_api_limit() -> None:
+    coordinates = [(float(i), float(-i)) for i in range(250)]
+
+    reqs = elevation.get_elevation_chunks(coordinates)
+
+    assert len(reqs) == 3
+    assert reqs[0].params["latitude"].count(",") == 99
+    assert reqs[2].params["latitude"].count(",") == 49
+    assert reqs[2].params["longitude"].startswith("-200.0,")
+
+
+def test_units_convert_response() -> None:
+    # Arrange
+    response = ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly_units={
+            "time": "iso8601",
+            "temperature_2m": "°C",
+            "wind_speed_10m": "m/s",
+            "precipitation": "mm",
+            "snowfall": "cm",
+        },
+        hourly={
+            "time": ["2024-01-01T00:00"],
+            "temperature_2m": [100.0],
+            "wind_speed_10m": [10.0],
+            "precipitation": [None],
+            "snowfall": [2.54],
+        },
+        current_units={"temperature_2m": "°C"},
+        current={"temperature_2m": -40.0},
+    )
+
+    # Act
+    result = units.convert_response(
+        response, temperature_unit="fahrenheit", wind_speed_unit="kmh", precipitation_unit="inch"
+    )
+
+    # Assert
+    assert result.hourly is not None
+    assert result.hourly["temperature_2m"] == [212.0]
+    assert result.hourly["wind_speed_10m"] == [36.0]
+    assert result.hourly["precipitation"] == [None]
+    assert result.hourly["snowfall"] == pytest.approx([1.0])
+    assert result.hourly_units is not None
+    assert result.hourly_units["temperature_2m"] == "°F"
+    assert result.hourly_units["snowfall"] == "inch"
+    assert result.current == {"temperature_2m": -40.0}
+    assert units.convert_response(response, temperature_unit="celsius") is response
+
+
+def test_units_canonicalize() -> None:
+    req_def = forecast.get_forecast(
+        latitude=52.52, longitude=13.41, temperature_unit="fahrenheit", precipitation_unit="mm"
+    )
+    canonical, wanted = units.canonicalize(req_def)
+    assert canonical.params["temperature_unit"] == "celsius"
+    assert canonical.params["wind_speed_unit"] == "ms"
+    assert wanted == {"temperature_unit": "fahrenheit", "wind_speed_unit": "kmh"}
+
+    req_def = elevation.get_elevation(latitude=[52.52], longitude=[13.41])
+    assert units.canonicalize(req_def) == (req_def, {})
+
+
+# 2024-03-31T00:00Z; Berlin switches to CEST at 01:00Z
+DST_START = 1711843200
+
+
+def test_timezones_utc_offsets_across_dst() -> None:
+    timestamps = [DST_START + hour * 3600 for hour in range(48)]
+
+    offsets = timezones.utc_offsets(timestamps, "Europe/Berlin")
+
+    assert offsets == [3600] + [7200] * 47
+    with pytest.raises(ValueError, match="timezone"):
+        timezones.utc_offsets(timestamps, "Mars/Olympus_Mons")
+
+
+def test_timezones_to_utc_request() -> None:
+    req_def = forecast.get_forecast(
+        latitude=52.52,
+        longitude=13.41,
+        timezone="Europe/Berlin",
+        hourly=["temperature_2m"],
+        forecast_hours=24,
+    )
+    rewritten, wanted = timezones.to_utc_request(req_def)
+    assert rewritten.params["timezone"] == "GMT"
+    assert rewritten.params["timeformat"] == "unixtime"
+    assert wanted == {"timezone": "Europe/Berlin", "timeformat": "iso8601"}
+
+    for req_def in (
+        forecast.get_forecast(latitude=52.52, longitude=13.41, timezone="auto"),
+        # Counted in local days of the zone, by default or explicitly
+        forecast.get_forecast(
+            latitude=52.52, longitude=13.41, timezone="Europe/Berlin", hourly=["temperature_2m"]
+        ),
+        forecast.get_forecast(
+            latitude=52.52,
+            longitude=13.41,
+            timezone="Europe/Berlin",
+            hourly=["temperature_2m"],
+            forecast_hours=24,
+            past_days=1,
+        ),
+        forecast.get_forecast(latitude=52.52, longitude=13.41, daily=["temperature_2m_max"]),
+    ):
+        assert timezones.to_utc_request(req_def) == (req_def, {})
+
+
+def test_timezones_to_utc_request_keeps_local_windows() -> None:
+    # Arrange: 08:00-18:00 Berlin time would select 08:00-18:00 UTC if sent
+    # with timezone=GMT, i.e. rows starting at 10:00 local time
+    windows = (
+        {"start_hour": "2024-06-01T08:00", "end_hour": "2024-06-01T18:00"},
+        {"start_minutely_15": "2024-06-01T08:00", "end_minutely_15": "2024-06-01T18:00"},
+        {"start_date": "2024-06-01", "end_date": "2024-06-02"},
+    )
+
+    for window in windows:
+        req_def = forecast.get_forecast(
+            latitude=52.52, longitude=13.41, timezone="Europe/Berlin", **window
+        )
+
+        # Act
+        rewritten, wanted = timezones.to_utc_request(req_def)
+
+        # Assert
+        assert rewritten == req_def
+        assert rewritten.params["timezone"] == "Europe/Berlin"
+        assert wanted == {}
+
+
+def test_timezones_rebase_response() -> None:
+    # Arrange
+    response = ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=0,
+        timezone="GMT",
+        timezone_abbreviation="GMT",
+        elevation=38.0,
+        hourly_units={"time": "unixtime", "temperature_2m": "°C"},
+        hourly={"time": [DST_START, DST_START + 3600], "temperature_2m": [1.0, 2.0]},
+        daily_units={"time": "unixtime"},
+        daily={"time": [DST_START]},
+    )
+
+    # Act
+    result = timezones.rebase_response(response, "Europe/Berlin")
+
+    # Assert
+    assert result.hourly == {
+        "time": ["2024-03-31T01:00", "2024-03-31T03:00"],
+        "temperature_2m": [1.0, 2.0],
+    }
+    assert result.hourly_units == {"time": "iso8601", "temperature_2m": "°C"}
+    assert result.timezone == "Europe/Berlin"
+    assert result.timezone_abbreviation == "CET"
+    assert result.utc_offset_seconds == 3600
+    assert result.daily is None
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+import typing
+
+import pytest
+
+from xsmeteo.core.shared_cache import SharedMemoryCache
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _fill(path: str) -> None:
+    cache = SharedMemoryCache(path)
+    cache.set("forecast", b'{"latitude":52.52}')
+    cache.close()
+
+
+def test_shared_cache_roundtrip_between_instances(tmp_path: Path) -> None:
+    writer = SharedMemoryCache(tmp_path / "cache", capacity=4096, slots=16)
+    reader = SharedMemoryCache(tmp_path / "cache")
+
+    assert reader.get("a") is None
+    writer.set("a", b"1")
+    writer.set("a", b"22")
+
+    assert reader.get("a") == b"22"
+    assert len(reader) == 1
+    writer.close()
+    reader.close()
+
+
+def test_shared_cache_is_shared_with_other_processes(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache")
+    cache = SharedMemoryCache(path, capacity=4096, slots=16)
+
+    process = multiprocessing.get_context("spawn").Process(target=_fill, args=(path,))
+    process.start()
+    process.join(timeout=30)
+
+    assert process.exitcode == 0
+    assert cache.get("forecast") == b'{"latitude":52.52}'
+    cache.close()
+
+
+def test_shared_cache_ttl_expires(tmp_path: Path) -> None:
+    cache = SharedMemoryCache(tmp_path / "cache", capacity=4096, slots=16)
+
+    cache.set("a", b"1", ttl=0.05)
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_shared_cache_overwrites_oldest_records_when_full(tmp_path: Path) -> None:
+    cache = SharedMemoryCache(tmp_path / "cache", capacity=100, slots=16)
+
+    for key in "abcd":
+        cache.set(key, key.encode() * 40)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == b"c" * 40
+    assert cache.get("d") == b"d" * 40
+
+
+def test_shared_cache_skips_values_larger_than_capacity(tmp_path: Path) -> None:
+    cache = SharedMemoryCache(tmp_path / "cache", capacity=16, slots=4)
+
+    cache.set("a", b"x" * 64)
+
+    assert cache.get("a") is None
+
+
+def test_shared_cache_clear(tmp_path: Path) -> None:
+    cache = SharedMemoryCache(tmp_path / "cache", capacity=4096, slots=16)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_shared_cache_rejects_foreign_files(tmp_path: Path) -> None:
+    path = tmp_path / "cache"
+    path.write_bytes(b"not a cache" * 10)
+
+    with pytest.raises(ValueError, match="not an xsmeteo cache file"):
+        SharedMemoryCache(path)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, cast
+from unittest.mock import MagicMock
+
+import httpx
+import msgspec
+
+from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.store.columnar import ColumnarStore
+from xsmeteo.store.coverage import CoverageIndex, Gap, location_key
+from xsmeteo.store.sync import HistoricalSync
+
+if TYPE_CHECKING:
+    import pathlib
+
+    from xsmeteo.models.historical import HistoricalResponse
+
+BERLIN = location_key(52.52, 13.41)
+
+
+class RecordingSink:
+    def __init__(self) -> None:
+        self.responses: list[HistoricalResponse] = []
+
+    def append(self, latitude: float, longitude: float, response: HistoricalResponse) -> None:
+        self.responses.append(response)
+
+
+def _daily_archive(url: str, params: dict[str, str]) -> MagicMock:
+    """Archive stand-in returning one value per requested day and variable."""
+    first = datetime.date.fromisoformat(params["start_date"])
+    last = datetime.date.fromisoformat(params["end_date"])
+    days = [
+        (first + datetime.timedelta(days=offset)).isoformat()
+        for offset in range((last - first).days + 1)
+    ]
+    daily: dict[str, list[object]] = {"time": days}
+    for name in params["daily"].split(","):
+        daily[name] = [float(day[-2:]) for day in days]
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = msgspec.json.encode(
+        {
+            "latitude": 52.52,
+            "longitude": 13.41,
+            "generationtime_ms": 1.0,
+            "utc_offset_seconds": 0,
+            "timezone": "GMT",
+            "timezone_abbreviation": "GMT",
+            "elevation": 38.0,
+            "daily": daily,
+        }
+    )
+    return mock_response
+
+
+def test_gaps_of_empty_index() -> None:
+    index = CoverageIndex()
+
+    assert index.gaps(BERLIN, ["t2m"], "2024-01-01", "2024-01-31") == [
+        Gap("2024-01-01", "2024-01-31", ("t2m",))
+    ]
+
+
+def test_gaps_group_variables() -> None:
+    index = CoverageIndex()
+    index.add(BERLIN, ["t2m", "rain"], "2024-01-01", "2024-01-10")
+    index.add(BERLIN, ["t2m"], "2024-01-11", "2024-01-20")
+
+    gaps = index.gaps(BERLIN, ["t2m", "rain"], "2024-01-05", "2024-01-25")
+
+    assert gaps == [
+        Gap("2024-01-11", "2024-01-20", ("rain",)),
+        Gap("2024-01-21", "2024-01-25", ("t2m", "rain")),
+    ]
+
+
+def test_add_merges_adjacent_ranges(tmp_path: pathlib.Path) -> None:
+    index = CoverageIndex(tmp_path / "coverage.json")
+    index.add(BERLIN, ["t2m"], "2024-01-01", "2024-01-10")
+    index.add(BERLIN, ["t2m"], "2024-01-11", "2024-01-20")
+    index.save()
+
+    reloaded = CoverageIndex(tmp_path / "coverage.json")
+
+    assert reloaded.covered(BERLIN, "t2m") == [("2024-01-01", "2024-01-20")]
+    assert reloaded.gaps(BERLIN, ["t2m"], "2024-01-01", "2024-01-20") == []
+
+
+def test_sync_fetches_only_missing_days() -> None:
+    # Arrange
+    requested: list[tuple[str, str]] = []
+
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        requested.append((params["start_date"], params["end_date"]))
+        return _daily_archive(url, params)
+
+    sink = RecordingSink()
+    index = CoverageIndex()
+    sync = HistoricalSync(sink, index, daily=["temperature_2m_max"])
+
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).side_effect = respond
+
+        # Act
+        sync.sync(
+            client, latitude=52.52, longitude=13.41, start_date="2024-01-01", end_date="2024-01-10"
+        )
+        sync.sync(
+            client, latitude=52.52, longitude=13.41, start_date="2024-01-01", end_date="2024-01-12"
+        )
+        again = sync.sync(
+            client, latitude=52.52, longitude=13.41, start_date="2024-01-01", end_date="2024-01-12"
+        )
+
+    # Assert
+    assert requested == [("2024-01-01", "2024-01-10"), ("2024-01-11", "2024-01-12")]
+    assert again == []
+    assert len(sink.responses) == 2
+
+
+def _null_archive(first: datetime.date, filled_until: str) -> MagicMock:
+    """Archive stand-in for four days of hourly ``t``, null from ``filled_until`` on."""
+    days = [(first + datetime.timedelta(days=offset)).isoformat() for offset in range(4)]
+    hours = [f"{day}T{hour:02d}:00" for day in days for hour in range(24)]
+    values = [1.0 if time < filled_until else None for time in hours]
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = msgspec.json.encode(
+        {
+            "latitude": 52.52,
+            "longitude": 13.41,
+            "generationtime_ms": 1.0,
+            "utc_offset_seconds": 0,
+            "timezone": "GMT",
+            "timezone_abbreviation": "GMT",
+            "elevation": 38.0,
+            "hourly": {"time": hours, "t": values},
+        }
+    )
+    return mock_response
+
+
+def test_sync_leaves_trailing_null_days_uncovered() -> None:
+    # Arrange: four recent days the archive has filled up to 11:00 of the third
+    first = datetime.date.today() - datetime.timedelta(days=4)
+    days = [(first + datetime.timedelta(days=offset)).isoformat() for offset in range(4)]
+    index = CoverageIndex()
+    sync = HistoricalSync(RecordingSink(), index, hourly=["t"])
+
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).return_value = _null_archive(
+            first, f"{days[2]}T12:00"
+        )
+
+        # Act
+        sync.sync(client, latitude=52.52, longitude=13.41, start_date=days[0], end_date=days[3])
+
+    # Assert
+    assert index.covered(BERLIN, "hourly:t") == [(days[0], days[1])]
+    assert sync.plan(latitude=52.52, longitude=13.41, start_date=days[0], end_date=days[3]) == [
+        Gap(days[2], days[3], ("hourly:t",))
+    ]
+
+
+def test_sync_covers_null_days_older_than_the_archive_delay() -> None:
+    # Arrange: a variable that is null throughout an old window
+    first = datetime.date(2024, 1, 1)
+    index = CoverageIndex()
+    sync = HistoricalSync(RecordingSink(), index, hourly=["t"])
+
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        get = cast("MagicMock", client._client.get)
+        get.return_value = _null_archive(first, "")
+
+        # Act
+        sync.sync(
+            client, latitude=52.52, longitude=13.41, start_date="2024-01-01", end_date="2024-01-04"
+        )
+        again = sync.sync(
+            client, latitude=52.52, longitude=13.41, start_date="2024-01-01", end_date="2024-01-04"
+        )
+
+    # Assert
+    assert index.covered(BERLIN, "hourly:t") == [("2024-01-01", "2024-01-04")]
+    assert again == []
+    assert get.call_count == 1
+
+
+def test_sync_into_columnar_store_backfills_and_adds_variables(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    store = ColumnarStore(tmp_path / "series", dtype="float64")
+    index = CoverageIndex()
+
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        cast("MagicMock", client._client.get).side_effect = _daily_archive
+
+        # Act
+        HistoricalSync(store, index, daily=["t"]).sync(
+            client, latitude=52.52, longitude=13.41, start_date="2020-01-10", end_date="2020-01-20"
+        )
+        HistoricalSync(store, index, daily=["t"]).sync(
+            client, latitude=52.52, longitude=13.41, start_date="2020-01-01", end_date="2020-01-20"
+        )
+        HistoricalSync(store, index, daily=["t", "p"]).sync(
+            client, latitude=52.52, longitude=13.41, start_date="2020-01-01", end_date="2020-01-20"
+        )
+
+    # Assert
+    scan = store.scan("historical", 52.52, 13.41, "daily", ["t", "p"])
+    assert len(scan.time) == 20
+    assert scan.columns["t"].tolist() == [float(day) for day in range(1, 21)]
+    assert scan.columns["p"].tolist() == [float(day) for day in range(1, 21)]
+    assert index.covered(BERLIN, "daily:p") == [("2020-01-01", "2020-01-20")]
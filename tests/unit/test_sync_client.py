@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 
 from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.core.cache import MemoryCache
+from xsmeteo.core.rate_limiter import RateLimitConfig, RateLimiter
 from xsmeteo.exceptions import DecodeError, HTTPError
-from xsmeteo.models.forecast import ForecastResponse
+from xsmeteo.models.forecast import CurrentResponse, ForecastResponse
 from xsmeteo.models.historical import HistoricalResponse
 
 if TYPE_CHECKING:
@@ -197,3 +199,323 @@ def test_search_locations_success(client: XSMeteo) -> None:
     assert result.results is not None
     assert len(result.results) == 1
     assert result.results[0].name == "Berlin"
+
+
+def test_get_elevation_bulk_dedupes_and_caches(client: XSMeteo) -> None:
+    # Arrange
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        count = len(params["latitude"].split(","))
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = f'{{"elevation": {[float(i) for i in range(count)]}}}'.encode()
+        return mock_response
+
+    cast("MagicMock", client._client.get).side_effect = respond
+    latitude = [float(i % 150) for i in range(300)]
+    longitude = [1.0] * 300
+
+    # Act
+    first = client.get_elevation_bulk(latitude=latitude, longitude=longitude)
+    second = client.get_elevation_bulk(latitude=latitude[:10], longitude=longitude[:10])
+
+    # Assert
+    assert len(first) == 300
+    assert first[0] == first[150] == 0.0
+    assert first[149] == 49.0  # second chunk of 100 unique points
+    assert list(second) == list(first[:10])
+    assert cast("MagicMock", client._client.get).call_count == 2
+
+
+def test_get_historical_range_retries_failed_chunks(
+    client: XSMeteo, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    monkeypatch.setattr("xsmeteo.core.retry.backoff_delay", lambda attempt: 0.0)
+    calls: list[str] = []
+
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        calls.append(params["start_date"])
+        mock_response = MagicMock(spec=httpx.Response)
+        if params["start_date"] == "2021-01-01" and calls.count("2021-01-01") == 1:
+            mock_response.status_code = 503
+            mock_response.content = b'{"error": true, "reason": "Unavailable"}'
+            return mock_response
+        mock_response.status_code = 200
+        mock_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0, "daily": {"time": ["'
+            + params["start_date"].encode()
+            + b'"], "temperature_2m_max": [1.0]}}'
+        )
+        return mock_response
+
+    cast("MagicMock", client._client.get).side_effect = respond
+
+    # Act
+    result = client.get_historical_range(
+        latitude=52.52,
+        longitude=13.41,
+        start_date="2020-01-01",
+        end_date="2022-12-31",
+        daily=["temperature_2m_max"],
+    )
+
+    # Assert
+    assert result.daily is not None
+    assert result.daily["time"] == ["2020-01-01", "2021-01-01", "2022-01-01"]
+    assert sorted(calls) == ["2020-01-01", "2021-01-01", "2021-01-01", "2022-01-01"]
+
+
+def test_request_many_does_not_retry_client_errors(client: XSMeteo) -> None:
+    # Arrange
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 400
+    mock_response.content = b'{"error": true, "reason": "Invalid parameters"}'
+    cast("MagicMock", client._client.get).return_value = mock_response
+
+    # Act & Assert
+    with pytest.raises(HTTPError):
+        client.get_climate_range(
+            latitude=52.52,
+            longitude=13.41,
+            start_date="2020-01-01",
+            end_date="2020-12-31",
+        )
+    assert cast("MagicMock", client._client.get).call_count == 1
+
+
+def test_canonical_units_share_one_cached_fetch() -> None:
+    # Arrange
+    with XSMeteo(response_cache=MemoryCache(), canonical_units=True) as client:
+        client._client = MagicMock(spec=httpx.Client)
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0,'
+            b'"hourly_units": {"time": "iso8601", "temperature_2m": "\xc2\xb0C",'
+            b' "wind_speed_10m": "m/s"},'
+            b'"hourly": {"time": ["2024-01-01T00:00"], "temperature_2m": [20.0],'
+            b' "wind_speed_10m": [5.0]}}'
+        )
+        get = cast("MagicMock", client._client.get)
+        get.return_value = mock_response
+
+        # Act
+        imperial = client.get_forecast(
+            latitude=52.52,
+            longitude=13.41,
+            hourly=["temperature_2m", "wind_speed_10m"],
+            temperature_unit="fahrenheit",
+            wind_speed_unit="ms",
+        )
+        metric = client.get_forecast(
+            latitude=52.52, longitude=13.41, hourly=["temperature_2m", "wind_speed_10m"]
+        )
+
+    # Assert
+    assert get.call_count == 1
+    assert get.call_args.kwargs["params"]["wind_speed_unit"] == "ms"
+    assert imperial.hourly is not None
+    assert imperial.hourly["temperature_2m"] == [68.0]
+    assert imperial.hourly["wind_speed_10m"] == [5.0]
+    assert metric.hourly is not None
+    assert metric.hourly["temperature_2m"] == [20.0]
+    assert metric.hourly["wind_speed_10m"] == [18.0]
+    assert metric.hourly_units is not None
+    assert metric.hourly_units["wind_speed_10m"] == "km/h"
+
+
+def test_utc_fetch_rebases_every_timezone_from_one_fetch() -> None:
+    # Arrange
+    with XSMeteo(response_cache=MemoryCache(), utc_fetch=True) as client:
+        client._client = MagicMock(spec=httpx.Client)
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0, "hourly_units": {"time": "unixtime"},'
+            b'"hourly": {"time": [1718236800], "temperature_2m": [20.0]}}'
+        )
+        get = cast("MagicMock", client._client.get)
+        get.return_value = mock_response
+
+        # Act
+        berlin = client.get_forecast(
+            latitude=52.52,
+            longitude=13.41,
+            hourly=["temperature_2m"],
+            timezone="Europe/Berlin",
+            forecast_hours=1,
+        )
+        new_york = client.get_forecast(
+            latitude=52.52,
+            longitude=13.41,
+            hourly=["temperature_2m"],
+            timezone="America/New_York",
+            forecast_hours=1,
+        )
+
+    # Assert
+    assert get.call_count == 1
+    assert berlin.hourly is not None
+    assert berlin.hourly["time"] == ["2024-06-13T02:00"]
+    assert berlin.timezone_abbreviation == "CEST"
+    assert new_york.hourly is not None
+    assert new_york.hourly["time"] == ["2024-06-12T20:00"]
+    assert new_york.utc_offset_seconds == -4 * 3600
+
+
+def test_utc_fetch_keeps_local_day_windows() -> None:
+    # Arrange: like the API, answer whole local days of the requested zone
+    def handler(request: httpx.Request) -> httpx.Response:
+        zone = request.url.params["timezone"]
+        offset = 7200 if zone == "Europe/Berlin" else 0
+        return httpx.Response(
+            200,
+            json={
+                "latitude": 52.52,
+                "longitude": 13.41,
+                "generationtime_ms": 1.0,
+                "utc_offset_seconds": offset,
+                "timezone": zone,
+                "timezone_abbreviation": "CEST" if offset else "GMT",
+                "elevation": 38.0,
+                "hourly": {
+                    "time": [f"2024-06-13T{hour:02d}:00" for hour in range(24)],
+                    "temperature_2m": [20.0] * 24,
+                },
+            },
+        )
+
+    with XSMeteo(utc_fetch=True) as client:
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        # Act
+        response = client.get_forecast(
+            latitude=52.52,
+            longitude=13.41,
+            hourly=["temperature_2m"],
+            timezone="Europe/Berlin",
+            forecast_days=1,
+        )
+
+    # Assert
+    assert response.hourly is not None
+    assert response.hourly["time"][0] == "2024-06-13T00:00"
+    assert response.hourly["time"][-1] == "2024-06-13T23:00"
+    assert response.utc_offset_seconds == 7200
+
+
+def test_get_current_requests_only_current_and_caches(client: XSMeteo) -> None:
+    # Arrange
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = (
+        b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 0.1,'
+        b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+        b'"elevation": 38.0, "current_units": {"time": "iso8601", "temperature_2m": "\xc2\xb0C"},'
+        b'"current": {"time": "2024-01-01T12:15", "interval": 900, "temperature_2m": 4.2}}'
+    )
+    get = cast("MagicMock", client._client.get)
+    get.return_value = mock_response
+
+    # Act
+    first = client.get_current(latitude=52.52, longitude=13.41, current=["temperature_2m"])
+    second = client.get_current(latitude=52.52, longitude=13.41, current=["temperature_2m"])
+
+    # Assert
+    assert isinstance(first, CurrentResponse)
+    assert first.current is not None
+    assert first.current["temperature_2m"] == 4.2
+    assert second is first
+    assert get.call_count == 1
+    assert set(get.call_args.kwargs["params"]) == {"latitude", "longitude", "current"}
+
+
+def test_model_aware_ttl_expires_with_the_next_model_run() -> None:
+    # Arrange
+    response_cache = MagicMock(spec=MemoryCache)
+    response_cache.get.return_value = None
+    with XSMeteo(response_cache=response_cache, model_aware_ttl=True) as client:
+        client._client = MagicMock(spec=httpx.Client)
+        forecast_response = MagicMock(spec=httpx.Response)
+        forecast_response.status_code = 200
+        forecast_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0}'
+        )
+        elevation_response = MagicMock(spec=httpx.Response)
+        elevation_response.status_code = 200
+        elevation_response.content = b'{"elevation": [38.0]}'
+        cast("MagicMock", client._client.get).side_effect = [
+            forecast_response,
+            elevation_response,
+        ]
+
+        # Act
+        client.get_forecast(latitude=52.52, longitude=13.41, models=["icon_d2"])
+        client.get_elevation(latitude=[52.52], longitude=[13.41])
+
+    # Assert
+    forecast_ttl = response_cache.set.call_args_list[0].kwargs["ttl"]
+    elevation_ttl = response_cache.set.call_args_list[1].kwargs["ttl"]
+    assert 0 < forecast_ttl <= 3 * 3600
+    assert elevation_ttl == 900.0
+
+
+def test_background_loop_runs_batches_on_the_async_client() -> None:
+    # Arrange
+    with XSMeteo(background_loop=True) as client:
+        assert client._async is not None
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = b'{"elevation": [38.0, 35.0]}'
+        client._async._client = AsyncMock(spec=httpx.AsyncClient)
+        async_get = cast("AsyncMock", client._async._client.get)
+        async_get.return_value = mock_response
+        client._client = MagicMock(spec=httpx.Client)
+
+        # Act
+        elevations = client.get_elevation_bulk(latitude=[52.52, 48.85], longitude=[13.41, 2.35])
+
+        # Assert
+        assert list(elevations) == [38.0, 35.0]
+        assert async_get.call_count == 1
+        cast("MagicMock", client._client.get).assert_not_called()
+        loop = client._loop
+
+    assert loop is not None
+    assert not loop.is_running
+
+
+def test_forecast_batch_takes_one_token_per_location(client: XSMeteo) -> None:
+    # Arrange
+    client._rate_limiter = RateLimiter([RateLimitConfig(limit=3, period_seconds=60.0)])
+    mock_response = MagicMock(spec=httpx.Response)
+    mock_response.status_code = 200
+    mock_response.content = b"[]"
+    cast("MagicMock", client._client.get).return_value = mock_response
+
+    # Act
+    client.get_forecast_batch(latitude=[52.52, 48.85], longitude=[13.41, 2.35])
+
+    # Assert
+    assert not client.limiter.try_acquire(2)
+    assert client.limiter.try_acquire(1)
+
+
+def test_background_loop_shares_the_client_limiter() -> None:
+    # Arrange
+    limiter = RateLimiter([RateLimitConfig(limit=5, period_seconds=60.0)])
+
+    # Act
+    with XSMeteo(limiter=limiter, background_loop=True) as client:
+        # Assert
+        assert client._async is not None
+        assert client._rate_limiter is limiter
+        assert client._async._rate_limiter is limiter
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import datetime
+from typing import cast
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from xsmeteo.client.sync_client import XSMeteo
+from xsmeteo.models.forecast import ForecastResponse
+from xsmeteo.models.historical import HistoricalResponse
+from xsmeteo.services.timeline import merge_sources, plan_timeline
+
+TODAY = datetime.date(2024, 6, 15)
+METADATA = {
+    "latitude": 52.52,
+    "longitude": 13.41,
+    "generationtime_ms": 0.1,
+    "utc_offset_seconds": 0,
+    "timezone": "GMT",
+    "timezone_abbreviation": "GMT",
+    "elevation": 38.0,
+    "daily_units": {"time": "iso8601", "temperature_2m_max": "°C"},
+}
+
+
+def test_plan_prefers_archive_without_overlap() -> None:
+    # Act
+    segments = plan_timeline(
+        latitude=52.52,
+        longitude=13.41,
+        start_date="2023-12-01",
+        end_date="2024-06-20",
+        daily=["temperature_2m_max"],
+        today=TODAY,
+    )
+
+    # Assert
+    assert [(s.source, s.start_date, s.end_date) for s in segments] == [
+        ("archive", "2023-12-01", "2023-12-31"),
+        ("archive", "2024-01-01", "2024-06-10"),
+        ("forecast", "2024-06-11", "2024-06-20"),
+    ]
+    assert segments[-1].request_def.params["start_date"] == "2024-06-11"
+    assert segments[-1].request_def.params["end_date"] == "2024-06-20"
+
+
+def test_plan_prefers_forecast() -> None:
+    segments = plan_timeline(
+        latitude=52.52,
+        longitude=13.41,
+        start_date="2024-03-01",
+        end_date="2024-06-15",
+        priority=("forecast", "archive"),
+        today=TODAY,
+    )
+
+    assert [(s.source, s.start_date, s.end_date) for s in segments] == [
+        ("archive", "2024-03-01", "2024-03-14"),
+        ("forecast", "2024-03-15", "2024-06-15"),
+    ]
+
+
+def test_plan_rejects_window_beyond_horizon() -> None:
+    with pytest.raises(ValueError, match="end_date"):
+        plan_timeline(
+            latitude=52.52,
+            longitude=13.41,
+            start_date="2024-06-01",
+            end_date="2024-07-01",
+            today=TODAY,
+        )
+
+
+def test_merge_sources_resolves_overlap_by_priority() -> None:
+    # Arrange
+    archive = HistoricalResponse(
+        **METADATA,
+        daily={"time": ["2024-06-09", "2024-06-10"], "temperature_2m_max": [20.0, None]},
+    )
+    forecast = ForecastResponse(
+        **METADATA,
+        daily={
+            "time": ["2024-06-10", "2024-06-11", "2024-06-12"],
+            "temperature_2m_max": [21.0, 22.0, 23.0],
+        },
+    )
+
+    # Act
+    merged = merge_sources(
+        [("forecast", forecast), ("archive", archive)],
+        start_date="2024-06-09",
+        end_date="2024-06-11",
+    )
+
+    # Assert
+    assert merged.daily == {
+        "time": ["2024-06-09", "2024-06-10", "2024-06-11"],
+        "temperature_2m_max": [20.0, 21.0, 22.0],
+    }
+    assert merged.daily_units == METADATA["daily_units"]
+
+
+def test_client_get_timeline_fetches_both_sources() -> None:
+    # Arrange
+    today = datetime.date.today()
+
+    def respond(url: str, params: dict[str, str]) -> MagicMock:
+        if "archive" in url:
+            days = [params["start_date"]]
+        else:
+            days = [(today - datetime.timedelta(days=2)).isoformat(), today.isoformat()]
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = (
+            b'{"latitude": 52.52, "longitude": 13.41, "generationtime_ms": 1.0,'
+            b'"utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT",'
+            b'"elevation": 38.0, "daily": {"time": ["'
+            + '", "'.join(days).encode()
+            + b'"], "temperature_2m_max": ['
+            + ", ".join("1.0" for _ in days).encode()
+            + b"]}}"
+        )
+        return mock_response
+
+    with XSMeteo() as client:
+        client._client = MagicMock(spec=httpx.Client)
+        get = cast("MagicMock", client._client.get)
+        get.side_effect = respond
+
+        # Act
+        result = client.get_timeline(
+            latitude=52.52,
+            longitude=13.41,
+            start_date=(today - datetime.timedelta(days=5)).isoformat(),
+            end_date=today.isoformat(),
+            daily=["temperature_2m_max"],
+        )
+
+    # Assert
+    assert get.call_count == 2
+    assert result.daily is not None
+    assert result.daily["time"] == [
+        (today - datetime.timedelta(days=5)).isoformat(),
+        (today - datetime.timedelta(days=2)).isoformat(),
+        today.isoformat(),
+    ]
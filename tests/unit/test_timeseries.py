@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xsmeteo.analytics.timeseries import TimeSeries  # noqa: E402
+from xsmeteo.models.forecast import ForecastResponse  # noqa: E402
+
+HOUR = 3600
+# 2024-01-01T00:00 in Berlin (UTC+1)
+BASE = int(datetime.datetime(2023, 12, 31, 23, tzinfo=datetime.UTC).timestamp())
+
+
+@pytest.fixture
+def series() -> TimeSeries:
+    response = ForecastResponse(
+        latitude=52.52,
+        longitude=13.41,
+        generationtime_ms=0.1,
+        utc_offset_seconds=3600,
+        timezone="Europe/Berlin",
+        timezone_abbreviation="CET",
+        elevation=38.0,
+        hourly={
+            "time": [f"2024-01-01T{hour:02d}:00" for hour in range(24)],
+            "temperature_2m": [float(hour) for hour in range(24)],
+            "rain": [None] * 24,
+        },
+    )
+    return TimeSeries.from_response(response)
+
+
+def test_from_response_honors_offset(series: TimeSeries) -> None:
+    assert series.time[0] == BASE
+    assert str(series.local_time[0]) == "2024-01-01T00:00:00"
+    assert np.isnan(series["rain"]).all()
+
+
+def test_slice_by_local_and_absolute_bounds(series: TimeSeries) -> None:
+    # Act
+    local = series.slice(datetime.datetime(2024, 1, 1, 6), "2024-01-01T09:00")
+    absolute = series.slice(datetime.datetime(2024, 1, 1, 5, tzinfo=datetime.UTC), BASE + 9 * HOUR)
+
+    # Assert
+    assert local["temperature_2m"].tolist() == [6.0, 7.0, 8.0]
+    assert absolute["temperature_2m"].tolist() == [6.0, 7.0, 8.0]
+    assert np.shares_memory(local["temperature_2m"], series["temperature_2m"])
+
+
+def test_between_hours(series: TimeSeries) -> None:
+    assert series.between_hours(22, 2)["temperature_2m"].tolist() == [0.0, 1.0, 22.0, 23.0]
+
+
+def test_asof_modes(series: TimeSeries) -> None:
+    # Arrange
+    query = np.array([BASE + 105 * 60, BASE - HOUR, BASE + 30 * 60 + 24 * HOUR])
+
+    # Act
+    previous = series.asof(query, ["temperature_2m"])["temperature_2m"]
+    nearest = series.asof(query, ["temperature_2m"], mode="nearest")["temperature_2m"]
+    linear = series.asof(query, ["temperature_2m"], mode="linear")["temperature_2m"]
+    bounded = series.asof(query, ["temperature_2m"], tolerance=HOUR)["temperature_2m"]
+
+    # Assert
+    np.testing.assert_array_equal(previous, [1.0, np.nan, 23.0])
+    np.testing.assert_array_equal(nearest, [2.0, 0.0, 23.0])
+    np.testing.assert_array_equal(linear, [1.75, np.nan, np.nan])
+    np.testing.assert_array_equal(bounded, [1.0, np.nan, np.nan])
+
+
+def test_asof_rejects_unknown_mode(series: TimeSeries) -> None:
+    with pytest.raises(ValueError, match="mode"):
+        series.asof([BASE], mode="cubic")
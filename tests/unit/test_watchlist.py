@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from xsmeteo.client.async_client import AsyncXSMeteo
+from xsmeteo.client.watchlist import Refresh, Watchlist
+from xsmeteo.core import freshness
+from xsmeteo.core.rate_limiter import RateLimitConfig, RateLimiter
+from xsmeteo.exceptions import HTTPError
+
+
+def _mock_client() -> MagicMock:
+    client = MagicMock(spec=AsyncXSMeteo)
+    client.limiter = RateLimiter([RateLimitConfig(limit=10**9, period_seconds=1.0)])
+
+    async def get_forecast_batch(**kwargs: Any) -> list[str]:
+        return [f"forecast@{latitude}" for latitude in kwargs["latitude"]]
+
+    client.get_forecast_batch = AsyncMock(side_effect=get_forecast_batch)
+    return client
+
+
+async def _take(watchlist: Watchlist, count: int) -> list[Refresh]:
+    refreshes: list[Refresh] = []
+    async for refresh in watchlist.updates():
+        refreshes.append(refresh)
+        if len(refreshes) == count:
+            break
+    return refreshes
+
+
+@pytest.mark.asyncio
+async def test_watchlist_batches_hot_locations_first() -> None:
+    # Arrange
+    client = _mock_client()
+    watchlist = Watchlist(
+        client,
+        hourly=["temperature_2m"],
+        models=["icon_d2"],
+        batch_size=2,
+        jitter=60.0,
+    )
+    watchlist.add(1.0, 1.0)
+    watchlist.add(2.0, 2.0, priority=5)
+    watchlist.add(3.0, 3.0, priority=1)
+
+    # Act
+    refreshes = await _take(watchlist, 3)
+
+    # Assert
+    calls = [call.kwargs["latitude"] for call in client.get_forecast_batch.call_args_list]
+    assert calls == [[2.0, 3.0], [1.0]]
+    assert [refresh.response for refresh in refreshes] == [
+        "forecast@2.0",
+        "forecast@3.0",
+        "forecast@1.0",
+    ]
+    next_run = freshness.next_update(["icon_d2"])
+    for entry in watchlist._entries.values():
+        assert next_run <= entry.due <= next_run + 60.0
+
+
+def test_watchlist_paces_to_the_slowest_client_limit() -> None:
+    # Arrange
+    client = _mock_client()
+    client.limiter = RateLimiter(
+        [
+            RateLimitConfig(limit=600, period_seconds=60.0),
+            RateLimitConfig(limit=10_000, period_seconds=86_400.0),
+        ]
+    )
+
+    # Act
+    watchlist = Watchlist(client, hourly=["temperature_2m"], batch_size=50)
+
+    # Assert: 50 locations every 432 seconds spread 10,000 calls over a day
+    assert watchlist._pacer is not None
+    [pace] = watchlist._pacer.limits
+    assert pace.limit == 50
+    assert pace.period_seconds == pytest.approx(432.0)
+
+
+@pytest.mark.asyncio
+async def test_watchlist_retries_transient_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    monkeypatch.setattr("xsmeteo.core.retry.backoff_delay", lambda *args, **kwargs: 0.0)
+    client = _mock_client()
+    client.get_forecast_batch.side_effect = [HTTPError("unavailable", 503), ["forecast"]]
+    watchlist = Watchlist(client, hourly=["temperature_2m"])
+    watchlist.add(52.52, 13.41)
+
+    # Act
+    refreshes = await _take(watchlist, 1)
+
+    # Assert
+    assert client.get_forecast_batch.call_count == 2
+    assert [(r.latitude, r.longitude, r.response) for r in refreshes] == [
+        (52.52, 13.41, "forecast")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_watchlist_skips_removed_locations() -> None:
+    # Arrange
+    client = _mock_client()
+    watchlist = Watchlist(client, hourly=["temperature_2m"])
+    watchlist.add(1.0, 1.0)
+    watchlist.add(2.0, 2.0)
+    watchlist.remove(1.0, 1.0)
+
+    # Act
+    refreshes = await _take(watchlist, 1)
+
+    # Assert
+    assert len(watchlist) == 1
+    assert [refresh.latitude for refresh in refreshes] == [2.0]
+    assert client.get_forecast_batch.call_args.kwargs["latitude"] == [2.0]
+    assert time.time() < min(entry.due for entry in watchlist._entries.values())